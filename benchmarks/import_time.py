@@ -0,0 +1,63 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Everything any subcommand can pull in; importing it up front is what every
+# invocation used to pay before the CLI imported command modules lazily.
+EAGER_IMPORTS = (
+    "import job_applier.cli, job_applier.web, job_applier.apply.batch, "
+    "job_applier.search.cache, job_applier.search.ranking, "
+    "job_applier.search.remotive, job_applier.search.arbeitnow"
+)
+
+
+def commands(config_path: Path) -> Dict[str, List[str]]:
+    cli = [sys.executable, "-m", "job_applier"]
+    return {
+        "eager imports": [sys.executable, "-c", EAGER_IMPORTS],
+        "--help": cli + ["--help"],
+        "config": cli + ["--config-path", str(config_path), "config"],
+    }
+
+
+def measure(command: List[str], repeat: int) -> float:
+    # One untimed run so every command sees warm bytecode and disk caches.
+    subprocess.run(command, cwd=ROOT, capture_output=True, check=True)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, capture_output=True, check=True)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def startup_times(repeat: int) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = Path(tmp_dir) / "config.json"
+        return {
+            name: measure(command, repeat)
+            for name, command in commands(config_path).items()
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CLI startup time per command.")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    results = startup_times(args.repeat)
+    eager = results["eager imports"]
+    for name, seconds in results.items():
+        print(f"{name:15} {seconds * 1000:8.1f} ms  {seconds / eager:6.0%}")
+
+
+if __name__ == "__main__":
+    main()
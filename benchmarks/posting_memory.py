@@ -0,0 +1,82 @@
+import argparse
+import gc
+import random
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from job_applier.search.models import JobPosting
+
+
+@dataclass
+class PlainPosting:
+    # The pre-compaction JobPosting, kept here as the baseline.
+    source: str
+    title: str
+    company: str
+    location: str
+    url: str
+    description: str
+    tags: Optional[str] = None
+
+
+WORDS = (
+    "python backend engineer remote team product customers platform data "
+    "services api cloud kubernetes experience years build scale design "
+    "ownership collaborate growth benefits salary equity flexible hours"
+).split()
+SOURCES = ["remotive", "arbeitnow"]
+LOCATIONS = ["Remote", "Berlin", "London", "New York", "Worldwide", "Amsterdam"]
+
+
+def _description(rng: random.Random) -> str:
+    paragraphs = []
+    for _ in range(rng.randint(6, 14)):
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 90)))
+        paragraphs.append(f"<p>{words}.</p>")
+    return "<h2>About the role</h2>\n" + "\n".join(paragraphs)
+
+
+def _build(factory: Callable[..., object], count: int, seed: int) -> List[object]:
+    rng = random.Random(seed)
+    return [
+        factory(
+            # Decoded JSON hands every record its own string objects.
+            source="".join(rng.choice(SOURCES)),
+            title=f"Engineer {index}",
+            company=f"Company {index % 5000}",
+            location="".join(rng.choice(LOCATIONS)),
+            url=f"https://example.com/jobs/{index}",
+            description=_description(rng),
+            tags="python,remote",
+        )
+        for index in range(count)
+    ]
+
+
+def measure(factory: Callable[..., object], count: int, seed: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    jobs = _build(factory, count, seed)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del jobs
+    return current / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bytes retained per job posting.")
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    before = measure(PlainPosting, args.count, args.seed)
+    after = measure(JobPosting, args.count, args.seed)
+    print(f"postings:          {args.count}")
+    print(f"plain dataclass:   {before:,.0f} bytes/posting")
+    print(f"compact posting:   {after:,.0f} bytes/posting")
+    print(f"reduction:         {1 - after / before:.0%}")
+
+
+if __name__ == "__main__":
+    main()
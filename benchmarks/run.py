@@ -0,0 +1,325 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from unittest import mock
+
+# Everything the run caches goes to a scratch directory, so results never
+# depend on (or pollute) the user's ~/.job_applier cache.
+_SCRATCH = tempfile.TemporaryDirectory(prefix="job-applier-bench-")
+os.environ["JOB_APPLIER_CACHE_DIR"] = _SCRATCH.name
+
+from benchmarks.import_time import startup_times  # noqa: E402
+from benchmarks.posting_memory import measure as posting_bytes  # noqa: E402
+from benchmarks.stubs import StubServer, StubSettings  # noqa: E402
+from job_applier import http  # noqa: E402
+from job_applier.apply import dispatcher  # noqa: E402
+from job_applier.apply.storage import SQLiteStore  # noqa: E402
+from job_applier.config import AppConfig  # noqa: E402
+from job_applier.diskcache import DiskCache  # noqa: E402
+from job_applier.letter_cache import LetterCache  # noqa: E402
+from job_applier.search import arbeitnow, remotive  # noqa: E402
+from job_applier.search.cache import configure_cache  # noqa: E402
+from job_applier.search.models import JobPosting  # noqa: E402
+from job_applier.search.providers import search_all  # noqa: E402
+from job_applier.search.ranking import (  # noqa: E402
+    DESCRIPTION_SCAN_CHARS,
+    ProfileRanker,
+)
+
+
+BENCH_DIR = Path(__file__).parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+DEFAULT_OUTPUT = BENCH_DIR / "results" / "latest.json"
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_SIZES = (50, 200, 1000)
+RANK_SIZE = 50000
+# Ranking 50,000 tokenized postings must stay well under a second.
+RANK_BUDGET = 0.5
+
+Metrics = Dict[str, Dict[str, object]]
+
+
+def _metric(
+    metrics: Metrics,
+    name: str,
+    value: float,
+    unit: str,
+    better: str,
+    limit: Optional[float] = None,
+) -> None:
+    metrics[name] = {"value": round(value, 6), "unit": unit, "better": better}
+    if limit is not None:
+        # A hard budget, checked on every run whatever the baseline says.
+        metrics[name]["limit"] = limit
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def _peak_mb(fn: Callable[[], object]) -> float:
+    # A separate pass: tracemalloc slows allocation-heavy code enough to
+    # skew the timings above.
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def bench_search(metrics: Metrics, stub: StubServer, repeat: int) -> None:
+    configure_cache(enabled=False)
+    limit = 200
+
+    def run() -> List[JobPosting]:
+        return search_all("engineer", limit, timeout=60)
+
+    elapsed, jobs = _timed(run, repeat)
+    _metric(metrics, "search_all.wall", elapsed, "s", "lower")
+    _metric(metrics, "search_all.results", len(jobs), "jobs", "higher")
+    _metric(metrics, "search_all.peak_memory", _peak_mb(run), "MiB", "lower")
+
+
+def bench_parsing(metrics: Metrics, stub: StubServer, repeat: int) -> None:
+    configure_cache(enabled=False)
+    settings = stub.settings
+    # Network latency is measured by bench_search; here it would only hide
+    # the decode and JobPosting construction cost.
+    latency, settings.latency = settings.latency, 0.0
+    providers = {
+        "remotive": (
+            lambda: remotive.search_remotive("engineer", settings.remotive_jobs)
+        ),
+        "arbeitnow": (lambda: list(arbeitnow.iter_arbeitnow("engineer"))),
+    }
+    for name, run in providers.items():
+        elapsed, jobs = _timed(run, repeat)
+        rate = len(jobs) / elapsed
+        _metric(metrics, f"parse.{name}.throughput", rate, "jobs/s", "higher")
+    settings.latency = latency
+
+
+def bench_packets(
+    metrics: Metrics, stub: StubServer, sizes: List[int], repeat: int
+) -> None:
+    config = AppConfig()
+    config.profile.full_name = "Bench Mark"
+    config.profile.skills = ["python", "sql"]
+    source = remotive.search_remotive("engineer", max(sizes))
+    for size in sizes:
+        jobs = source[:size]
+
+        def run() -> None:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                root = Path(tmp_dir)
+                store = SQLiteStore(root / "packets.sqlite3")
+                with mock.patch.object(dispatcher, "APPLICATIONS_DIR", root):
+                    dispatcher.build_application_packets(
+                        config,
+                        jobs,
+                        dry_run=False,
+                        letter_cache=LetterCache(store=DiskCache(root / "letters")),
+                        log_path=root / "application_log.jsonl",
+                        store=store,
+                    )
+                store.close()
+
+        elapsed, _ = _timed(run, repeat)
+        rate = size / elapsed
+        _metric(metrics, f"packets.{size}.throughput", rate, "jobs/s", "higher")
+        peak = _peak_mb(run)
+        _metric(metrics, f"packets.{size}.peak_memory", peak, "MiB", "lower")
+
+
+def bench_ranking(metrics: Metrics, stub: StubServer, repeat: int) -> None:
+    config = AppConfig()
+    config.profile.skills = ["python", "django", "aws", "sql", "c#", "asp.net core"]
+    config.preferences.roles = ["backend engineer", "senior python developer"]
+    ranker = ProfileRanker(config)
+    source = [
+        asdict(job)
+        for job in remotive.search_remotive("engineer", stub.settings.remotive_jobs)
+    ]
+    # Distinct postings that share their text, so the clean text is converted
+    # once per source row rather than once per copy.
+    jobs = [
+        JobPosting.from_dict(dict(source[index % len(source)], url=str(index)))
+        for index in range(RANK_SIZE)
+    ]
+    # Each posting is tokenized once, the first time it is ranked; later
+    # ranks reuse the tokens.
+    started = time.perf_counter()
+    for job in jobs:
+        job.tokens(DESCRIPTION_SCAN_CHARS)
+    rate = len(jobs) / (time.perf_counter() - started)
+    _metric(metrics, "rank.tokenize.throughput", rate, "jobs/s", "higher")
+    elapsed, _ = _timed(lambda: ranker.rank(jobs), repeat)
+    _metric(metrics, f"rank.{RANK_SIZE}.wall", elapsed, "s", "lower", RANK_BUDGET)
+
+
+def bench_postings(metrics: Metrics) -> None:
+    size = posting_bytes(JobPosting, 5000, 7)
+    _metric(metrics, "posting.bytes", size, "B", "lower")
+
+
+def bench_startup(metrics: Metrics, repeat: int) -> None:
+    timings = startup_times(repeat)
+    _metric(metrics, "startup.help.wall", timings["--help"], "s", "lower")
+    _metric(metrics, "startup.config.wall", timings["config"], "s", "lower")
+
+
+def run_suite(settings: StubSettings, sizes: List[int], repeat: int) -> Metrics:
+    metrics: Metrics = {}
+    with StubServer(settings) as stub:
+        environment = {
+            "OPENAI_API_KEY": "bench",
+            "OPENAI_BASE_URL": f"{stub.base_url}/v1",
+        }
+        with mock.patch.dict(os.environ, environment), mock.patch.object(
+            remotive, "API_URL", f"{stub.base_url}/remotive"
+        ), mock.patch.object(arbeitnow, "API_URL", f"{stub.base_url}/arbeitnow"):
+            http.configure()
+            bench_search(metrics, stub, repeat)
+            bench_parsing(metrics, stub, repeat)
+            bench_packets(metrics, stub, sizes, repeat)
+            bench_ranking(metrics, stub, repeat)
+    bench_postings(metrics)
+    bench_startup(metrics, max(repeat, 5))
+    return metrics
+
+
+def over_budget(metrics: Metrics) -> List[str]:
+    failures = []
+    for name, metric in metrics.items():
+        limit = metric.get("limit")
+        if limit is None:
+            continue
+        if metric["better"] == "higher":
+            over = metric["value"] < limit
+        else:
+            over = metric["value"] > limit
+        if over:
+            print(f"{name}: {metric['value']:.4g} {metric['unit']}, budget {limit:.4g}")
+            failures.append(name)
+    return failures
+
+
+def compare(metrics: Metrics, baseline: Metrics, threshold: float) -> List[str]:
+    regressions = []
+    for name, current in metrics.items():
+        previous = baseline.get(name)
+        if not previous or not previous["value"]:
+            continue
+        change = (current["value"] - previous["value"]) / previous["value"]
+        worse = -change if current["better"] == "higher" else change
+        marker = ""
+        if worse > threshold:
+            marker = "  REGRESSION"
+            regressions.append(name)
+        print(
+            f"{name:32} {previous['value']:>12.4g} -> {current['value']:>12.4g} "
+            f"{current['unit']:7} {change:+.1%}{marker}"
+        )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="JobApplier performance benchmarks.")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT))
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store this run as the baseline instead of comparing against it.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Fail when a metric is this much worse than the baseline (0.25 = 25%%).",
+    )
+    parser.add_argument(
+        "--ci",
+        action="store_true",
+        default=bool(os.getenv("CI")),
+        help="Fail when there is no baseline to compare against (default when $CI "
+        "is set).",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--llm-latency", type=float, default=0.02)
+    parser.add_argument("--remotive-jobs", type=int, default=500)
+    parser.add_argument("--arbeitnow-pages", type=int, default=5)
+    parser.add_argument("--description-chars", type=int, default=4000)
+    args = parser.parse_args(argv)
+
+    settings = StubSettings(
+        latency=args.latency,
+        remotive_jobs=max(args.remotive_jobs, max(args.sizes)),
+        arbeitnow_pages=args.arbeitnow_pages,
+        description_chars=args.description_chars,
+        llm_latency=args.llm_latency,
+    )
+    metrics = run_suite(settings, args.sizes, args.repeat)
+    result = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "settings": vars(args),
+        },
+        "metrics": metrics,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"Wrote {output}")
+
+    failed = over_budget(metrics)
+    if failed:
+        print(f"{len(failed)} metric(s) over their budget.")
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(result, indent=2))
+        print(f"Saved baseline to {baseline_path}")
+        return 1 if failed else 0
+    if not baseline_path.exists():
+        for name, metric in metrics.items():
+            print(f"{name:32} {metric['value']:>12.4g} {metric['unit']}")
+        if args.ci:
+            print(
+                f"ERROR: no baseline at {baseline_path}; nothing was compared. "
+                "Record one with --save-baseline.",
+                file=sys.stderr,
+            )
+            return 1
+        print("No baseline yet; run with --save-baseline to record one.")
+        return 1 if failed else 0
+    baseline = json.loads(baseline_path.read_text())["metrics"]
+    regressions = compare(metrics, baseline, args.threshold)
+    if regressions:
+        limit = f"{args.threshold:.0%}"
+        print(f"{len(regressions)} metric(s) regressed by more than {limit}.")
+    return 1 if regressions or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import copy
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@dataclass
+class StubSettings:
+    latency: float = 0.0
+    remotive_jobs: int = 500
+    arbeitnow_pages: int = 5
+    arbeitnow_per_page: int = 100
+    description_chars: int = 4000
+    llm_latency: float = 0.0
+
+
+def load_fixture(name: str) -> Dict[str, Any]:
+    return json.loads((FIXTURES_DIR / name).read_text())
+
+
+def _vary(description: str, chars: int, seed: int) -> str:
+    # Reshuffling the recorded words per row keeps descriptions realistic in
+    # size and vocabulary without making every row a near-duplicate.
+    rng = random.Random(seed)
+    words = re.sub(r"<[^>]+>", " ", description).split()
+    paragraphs = [description]
+    size = len(description)
+    while size < chars:
+        rng.shuffle(words)
+        paragraph = f"<p>{' '.join(words[:60])}.</p>"
+        paragraphs.append(paragraph)
+        size += len(paragraph)
+    return "".join(paragraphs)[:chars]
+
+
+def _expand(
+    records: List[Dict[str, Any]], count: int, chars: int, offset: int = 0
+) -> List[Dict[str, Any]]:
+    # Recorded rows are cycled and given unique URLs so dedup and the
+    # caches see distinct postings, the way a real feed would look.
+    rows = []
+    for index in range(count):
+        row = copy.deepcopy(records[index % len(records)])
+        number = offset + index
+        row["url"] = f"{row['url']}-{number}"
+        row["title"] = f"{row['title']} {number}"
+        row["company_name"] = f"{row['company_name']} {number % 997}"
+        row["description"] = _vary(row["description"], chars, number)
+        rows.append(row)
+    return rows
+
+
+class StubServer:
+    def __init__(self, settings: StubSettings) -> None:
+        self.settings = settings
+        self.requests = 0
+        remotive = load_fixture("remotive.json")
+        remotive["jobs"] = _expand(
+            remotive["jobs"], settings.remotive_jobs, settings.description_chars
+        )
+        remotive["job-count"] = len(remotive["jobs"])
+        self._remotive = json.dumps(remotive).encode("utf-8")
+        arbeitnow = load_fixture("arbeitnow.json")
+        self._arbeitnow: Dict[int, bytes] = {}
+        for page in range(1, settings.arbeitnow_pages + 1):
+            payload = copy.deepcopy(arbeitnow)
+            payload["data"] = _expand(
+                arbeitnow["data"],
+                settings.arbeitnow_per_page,
+                settings.description_chars,
+                offset=(page - 1) * settings.arbeitnow_per_page,
+            )
+            last = page == settings.arbeitnow_pages
+            payload["links"]["next"] = None if last else f"?page={page + 1}"
+            payload["meta"]["current_page"] = page
+            self._arbeitnow[page] = json.dumps(payload).encode("utf-8")
+        self._chat = json.dumps(load_fixture("chat_completion.json")).encode("utf-8")
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, body: bytes, latency: float) -> None:
+                stub.requests += 1
+                if latency:
+                    time.sleep(latency)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path == "/remotive":
+                    self._send(stub._remotive, stub.settings.latency)
+                elif parts.path == "/arbeitnow":
+                    page = int(parse_qs(parts.query).get("page", ["1"])[0])
+                    empty = b'{"data": [], "links": {}, "meta": {}}'
+                    body = stub._arbeitnow.get(page, empty)
+                    self._send(body, stub.settings.latency)
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", "0")))
+                if self.path == "/v1/chat/completions":
+                    self._send(stub._chat, stub.settings.llm_latency)
+                else:
+                    self.send_error(404)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -1,13 +1,18 @@
 import os
-from typing import Dict
-
-import requests
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
 
+from job_applier import http, metrics
 from job_applier.config import AppConfig
+from job_applier.letter_cache import LetterCache, letter_key
+from job_applier.prompts import build_prompt
+from job_applier.ratelimit import RateLimiter
 from job_applier.search.models import JobPosting
 
 
-OPENAI_URL = "https://api.openai.com/v1/chat/completions"
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_MODEL = "gpt-4o-mini"
+MAX_COMPLETION_TOKENS = 400
 
 
 def _fallback_cover_letter(config: AppConfig, job: JobPosting) -> str:
@@ -22,39 +27,100 @@ def _fallback_cover_letter(config: AppConfig, job: JobPosting) -> str:
     )
 
 
-def generate_cover_letter(config: AppConfig, job: JobPosting) -> str:
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        return _fallback_cover_letter(config, job)
+def api_url(path: str) -> str:
+    base = os.getenv("OPENAI_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+    return f"{base}/{path.lstrip('/')}"
 
-    prompt = (
-        "Write a concise, tailored cover letter for the role below. "
-        "Use the candidate profile and keep it under 200 words.\n\n"
-        f"Job Title: {job.title}\n"
-        f"Company: {job.company}\n"
-        f"Location: {job.location}\n"
-        f"Description: {job.description[:1500]}\n\n"
-        f"Candidate: {config.profile.full_name}\n"
-        f"Skills: {', '.join(config.profile.skills)}\n"
-        f"Resume: {config.profile.resume_path}\n"
-    )
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
-    payload: Dict[str, object] = {
-        "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+
+def auth_headers(api_key: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {api_key}"}
+
+
+@dataclass
+class LetterRequest:
+    key: str
+    payload: Dict[str, Any]
+    estimated_tokens: int
+
+
+def build_letter_request(config: AppConfig, job: JobPosting) -> LetterRequest:
+    prompt = build_prompt(config, job)
+    model = os.getenv("OPENAI_MODEL", DEFAULT_MODEL)
+    payload: Dict[str, Any] = {
+        "model": model,
         "messages": [
-            {"role": "system", "content": "You are a helpful career assistant."},
-            {"role": "user", "content": prompt},
+            {"role": "system", "content": prompt.system},
+            {"role": "user", "content": prompt.user},
         ],
         "temperature": 0.4,
-        "max_tokens": 400,
+        "max_tokens": MAX_COMPLETION_TOKENS,
     }
-    response = requests.post(OPENAI_URL, headers=headers, json=payload, timeout=45)
-    response.raise_for_status()
-    data = response.json()
+    return LetterRequest(
+        key=letter_key(config, job, model, prompt.text),
+        payload=payload,
+        estimated_tokens=prompt.tokens + MAX_COMPLETION_TOKENS,
+    )
+
+
+def record_usage(data: Dict[str, Any]) -> None:
+    usage = data.get("usage") or {}
+    for kind in ("prompt", "completion"):
+        tokens = usage.get(f"{kind}_tokens")
+        if tokens:
+            metrics.inc("job_applier_llm_tokens_total", tokens, kind=kind)
+            metrics.observe(
+                f"job_applier_llm_{kind}_tokens", tokens, metrics.TOKEN_BUCKETS
+            )
+    # Prompt tokens the provider served from its prefix cache.
+    cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+    if cached:
+        metrics.inc("job_applier_llm_tokens_total", cached, kind="cached")
+
+
+def parse_letter(data: Dict[str, Any]) -> Optional[str]:
     choices = data.get("choices", [])
     if not choices:
-        return _fallback_cover_letter(config, job)
+        return None
     return choices[0]["message"]["content"].strip()
+
+
+def generate_cover_letter(
+    config: AppConfig,
+    job: JobPosting,
+    limiter: Optional[RateLimiter] = None,
+    cache: Optional[LetterCache] = None,
+) -> str:
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return _fallback_cover_letter(config, job)
+
+    letter_request = build_letter_request(config, job)
+    if cache is not None:
+        cached = cache.get(letter_request.key)
+        if cached is not None:
+            metrics.inc("job_applier_llm_requests_total", outcome="cached")
+            return cached
+    if limiter is not None:
+        limiter.acquire(letter_request.estimated_tokens)
+    model = letter_request.payload["model"]
+    try:
+        with metrics.timer("job_applier_llm_seconds", model=model):
+            response = http.post(
+                api_url("chat/completions"),
+                purpose="llm",
+                headers=auth_headers(api_key),
+                json=letter_request.payload,
+            )
+            response.raise_for_status()
+    except Exception:
+        metrics.inc("job_applier_llm_requests_total", outcome="error")
+        raise
+    metrics.inc("job_applier_llm_requests_total", outcome="ok")
+    data = response.json()
+    record_usage(data)
+    letter = parse_letter(data)
+    if letter is None:
+        return _fallback_cover_letter(config, job)
+    if cache is not None:
+        cache.set(letter_request.key, letter)
+    return letter
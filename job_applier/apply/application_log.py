@@ -0,0 +1,137 @@
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from job_applier.search.dedup import canonicalize_url
+from job_applier.search.models import JobPosting
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+APPLY_EVENT = "apply"
+PACKET_EVENT = "packet"
+
+
+@contextmanager
+def _locked(handle: TextIO) -> Iterator[None]:
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        return
+    # msvcrt locks a byte range rather than the file; every writer agrees to
+    # lock the first byte, and append mode still writes at the end.
+    handle.seek(0)
+    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+    try:
+        yield
+    finally:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def log_entry(job: JobPosting, event: str, status: str, **extra: str) -> dict:
+    return {
+        "event": event,
+        "company": job.company,
+        "title": job.title,
+        "url": job.url,
+        "status": status,
+        "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        **extra,
+    }
+
+
+class ApplicationLog:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._index: Dict[str, Dict[str, dict]] = {}
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        # Only the bytes appended since the last look are parsed, so the first
+        # lookup reads the log once and later ones cost a stat and a short read.
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size < self._offset:
+            self._index.clear()
+            self._offset = 0
+        if size == self._offset:
+            return
+        with open(self.path, "rb") as handle:
+            handle.seek(self._offset)
+            chunk = handle.read(size - self._offset)
+        # A writer in another process may be mid-line; leave it for next time.
+        complete = chunk.rfind(b"\n") + 1
+        for line in chunk[:complete].splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            key = canonicalize_url(entry.get("url", ""))
+            if key:
+                event = entry.get("event", APPLY_EVENT)
+                self._index.setdefault(key, {})[event] = entry
+        self._offset += complete
+
+    def get(self, url: str, event: str) -> Optional[dict]:
+        key = canonicalize_url(url)
+        if not key:
+            return None
+        with self._lock:
+            self._refresh()
+            return self._index.get(key, {}).get(event)
+
+    def applied(self, url: str) -> bool:
+        entry = self.get(url, APPLY_EVENT)
+        return entry is not None and entry.get("status") == "opened"
+
+    def packet(self, url: str) -> Optional[Path]:
+        entry = self.get(url, PACKET_EVENT)
+        return Path(entry["path"]) if entry and entry.get("path") else None
+
+    def append(self, entries: Iterable[dict]) -> None:
+        lines = "".join(json.dumps(entry, sort_keys=True) + "\n" for entry in entries)
+        if not lines:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One write under an exclusive lock keeps lines from concurrent web and
+        # CLI processes from interleaving.
+        with open(self.path, "a", encoding="utf-8") as handle:
+            with _locked(handle):
+                handle.write(lines)
+                handle.flush()
+
+    def entries(self) -> List[dict]:
+        if not self.path.exists():
+            return []
+        with open(self.path, encoding="utf-8") as handle:
+            return [json.loads(line) for line in handle if line.strip()]
+
+
+_logs: Dict[Path, ApplicationLog] = {}
+_logs_lock = threading.Lock()
+
+
+def open_log(path: Path) -> ApplicationLog:
+    # One instance per path keeps the index warm across calls in a process.
+    key = Path(path).resolve()
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            log = _logs[key] = ApplicationLog(key)
+        return log
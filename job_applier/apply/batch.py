@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from job_applier import http
+from job_applier.ai import (
+    LetterRequest,
+    _fallback_cover_letter,
+    api_url,
+    auth_headers,
+    build_letter_request,
+    parse_letter,
+    record_usage,
+)
+from job_applier.apply.dispatcher import (
+    APPLICATIONS_DIR,
+    application_log,
+    existing_packets,
+    packet_store,
+    write_packets,
+)
+from job_applier.apply.storage import PacketStore
+from job_applier.config import AppConfig
+from job_applier.letter_cache import LetterCache
+from job_applier.search.models import JobPosting
+
+
+BATCH_DIR = APPLICATIONS_DIR / "batches"
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+POLL_INTERVAL = 30.0
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchError(RuntimeError):
+    pass
+
+
+@dataclass
+class BatchState:
+    batch_hash: str
+    requests_path: str
+    input_file_id: str = ""
+    batch_id: str = ""
+    status: str = "pending"
+    output_file_id: str = ""
+    error_file_id: str = ""
+    output_path: str = ""
+    packets_written: bool = False
+
+
+def _state_path(batch_dir: Path, batch_hash: str) -> Path:
+    return batch_dir / f"{batch_hash}.state.json"
+
+
+def _load_state(path: Path) -> Optional[BatchState]:
+    if not path.exists():
+        return None
+    return BatchState(**json.loads(path.read_text()))
+
+
+def _save_state(path: Path, state: BatchState) -> None:
+    # Write-then-rename so a crash mid-save never leaves a truncated state file.
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(asdict(state), indent=2))
+    os.replace(temp_path, path)
+
+
+def write_batch_file(
+    letter_requests: List[LetterRequest],
+    batch_dir: Path,
+    cached: Dict[int, str],
+) -> Optional[BatchState]:
+    lines: List[str] = []
+    for index, letter_request in enumerate(letter_requests):
+        if index in cached:
+            continue
+        line = {
+            "custom_id": f"job-{index}",
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": letter_request.payload,
+        }
+        lines.append(json.dumps(line, sort_keys=True))
+    if not lines:
+        return None
+    body = "\n".join(lines) + "\n"
+    # Identical prompts hash to the same batch, which is what lets a rerun
+    # after a crash pick up the existing state instead of resubmitting.
+    batch_hash = hashlib.sha256(body.encode("utf-8")).hexdigest()[:24]
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    requests_path = batch_dir / f"{batch_hash}.jsonl"
+    if not requests_path.exists():
+        requests_path.write_text(body)
+    return BatchState(batch_hash=batch_hash, requests_path=str(requests_path))
+
+
+def _upload(state: BatchState, headers: Dict[str, str]) -> None:
+    with open(state.requests_path, "rb") as handle:
+        response = http.post(
+            api_url("files"),
+            purpose="llm",
+            headers=headers,
+            data={"purpose": "batch"},
+            files={"file": (Path(state.requests_path).name, handle)},
+        )
+    response.raise_for_status()
+    state.input_file_id = response.json()["id"]
+
+
+def _create(state: BatchState, headers: Dict[str, str]) -> None:
+    response = http.post(
+        api_url("batches"),
+        purpose="llm",
+        headers=headers,
+        json={
+            "input_file_id": state.input_file_id,
+            "endpoint": BATCH_ENDPOINT,
+            "completion_window": COMPLETION_WINDOW,
+            "metadata": {"job_applier_batch": state.batch_hash},
+        },
+    )
+    response.raise_for_status()
+    data = response.json()
+    state.batch_id = data["id"]
+    state.status = data.get("status", "validating")
+
+
+def _refresh(state: BatchState, headers: Dict[str, str]) -> None:
+    response = http.get(
+        api_url(f"batches/{state.batch_id}"), purpose="llm", headers=headers
+    )
+    response.raise_for_status()
+    data = response.json()
+    state.status = data.get("status", state.status)
+    state.output_file_id = data.get("output_file_id") or ""
+    state.error_file_id = data.get("error_file_id") or ""
+
+
+def _download(state: BatchState, headers: Dict[str, str], batch_dir: Path) -> None:
+    response = http.get(
+        api_url(f"files/{state.output_file_id}/content"),
+        purpose="llm",
+        headers=headers,
+    )
+    response.raise_for_status()
+    output_path = batch_dir / f"{state.batch_hash}.output.jsonl"
+    output_path.write_bytes(response.content)
+    state.output_path = str(output_path)
+
+
+def _read_letters(state: BatchState) -> Dict[str, str]:
+    letters: Dict[str, str] = {}
+    if not state.output_path:
+        return letters
+    with open(state.output_path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            body = response.get("body") or {}
+            record_usage(body)
+            letter = parse_letter(body)
+            if letter:
+                letters[item["custom_id"]] = letter
+    return letters
+
+
+def run_batch(
+    config: AppConfig,
+    jobs: List[JobPosting],
+    dry_run: bool = False,
+    letter_cache: Optional[LetterCache] = None,
+    batch_dir: Path = BATCH_DIR,
+    poll_interval: float = POLL_INTERVAL,
+    max_polls: Optional[int] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    log_path: Optional[Path] = None,
+    force: bool = False,
+    store: Optional[PacketStore] = None,
+) -> List[Path]:
+    letter_cache = letter_cache if letter_cache is not None else LetterCache()
+    store = store if store is not None else packet_store()
+    log = application_log(log_path)
+    packets = existing_packets(jobs, log, store, force)
+    pending = [index for index in range(len(jobs)) if index not in packets]
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        items = [
+            (jobs[index], _fallback_cover_letter(config, jobs[index]))
+            for index in pending
+        ]
+        packets.update(zip(pending, write_packets(store, log, items, dry_run)))
+        return [packets[index] for index in range(len(jobs))]
+
+    letter_requests = [build_letter_request(config, jobs[index]) for index in pending]
+    cached: Dict[int, str] = {}
+    for index, letter_request in enumerate(letter_requests):
+        letter = letter_cache.get(letter_request.key)
+        if letter is not None:
+            cached[index] = letter
+
+    fresh = write_batch_file(letter_requests, batch_dir, cached)
+    letters: Dict[str, str] = {}
+    if fresh is not None and not dry_run:
+        state_path = _state_path(batch_dir, fresh.batch_hash)
+        state = _load_state(state_path)
+        # A batch that failed, expired or was cancelled can't be resumed;
+        # the rerun submits a new one.
+        dead = state is not None and state.status in TERMINAL_STATUSES - {"completed"}
+        if state is None or dead or (state.packets_written and letter_cache.regenerate):
+            state = fresh
+        headers = auth_headers(api_key)
+        if not state.input_file_id:
+            _upload(state, headers)
+            _save_state(state_path, state)
+        if not state.batch_id:
+            _create(state, headers)
+            _save_state(state_path, state)
+        polls = 0
+        while state.status not in TERMINAL_STATUSES:
+            if max_polls is not None and polls >= max_polls:
+                raise BatchError(
+                    f"Batch {state.batch_id} still {state.status}; rerun to resume."
+                )
+            if polls:
+                sleep(poll_interval)
+            _refresh(state, headers)
+            _save_state(state_path, state)
+            polls += 1
+        if state.status != "completed":
+            raise BatchError(
+                f"Batch {state.batch_id} ended with status {state.status}."
+            )
+        if state.output_file_id and not state.output_path:
+            _download(state, headers, batch_dir)
+            _save_state(state_path, state)
+        letters = _read_letters(state)
+        for custom_id, letter in letters.items():
+            index = int(custom_id.split("-", 1)[1])
+            letter_cache.set(letter_requests[index].key, letter)
+
+    # Batch custom ids number the pending jobs only; already-packeted ones
+    # never reach the batch file.
+    items = []
+    for position, index in enumerate(pending):
+        job = jobs[index]
+        letter = cached.get(position) or letters.get(f"job-{position}")
+        if letter is None:
+            letter = _fallback_cover_letter(config, job)
+        items.append((job, letter))
+    packets.update(zip(pending, write_packets(store, log, items, dry_run)))
+    if fresh is not None and not dry_run:
+        state.packets_written = True
+        _save_state(state_path, state)
+    return [packets[index] for index in range(len(jobs))]
@@ -1,23 +1,53 @@
 import json
+import os
+import time
 import webbrowser
-from dataclasses import asdict
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Callable, Iterable, List
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from job_applier.ai import generate_cover_letter
+from job_applier import metrics
+from job_applier.ai import _fallback_cover_letter, generate_cover_letter
+from job_applier.apply.application_log import (
+    APPLY_EVENT,
+    PACKET_EVENT,
+    ApplicationLog,
+    log_entry,
+    open_log,
+)
+from job_applier.apply.shortlist import (
+    ShortlistWriter,
+    is_ndjson,
+    iter_shortlist,
+)
+from job_applier.apply.storage import PacketItem, PacketStore, open_store
 from job_applier.config import AppConfig
+from job_applier.letter_cache import LetterCache
+from job_applier.ratelimit import RateLimiter, limiter_from_env
 from job_applier.search.models import JobPosting
 
 
 APPLICATIONS_DIR = Path("applications")
-APPLICATION_LOG = APPLICATIONS_DIR / "application_log.json"
-
-
-def _slugify(text: str) -> str:
-    return "".join(char.lower() if char.isalnum() else "-" for char in text).strip("-")
+APPLICATION_LOG = APPLICATIONS_DIR / "application_log.jsonl"
+PACKET_ARCHIVE_NAME = "packets.sqlite3"
+PACKET_STORE = os.getenv("JOB_APPLIER_PACKET_STORE", "directory")
+DEFAULT_WORKERS = int(os.getenv("JOB_APPLIER_LLM_WORKERS", "4"))
+# Jobs are read and submitted this many at a time, with at most two such
+# chunks held in memory.
+CHUNK_SIZE = 50
+# Finished letters are written once this many are waiting, or once the
+# oldest has waited this long, whichever comes first.
+WRITE_BATCH_SIZE = 8
+WRITE_BATCH_SECONDS = 2.0
 
 
 def save_shortlist(jobs: Iterable[JobPosting], output_path: Path) -> Path:
+    if is_ndjson(output_path):
+        with ShortlistWriter(output_path) as writer:
+            writer.write_many(jobs)
+        return output_path
     output_path.parent.mkdir(parents=True, exist_ok=True)
     payload = [asdict(job) for job in jobs]
     output_path.write_text(json.dumps(payload, indent=2))
@@ -25,51 +55,211 @@ def save_shortlist(jobs: Iterable[JobPosting], output_path: Path) -> Path:
 
 
 def load_shortlist(input_path: Path) -> List[JobPosting]:
-    data = json.loads(input_path.read_text())
-    return [JobPosting(**item) for item in data]
+    return list(iter_shortlist(input_path))
 
 
-def build_application_packets(
-    config: AppConfig, jobs: Iterable[JobPosting], dry_run: bool
+def packet_store(
+    kind: Optional[str] = None, path: Optional[Path] = None
+) -> PacketStore:
+    kind = kind or PACKET_STORE
+    if path is None:
+        path = APPLICATIONS_DIR
+        if kind != "directory":
+            path = APPLICATIONS_DIR / PACKET_ARCHIVE_NAME
+    return open_store(kind, path)
+
+
+def application_log(log_path: Optional[Path] = None) -> ApplicationLog:
+    return open_log(log_path or APPLICATION_LOG)
+
+
+def existing_packets(
+    jobs: List[JobPosting],
+    log: ApplicationLog,
+    store: PacketStore,
+    force: bool = False,
+) -> Dict[int, Path]:
+    if force:
+        return {}
+    # A packet written to a different store doesn't count; switching from
+    # folders to an archive should fill the archive.
+    root = store.location("")
+    existing: Dict[int, Path] = {}
+    for index, job in enumerate(jobs):
+        folder = log.packet(job.url)
+        if folder is not None and folder.is_relative_to(root):
+            existing[index] = folder
+    return existing
+
+
+def write_packets(
+    store: PacketStore,
+    log: ApplicationLog,
+    items: List[PacketItem],
+    dry_run: bool,
 ) -> List[Path]:
-    packets: List[Path] = []
-    for job in jobs:
-        company_slug = _slugify(job.company or "company")
-        title_slug = _slugify(job.title or "role")
-        folder = APPLICATIONS_DIR / company_slug / title_slug
-        if not dry_run:
-            folder.mkdir(parents=True, exist_ok=True)
-        cover_letter = generate_cover_letter(config, job)
-        summary = (
-            f"Company: {job.company}\n"
-            f"Role: {job.title}\n"
-            f"Location: {job.location}\n"
-            f"Source: {job.source}\n"
-            f"Apply URL: {job.url}\n"
+    with metrics.timer("job_applier_packet_write_seconds", store=store.kind):
+        locations = store.write_many(items, dry_run)
+    if not dry_run:
+        metrics.inc("job_applier_packets_written_total", len(items), store=store.kind)
+        log.append(
+            log_entry(job, PACKET_EVENT, "written", path=str(location))
+            for (job, _), location in zip(items, locations)
         )
-        if not dry_run:
-            (folder / "cover_letter.txt").write_text(cover_letter)
-            (folder / "summary.txt").write_text(summary)
-        packets.append(folder)
-    return packets
+    return locations
+
+
+def _generate_letter(
+    config: AppConfig,
+    job: JobPosting,
+    limiter: Optional[RateLimiter],
+    letter_cache: Optional[LetterCache],
+) -> str:
+    try:
+        return generate_cover_letter(config, job, limiter=limiter, cache=letter_cache)
+    except Exception:  # noqa: BLE001 - one failed letter must not sink the batch
+        return _fallback_cover_letter(config, job)
+
+
+def _chunks(jobs: Iterable[JobPosting], size: int) -> Iterator[List[JobPosting]]:
+    chunk: List[JobPosting] = []
+    for job in jobs:
+        chunk.append(job)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@dataclass
+class _Slot:
+    job: JobPosting
+    packet: Optional[Path] = None
+
+
+def _write_finished(
+    finished: List[Tuple[_Slot, str]],
+    store: PacketStore,
+    log: ApplicationLog,
+    dry_run: bool,
+) -> None:
+    items = [(slot.job, letter) for slot, letter in finished]
+    locations = write_packets(store, log, items, dry_run)
+    for (slot, _), location in zip(finished, locations):
+        slot.packet = location
+    finished.clear()
+
+
+def iter_application_packets(
+    config: AppConfig,
+    jobs: Iterable[JobPosting],
+    dry_run: bool,
+    workers: int = DEFAULT_WORKERS,
+    limiter: Optional[RateLimiter] = None,
+    letter_cache: Optional[LetterCache] = None,
+    log_path: Optional[Path] = None,
+    force: bool = False,
+    store: Optional[PacketStore] = None,
+) -> Iterator[Tuple[JobPosting, Path]]:
+    limiter = limiter if limiter is not None else limiter_from_env()
+    letter_cache = letter_cache if letter_cache is not None else LetterCache()
+    store = store if store is not None else packet_store()
+    log = application_log(log_path)
+    chunks = _chunks(jobs, CHUNK_SIZE)
+    order: Deque[_Slot] = deque()
+    running: Dict["Future[str]", _Slot] = {}
+    finished: List[Tuple[_Slot, str]] = []
+    oldest = 0.0
+    exhausted = False
+    with ThreadPoolExecutor(
+        max_workers=max(1, workers), thread_name_prefix="packet"
+    ) as executor:
+        # The next chunk is submitted while the previous one is still being
+        # collected, so workers stay busy while memory stays bounded however
+        # long the input is. Letters are written in small batches as they
+        # finish, not when the slowest letter of a chunk is done, and each
+        # job is yielded, in input order, once it and every job before it
+        # are written.
+        while True:
+            while not exhausted and len(order) <= CHUNK_SIZE:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                packets = existing_packets(chunk, log, store, force)
+                for index, job in enumerate(chunk):
+                    slot = _Slot(job, packets.get(index))
+                    order.append(slot)
+                    if slot.packet is None:
+                        future = executor.submit(
+                            _generate_letter, config, job, limiter, letter_cache
+                        )
+                        running[future] = slot
+            while order and order[0].packet is not None:
+                slot = order.popleft()
+                yield slot.job, slot.packet
+            if not order:
+                if exhausted:
+                    return
+                continue
+            timeout = None
+            if finished:
+                timeout = max(0.0, oldest + WRITE_BATCH_SECONDS - time.monotonic())
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if done and not finished:
+                oldest = time.monotonic()
+            for future in done:
+                finished.append((running.pop(future), future.result()))
+            if finished and (
+                len(finished) >= WRITE_BATCH_SIZE
+                or not running
+                or time.monotonic() - oldest >= WRITE_BATCH_SECONDS
+            ):
+                _write_finished(finished, store, log, dry_run)
+
+
+def build_application_packets(
+    config: AppConfig,
+    jobs: Iterable[JobPosting],
+    dry_run: bool,
+    workers: int = DEFAULT_WORKERS,
+    limiter: Optional[RateLimiter] = None,
+    letter_cache: Optional[LetterCache] = None,
+    log_path: Optional[Path] = None,
+    force: bool = False,
+    store: Optional[PacketStore] = None,
+) -> List[Path]:
+    packets = iter_application_packets(
+        config,
+        jobs,
+        dry_run,
+        workers=workers,
+        limiter=limiter,
+        letter_cache=letter_cache,
+        log_path=log_path,
+        force=force,
+        store=store,
+    )
+    return [folder for _, folder in packets]
 
 
 def auto_apply_jobs(
     jobs: Iterable[JobPosting],
     log_path: Path = APPLICATION_LOG,
     open_url: Callable[[str], bool] = webbrowser.open,
+    force: bool = False,
 ) -> List[dict]:
-    log_path.parent.mkdir(parents=True, exist_ok=True)
+    log = open_log(log_path)
     entries: List[dict] = []
     for job in jobs:
+        if not force and job.url and log.applied(job.url):
+            entries.append(log_entry(job, APPLY_EVENT, "already applied"))
+            continue
         opened = bool(job.url and open_url(job.url))
-        entries.append(
-            {
-                "company": job.company,
-                "title": job.title,
-                "url": job.url,
-                "status": "opened" if opened else "skipped",
-            }
-        )
-    log_path.write_text(json.dumps(entries, indent=2))
+        entry = log_entry(job, APPLY_EVENT, "opened" if opened else "skipped")
+        # Appending per job means a second listing of the same posting later
+        # in this run is already seen as applied.
+        log.append([entry])
+        entries.append(entry)
     return entries
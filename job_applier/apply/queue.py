@@ -0,0 +1,307 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from job_applier import metrics
+from job_applier.apply.storage import packet_key
+from job_applier.search.models import JobPosting
+
+
+DEFAULT_QUEUE_PATH = Path("applications") / "queue.sqlite3"
+LEASE_SECONDS = float(os.getenv("JOB_APPLIER_QUEUE_LEASE", "300"))
+CLAIM_SIZE = 50
+MAX_ATTEMPTS = 3
+IDLE_POLL = 5.0
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+STATES = (PENDING, LEASED, DONE, FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    job TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    packet TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, lease_until);
+"""
+
+ProcessFn = Callable[[List[JobPosting]], Iterable[Tuple[JobPosting, Path]]]
+PacketFn = Callable[[JobPosting, Path], None]
+ErrorFn = Callable[[Exception], None]
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class Task:
+    id: int
+    job: JobPosting
+    attempts: int
+
+
+class WorkQueue:
+    def __init__(self, path: Path = DEFAULT_QUEUE_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # The default rollback journal rather than WAL: WAL's shared
+            # memory index doesn't work for processes on different machines
+            # sharing the file, and the queue's writes are few and small.
+            connection = sqlite3.connect(
+                str(self.path), timeout=30, isolation_level=None
+            )
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE takes the write lock up front, so two workers can't both
+        # read the same pending rows and then claim them.
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def enqueue(self, jobs: Iterable[JobPosting], force: bool = False) -> int:
+        # Jobs already queued keep their progress unless forced back to
+        # pending, so re-running with the same shortlist only adds new ones.
+        now = time.time()
+        rows = [
+            (packet_key(job), json.dumps(asdict(job)), now) for job in jobs if job.url
+        ]
+        if force:
+            sql = """
+                INSERT INTO tasks (key, job, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    job = excluded.job, state = 'pending', attempts = 0,
+                    worker = NULL, lease_until = NULL, error = NULL,
+                    updated_at = excluded.updated_at
+            """
+        else:
+            sql = (
+                "INSERT INTO tasks (key, job, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO NOTHING"
+            )
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(sql, rows)
+            added = connection.total_changes - before
+        metrics.inc("job_applier_queue_enqueued_total", added)
+        return added
+
+    def claim(
+        self,
+        worker: str,
+        count: int = CLAIM_SIZE,
+        lease: float = LEASE_SECONDS,
+        max_attempts: int = MAX_ATTEMPTS,
+    ) -> List[Task]:
+        now = time.time()
+        with self._transaction() as connection:
+            # A lease that ran out belongs to a worker that died or stalled;
+            # its jobs go back in line until they have used every attempt.
+            expired = connection.execute(
+                """
+                UPDATE tasks SET
+                    state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    error = CASE WHEN attempts >= ?
+                        THEN 'lease expired on ' || worker ELSE error END,
+                    worker = NULL, lease_until = NULL, updated_at = ?
+                WHERE state = 'leased' AND lease_until < ?
+                """,
+                (max_attempts, max_attempts, now, now),
+            ).rowcount
+            rows = connection.execute(
+                "SELECT id, job, attempts FROM tasks WHERE state = 'pending' "
+                "ORDER BY id LIMIT ?",
+                (count,),
+            ).fetchall()
+            connection.executemany(
+                "UPDATE tasks SET state = 'leased', worker = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(worker, now + lease, now, row[0]) for row in rows],
+            )
+        if expired:
+            metrics.inc("job_applier_queue_reclaimed_total", expired)
+        return [
+            Task(
+                id=row[0],
+                job=JobPosting.from_dict(json.loads(row[1])),
+                attempts=row[2] + 1,
+            )
+            for row in rows
+        ]
+
+    def extend(self, worker: str, ids: Sequence[int], lease: float) -> int:
+        until = time.time() + lease
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "UPDATE tasks SET lease_until = ? "
+                "WHERE id = ? AND worker = ? AND state = 'leased'",
+                [(until, task_id, worker) for task_id in ids],
+            )
+            return connection.total_changes - before
+
+    def complete(self, task_id: int, packet: Path) -> None:
+        # Recorded even if the lease was lost meanwhile: the packet exists,
+        # and whoever reclaimed the job will find it already written.
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE tasks SET state = 'done', packet = ?, worker = NULL, "
+                "lease_until = NULL, error = NULL, updated_at = ? WHERE id = ?",
+                (str(packet), time.time(), task_id),
+            )
+        metrics.inc("job_applier_queue_done_total")
+
+    def fail(
+        self,
+        worker: str,
+        ids: Sequence[int],
+        error: str,
+        max_attempts: int = MAX_ATTEMPTS,
+    ) -> None:
+        with self._transaction() as connection:
+            connection.executemany(
+                """
+                UPDATE tasks SET
+                    state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    error = ?, worker = NULL, lease_until = NULL, updated_at = ?
+                WHERE id = ? AND worker = ? AND state = 'leased'
+                """,
+                [
+                    (max_attempts, error, time.time(), task_id, worker)
+                    for task_id in ids
+                ],
+            )
+
+    def release(self, worker: str) -> int:
+        # Hands back unfinished leases on a clean shutdown, without using up
+        # an attempt, so other workers needn't wait for them to expire.
+        with self._transaction() as connection:
+            return connection.execute(
+                "UPDATE tasks SET state = 'pending', worker = NULL, "
+                "lease_until = NULL, attempts = MAX(attempts - 1, 0), updated_at = ? "
+                "WHERE worker = ? AND state = 'leased'",
+                (time.time(), worker),
+            ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(STATES, 0)
+        cursor = self._connect().execute(
+            "SELECT state, COUNT(*) FROM tasks GROUP BY state"
+        )
+        counts.update(dict(cursor.fetchall()))
+        return counts
+
+    def next_expiry(self) -> Optional[float]:
+        row = (
+            self._connect()
+            .execute("SELECT MIN(lease_until) FROM tasks WHERE state = 'leased'")
+            .fetchone()
+        )
+        return row[0]
+
+
+def _keep_leased(
+    queue: WorkQueue,
+    worker: str,
+    ids: List[int],
+    lease: float,
+    stop: threading.Event,
+) -> None:
+    while not stop.wait(lease / 3):
+        queue.extend(worker, ids, lease)
+    queue.close()
+
+
+def run_worker(
+    queue: WorkQueue,
+    process: ProcessFn,
+    worker: Optional[str] = None,
+    batch_size: int = CLAIM_SIZE,
+    lease: float = LEASE_SECONDS,
+    on_packet: Optional[PacketFn] = None,
+    on_error: Optional[ErrorFn] = None,
+    idle_poll: float = IDLE_POLL,
+    sleep: Callable[[float], None] = time.sleep,
+) -> int:
+    # Claims a batch at a time and checkpoints every job the moment its
+    # packet is stored. Returns once nothing is pending and no other worker
+    # holds a lease that could still expire back into the queue.
+    worker = worker or worker_name()
+    processed = 0
+    try:
+        while True:
+            tasks = queue.claim(worker, batch_size, lease)
+            if not tasks:
+                expiry = queue.next_expiry()
+                if expiry is None:
+                    return processed
+                sleep(min(idle_poll, max(0.0, expiry - time.time()) + 0.1))
+                continue
+            stop = threading.Event()
+            heartbeat = threading.Thread(
+                target=_keep_leased,
+                args=(queue, worker, [task.id for task in tasks], lease, stop),
+                name="queue-lease",
+                daemon=True,
+            )
+            heartbeat.start()
+            finished = 0
+            error = "no packet was produced"
+            try:
+                results = process([task.job for task in tasks])
+                for task, (job, packet) in zip(tasks, results):
+                    queue.complete(task.id, packet)
+                    finished += 1
+                    if on_packet is not None:
+                        on_packet(job, packet)
+            except Exception as exc:  # noqa: BLE001 - retried by a later claim
+                error = str(exc)
+                if on_error is not None:
+                    on_error(exc)
+            finally:
+                stop.set()
+                heartbeat.join()
+            processed += finished
+            unfinished = [task.id for task in tasks[finished:]]
+            if unfinished:
+                metrics.inc("job_applier_queue_failed_total", len(unfinished))
+                queue.fail(worker, unfinished, error)
+    finally:
+        queue.release(worker)
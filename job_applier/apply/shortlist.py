@@ -0,0 +1,154 @@
+import json
+import os
+import struct
+from dataclasses import asdict
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple
+
+from job_applier.search.models import JobPosting
+
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+INDEX_SUFFIX = ".idx"
+
+# The sidecar index is a run of little-endian uint64s: first the size of the
+# shortlist it was built from, then the byte offset of every record.
+_OFFSET = struct.Struct("<Q")
+
+
+def is_ndjson(path: Path) -> bool:
+    return Path(path).suffix.lower() in NDJSON_SUFFIXES
+
+
+def index_path(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def parse_range(text: str) -> Tuple[int, Optional[int]]:
+    # "500-600" means the 500th through 600th job, counting from 1 the way
+    # `search` numbers its output; returns a 0-based [start, stop) slice.
+    first, sep, last = text.partition("-")
+    try:
+        start = int(first) if first else 1
+        stop = (int(last) if last else None) if sep else start
+    except ValueError:
+        raise ValueError(f"Invalid range '{text}'; expected N, N-M, N- or -M.")
+    if start < 1 or (stop is not None and stop < start):
+        raise ValueError(f"Invalid range '{text}'; expected N, N-M, N- or -M.")
+    return start - 1, stop
+
+
+class ShortlistWriter:
+    def __init__(self, path: Path, append: bool = False) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+        if append and self.path.exists():
+            sidecar = _ensure_index(self.path)
+            self.count = sidecar.stat().st_size // _OFFSET.size - 1
+            self._data: BinaryIO = open(self.path, "ab")
+            self._index: BinaryIO = open(sidecar, "r+b")
+            self._index.seek(0, os.SEEK_END)
+            return
+        self._data = open(self.path, "wb")
+        self._index = open(index_path(self.path), "wb")
+        self._index.write(_OFFSET.pack(0))
+
+    def write(self, job: JobPosting) -> None:
+        self._index.write(_OFFSET.pack(self._data.tell()))
+        self._data.write(json.dumps(asdict(job)).encode("utf-8") + b"\n")
+        self.count += 1
+
+    def write_many(self, jobs: Iterable[JobPosting]) -> None:
+        for job in jobs:
+            self.write(job)
+
+    def close(self) -> None:
+        if self._data.closed:
+            return
+        self._data.flush()
+        # Stamping the size last means an interrupted write leaves an index
+        # that no longer matches and gets rebuilt on the next read.
+        self._index.seek(0)
+        self._index.write(_OFFSET.pack(self._data.tell()))
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self) -> "ShortlistWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _index_is_current(path: Path) -> bool:
+    sidecar = index_path(path)
+    try:
+        with open(sidecar, "rb") as handle:
+            header = handle.read(_OFFSET.size)
+    except FileNotFoundError:
+        return False
+    return (
+        len(header) == _OFFSET.size
+        and _OFFSET.unpack(header)[0] == path.stat().st_size
+    )
+
+
+def build_index(path: Path) -> Path:
+    path = Path(path)
+    sidecar = index_path(path)
+    with open(path, "rb") as data, open(sidecar, "wb") as index:
+        index.write(_OFFSET.pack(0))
+        offset = 0
+        for line in data:
+            if line.strip():
+                index.write(_OFFSET.pack(offset))
+            offset += len(line)
+        index.seek(0)
+        index.write(_OFFSET.pack(offset))
+    return sidecar
+
+
+def _ensure_index(path: Path) -> Path:
+    if not _index_is_current(path):
+        build_index(path)
+    return index_path(path)
+
+
+def count_shortlist(path: Path) -> int:
+    path = Path(path)
+    if not is_ndjson(path):
+        return len(json.loads(path.read_text()))
+    return _ensure_index(path).stat().st_size // _OFFSET.size - 1
+
+
+def _offset_of(path: Path, position: int) -> Optional[int]:
+    with open(_ensure_index(path), "rb") as index:
+        index.seek(_OFFSET.size * (position + 1))
+        entry = index.read(_OFFSET.size)
+    return _OFFSET.unpack(entry)[0] if len(entry) == _OFFSET.size else None
+
+
+def iter_shortlist(
+    path: Path, start: int = 0, stop: Optional[int] = None
+) -> Iterator[JobPosting]:
+    path = Path(path)
+    if not is_ndjson(path):
+        data = json.loads(path.read_text())
+        for item in data[start:stop]:
+            yield JobPosting.from_dict(item)
+        return
+    offset = _offset_of(path, start) if start else 0
+    if offset is None:
+        return
+    position = start
+    with open(path, "rb") as handle:
+        handle.seek(offset)
+        for line in handle:
+            if stop is not None and position >= stop:
+                break
+            if not line.strip():
+                continue
+            yield JobPosting.from_dict(json.loads(line))
+            position += 1
@@ -0,0 +1,225 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple, Union
+
+from job_applier.search.dedup import canonicalize_url
+from job_applier.search.models import JobPosting
+
+
+COVER_LETTER_FILE = "cover_letter.txt"
+SUMMARY_FILE = "summary.txt"
+STORE_KINDS = ("directory", "sqlite")
+
+PacketItem = Tuple[JobPosting, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS packets (
+    key TEXT PRIMARY KEY,
+    company TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    cover_letter TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def _slugify(text: str) -> str:
+    return "".join(char.lower() if char.isalnum() else "-" for char in text).strip("-")
+
+
+def packet_key(job: JobPosting) -> str:
+    # The slugs keep keys readable; the hash keeps two "Acme / Engineer"
+    # postings with different URLs from overwriting each other.
+    identity = canonicalize_url(job.url) or f"{job.company}\n{job.title}"
+    suffix = hashlib.sha1(identity.encode("utf-8")).hexdigest()[:8]
+    company_slug = _slugify(job.company or "company") or "company"
+    title_slug = _slugify(job.title or "role") or "role"
+    return f"{company_slug}/{title_slug}-{suffix}"
+
+
+def packet_summary(job: JobPosting) -> str:
+    return (
+        f"Company: {job.company}\n"
+        f"Role: {job.title}\n"
+        f"Location: {job.location}\n"
+        f"Source: {job.source}\n"
+        f"Apply URL: {job.url}\n"
+    )
+
+
+def _write_if_changed(path: Path, text: str) -> None:
+    data = text.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+
+
+def _write_folder(folder: Path, cover_letter: str, summary: str) -> None:
+    folder.mkdir(parents=True, exist_ok=True)
+    _write_if_changed(folder / COVER_LETTER_FILE, cover_letter)
+    _write_if_changed(folder / SUMMARY_FILE, summary)
+
+
+class DirectoryStore:
+    kind = "directory"
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def location(self, key: str) -> Path:
+        return self.root / key
+
+    def write_many(self, items: Sequence[PacketItem], dry_run: bool) -> List[Path]:
+        folders: List[Path] = []
+        for job, cover_letter in items:
+            folder = self.location(packet_key(job))
+            if not dry_run:
+                _write_folder(folder, cover_letter, packet_summary(job))
+            folders.append(folder)
+        return folders
+
+    def keys(self) -> List[str]:
+        return sorted(
+            path.parent.relative_to(self.root).as_posix()
+            for path in self.root.glob(f"*/*/{SUMMARY_FILE}")
+        )
+
+    def read(self, key: str) -> Dict[str, str]:
+        folder = self.location(key)
+        return {
+            name: (folder / name).read_text(encoding="utf-8")
+            for name in (COVER_LETTER_FILE, SUMMARY_FILE)
+        }
+
+    def export(self, directory: Path) -> int:
+        keys = self.keys()
+        for key in keys:
+            files = self.read(key)
+            _write_folder(
+                Path(directory) / key, files[COVER_LETTER_FILE], files[SUMMARY_FILE]
+            )
+        return len(keys)
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteStore:
+    kind = "sqlite"
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.path), timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def location(self, key: str) -> Path:
+        # Addressed like a member of an archive, the way zipfile.Path is.
+        return self.path / key
+
+    def write_many(self, items: Sequence[PacketItem], dry_run: bool) -> List[Path]:
+        now = time.time()
+        rows = []
+        keys: List[str] = []
+        for job, cover_letter in items:
+            key = packet_key(job)
+            summary = packet_summary(job)
+            digest = hashlib.sha256(
+                f"{cover_letter}\0{summary}".encode("utf-8")
+            ).hexdigest()
+            rows.append(
+                (
+                    key,
+                    job.company,
+                    job.title,
+                    job.url,
+                    cover_letter,
+                    summary,
+                    digest,
+                    now,
+                )
+            )
+            keys.append(key)
+        if rows and not dry_run:
+            # One transaction per batch; the WHERE clause leaves rows whose
+            # content hasn't changed untouched.
+            with self._connect() as connection:
+                connection.executemany(
+                    """
+                    INSERT INTO packets (key, company, title, url, cover_letter,
+                                         summary, digest, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        company = excluded.company,
+                        title = excluded.title,
+                        url = excluded.url,
+                        cover_letter = excluded.cover_letter,
+                        summary = excluded.summary,
+                        digest = excluded.digest,
+                        updated_at = excluded.updated_at
+                    WHERE packets.digest != excluded.digest
+                    """,
+                    rows,
+                )
+        return [self.location(key) for key in keys]
+
+    def keys(self) -> List[str]:
+        cursor = self._connect().execute("SELECT key FROM packets ORDER BY key")
+        return [row[0] for row in cursor]
+
+    def read(self, key: str) -> Dict[str, str]:
+        row = (
+            self._connect()
+            .execute("SELECT cover_letter, summary FROM packets WHERE key = ?", (key,))
+            .fetchone()
+        )
+        if row is None:
+            raise KeyError(key)
+        return {COVER_LETTER_FILE: row[0], SUMMARY_FILE: row[1]}
+
+    def export(self, directory: Path) -> int:
+        count = 0
+        cursor = self._connect().execute(
+            "SELECT key, cover_letter, summary FROM packets ORDER BY key"
+        )
+        for key, cover_letter, summary in cursor:
+            _write_folder(Path(directory) / key, cover_letter, summary)
+            count += 1
+        return count
+
+
+PacketStore = Union[DirectoryStore, SQLiteStore]
+
+
+def open_store(kind: str, path: Path) -> PacketStore:
+    if kind == "directory":
+        return DirectoryStore(path)
+    if kind == "sqlite":
+        return SQLiteStore(path)
+    choices = ", ".join(STORE_KINDS)
+    raise ValueError(f"Unknown packet store '{kind}'. Use one of: {choices}.")
@@ -1,28 +1,54 @@
 import argparse
+from dataclasses import replace
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-from job_applier.apply.dispatcher import (
-    build_application_packets,
-    auto_apply_jobs,
-    load_shortlist,
-    save_shortlist,
+from job_applier import metrics
+from job_applier.apply.shortlist import (
+    ShortlistWriter,
+    is_ndjson,
+    iter_shortlist,
+    parse_range,
 )
+from job_applier.apply.storage import STORE_KINDS
 from job_applier.config import AppConfig, load_config, save_config, update_from_env
+from job_applier.search.dedup import Deduplicator
+from job_applier.search.index import DEFAULT_INDEX_PATH, JobIndex
 from job_applier.search.models import JobPosting
-from job_applier.search.providers import PROVIDERS, search_all
-from job_applier.web import create_app
+from job_applier.search.providers import (
+    PROVIDERS,
+    SEARCH_TIMEOUT,
+    SearchReport,
+    run_provider,
+    search_all,
+    stream_search,
+)
+from job_applier.search.query import Query, QueryError, SearchCriteria
+from job_applier.search.watch import (
+    DEFAULT_INTERVAL,
+    DEFAULT_JITTER,
+    DEFAULT_STATE_PATH,
+    POLL_LIMIT,
+    Watcher,
+    WatchState,
+)
+
+# requests, numpy and Flask are imported by the commands that use them, so
+# `config`, `init` and `--help` don't pay for them on every invocation.
 
 
-def _print_jobs(jobs: List[JobPosting]) -> None:
+def _print_jobs(jobs: List[JobPosting], scores: Optional[List[float]] = None) -> None:
     for index, job in enumerate(jobs, start=1):
         print(f"{index}. {job.title} @ {job.company} ({job.location})")
+        if scores is not None:
+            print(f"   Score: {scores[index - 1]:.2f}")
         print(f"   Source: {job.source}")
         print(f"   Apply: {job.url}")
         if job.tags:
             print(f"   Tags: {job.tags}")
-        if job.description:
-            print(f"   Description: {job.description[:200].strip()}...")
+        summary = " ".join(job.text_head(200).split())
+        if summary:
+            print(f"   Description: {summary}...")
         print()
 
 
@@ -45,44 +71,354 @@ def cmd_init(args: argparse.Namespace) -> None:
     print(f"Config saved to {config_path}")
 
 
+def _live_providers(args: argparse.Namespace):
+    if not args.provider:
+        return None
+    provider = PROVIDERS.get(args.provider)
+    if not provider:
+        raise SystemExit(
+            f"Unknown provider {args.provider}. Available: {', '.join(PROVIDERS)}"
+        )
+    return {args.provider: provider}
+
+
+def _criteria(config: AppConfig, text: Optional[str]) -> SearchCriteria:
+    try:
+        criteria = SearchCriteria.from_config(config, text or "")
+    except QueryError as exc:
+        raise SystemExit(f"Invalid query: {exc}")
+    if criteria.query.root is None:
+        criteria = replace(criteria, query=Query("software"))
+    return criteria
+
+
+def _report_live(args: argparse.Namespace, report: SearchReport, cache) -> None:
+    if report.timed_out:
+        print(f"Timed out after {args.timeout:g}s: {', '.join(report.timed_out)}")
+    if report.duplicates:
+        print(f"Collapsed {report.duplicates} duplicate posting(s)")
+    if cache.enabled:
+        print(f"Cache: {cache.stats.summary()}")
+
+
+def _search_live(
+    args: argparse.Namespace, criteria: SearchCriteria, limit: int
+) -> List[JobPosting]:
+    from job_applier.search.cache import configure_cache
+
+    cache = configure_cache(enabled=not args.no_cache, refresh=args.refresh)
+    providers = _live_providers(args)
+    report = SearchReport()
+    query = criteria.keywords
+    if providers:
+        jobs = run_provider(providers[args.provider], query, limit, criteria)
+    else:
+        jobs = search_all(
+            query, limit, timeout=args.timeout, report=report, criteria=criteria
+        )
+    _report_live(args, report, cache)
+    if args.index:
+        indexed = JobIndex(Path(args.index_path)).upsert(jobs)
+        print(f"Indexed {indexed} jobs into {args.index_path}")
+    return jobs
+
+
+def _stream_live(
+    args: argparse.Namespace,
+    config: AppConfig,
+    criteria: SearchCriteria,
+    limit: int,
+    writer: ShortlistWriter,
+) -> None:
+    # Each provider's results are deduplicated, ranked among themselves and
+    # appended as soon as they arrive, so nothing is held for the whole run.
+    from job_applier.search.cache import configure_cache
+    from job_applier.search.ranking import ProfileRanker
+
+    cache = configure_cache(enabled=not args.no_cache, refresh=args.refresh)
+    report = SearchReport()
+    deduplicator = Deduplicator()
+    ranker = ProfileRanker(config)
+    index = JobIndex(Path(args.index_path)) if args.index else None
+    indexed = 0
+    for _, jobs in stream_search(
+        criteria.keywords,
+        limit,
+        timeout=args.timeout,
+        report=report,
+        providers=_live_providers(args),
+        criteria=criteria,
+    ):
+        fresh = deduplicator.filter(jobs)[: limit - writer.count]
+        if index is not None:
+            indexed += index.upsert(fresh)
+        writer.write_many(job for job, _ in ranker.rank(fresh))
+    report.duplicates = deduplicator.collapsed
+    _report_live(args, report, cache)
+    if index is not None:
+        print(f"Indexed {indexed} jobs into {args.index_path}")
+
+
 def cmd_search(args: argparse.Namespace) -> None:
+    from job_applier.apply.dispatcher import save_shortlist
+    from job_applier.search.ranking import ProfileRanker
+
     config = update_from_env(load_config(Path(args.config_path)))
-    query = args.query or " ".join(config.preferences.roles) or "software"
     limit = args.limit
-    if args.provider:
-        provider = PROVIDERS.get(args.provider)
-        if not provider:
-            raise SystemExit(
-                f"Unknown provider {args.provider}. Available: {', '.join(PROVIDERS)}"
-            )
-        jobs = provider(query, limit)
+    # --top-k needs every result before it can cut, so it takes the
+    # buffered path even for line-delimited output.
+    streaming = args.output and is_ndjson(Path(args.output)) and args.top_k is None
+    if streaming and not args.offline:
+        with ShortlistWriter(Path(args.output)) as writer:
+            _stream_live(args, config, _criteria(config, args.query), limit, writer)
+        print(f"Saved {writer.count} jobs to {args.output}")
+        return
+    scores: Optional[List[float]] = None
+    if args.offline:
+        # The index answers with its own full-text match on plain words and
+        # already orders by BM25. Re-ranking a page would break that order
+        # and make --offset skip or repeat jobs, so it is kept as is.
+        query = args.query or " ".join(config.preferences.roles) or "software"
+        jobs = JobIndex(Path(args.index_path)).search(
+            query,
+            limit=min(limit, args.top_k) if args.top_k else limit,
+            offset=args.offset,
+            source=args.provider or None,
+            location=args.location or None,
+        )
     else:
-        jobs = search_all(query, limit)
+        jobs = _search_live(args, _criteria(config, args.query), limit)
+        ranked = ProfileRanker(config).rank(jobs, top_k=args.top_k)
+        jobs = [job for job, _ in ranked]
+        scores = [score for _, score in ranked]
     if args.output:
         save_shortlist(jobs, Path(args.output))
         print(f"Saved {len(jobs)} jobs to {args.output}")
     else:
-        _print_jobs(jobs)
+        _print_jobs(jobs, scores)
+
+
+def _open_store(args: argparse.Namespace):
+    from job_applier.apply.dispatcher import packet_store
+
+    path = Path(args.store_path) if args.store_path else None
+    return packet_store(args.store, path)
+
+
+def _only_range(args: argparse.Namespace):
+    if not args.only:
+        return 0, None
+    try:
+        return parse_range(args.only)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+
+
+def _auto_apply(args: argparse.Namespace, jobs: List[JobPosting]) -> None:
+    from job_applier.apply.dispatcher import auto_apply_jobs
+
+    results = auto_apply_jobs(jobs, force=args.force)
+    print("Auto-apply results:")
+    for entry in results:
+        status = entry.get("status")
+        print(f"- {entry.get('title')} @ {entry.get('company')} [{status}]")
+
+
+def _apply_queued(args: argparse.Namespace, process, store) -> None:
+    from job_applier.apply.queue import (
+        DEFAULT_QUEUE_PATH,
+        LEASE_SECONDS,
+        WorkQueue,
+        run_worker,
+    )
+
+    queue = WorkQueue(Path(args.queue) if args.queue else DEFAULT_QUEUE_PATH)
+    if args.input:
+        start, stop = _only_range(args)
+        jobs = iter_shortlist(Path(args.input), start, stop)
+        added = queue.enqueue(jobs, force=args.force)
+        print(f"Queued {added} new job(s) in {queue.path}")
+    to_open: List[JobPosting] = []
+    if args.worker:
+
+        def on_packet(job: JobPosting, packet: Path) -> None:
+            print(f"- {packet}")
+            if args.auto_apply:
+                to_open.append(job)
+
+        def on_error(exc: Exception) -> None:
+            print(f"Batch failed, returned to the queue: {exc}")
+
+        prepared = run_worker(
+            queue,
+            process,
+            lease=args.lease or LEASE_SECONDS,
+            on_packet=on_packet,
+            on_error=on_error,
+        )
+        print(f"Prepared {prepared} application packet(s).")
+        if to_open:
+            _auto_apply(args, to_open)
+    counts = queue.counts()
+    print("Queue: " + ", ".join(f"{count} {state}" for state, count in counts.items()))
+    queue.close()
+    store.close()
 
 
 def cmd_apply(args: argparse.Namespace) -> None:
+    from job_applier.apply.batch import POLL_INTERVAL, BatchError, run_batch
+    from job_applier.apply.dispatcher import DEFAULT_WORKERS, iter_application_packets
+    from job_applier.letter_cache import LetterCache
+    from job_applier.ratelimit import RateLimiter, limiter_from_env
+
+    queued = bool(args.queue or args.worker)
+    if not args.input and not args.worker:
+        raise SystemExit("apply needs --input, or --worker to drain a queue.")
+    if queued and args.batch:
+        raise SystemExit("--batch can't be combined with --queue or --worker.")
+    if args.worker and args.dry_run:
+        # A worker checkpoints every job it finishes; a dry run would mark
+        # jobs done without writing their packets.
+        raise SystemExit("--dry-run can't be combined with --worker.")
     config = update_from_env(load_config(Path(args.config_path)))
-    jobs = load_shortlist(Path(args.input))
-    if not jobs:
-        print("No jobs found in shortlist.")
+    limiter = limiter_from_env()
+    if args.rpm or args.tpm:
+        limiter = RateLimiter(
+            requests_per_minute=args.rpm, tokens_per_minute=args.tpm
+        )
+    letter_cache = LetterCache(regenerate=args.regenerate)
+    store = _open_store(args)
+    if queued:
+
+        def process(jobs: List[JobPosting]):
+            return iter_application_packets(
+                config,
+                jobs,
+                dry_run=args.dry_run,
+                workers=args.workers or DEFAULT_WORKERS,
+                limiter=limiter,
+                letter_cache=letter_cache,
+                force=args.force,
+                store=store,
+            )
+
+        _apply_queued(args, process, store)
         return
-    packets = build_application_packets(config, jobs, dry_run=args.dry_run)
-    print("Prepared application packets:")
-    for packet in packets:
+    start, stop = _only_range(args)
+    jobs = iter_shortlist(Path(args.input), start, stop)
+    if args.batch:
+        batch_jobs = list(jobs)
+        try:
+            batch_packets = run_batch(
+                config,
+                batch_jobs,
+                dry_run=args.dry_run,
+                letter_cache=letter_cache,
+                poll_interval=args.poll_interval or POLL_INTERVAL,
+                force=args.force,
+                store=store,
+            )
+        except BatchError as exc:
+            raise SystemExit(str(exc))
+        packets = zip(batch_jobs, batch_packets)
+    else:
+        packets = iter_application_packets(
+            config,
+            jobs,
+            dry_run=args.dry_run,
+            workers=args.workers or DEFAULT_WORKERS,
+            limiter=limiter,
+            letter_cache=letter_cache,
+            force=args.force,
+            store=store,
+        )
+    # Packets are reported as they are written; only jobs headed for
+    # auto-apply are kept around.
+    prepared = 0
+    to_open: List[JobPosting] = []
+    for job, packet in packets:
+        if not prepared:
+            print("Prepared application packets:")
         print(f"- {packet}")
+        prepared += 1
+        if args.auto_apply:
+            to_open.append(job)
+    store.close()
+    if not prepared:
+        print("No jobs found in shortlist.")
+        return
     if args.dry_run:
         print("Dry run enabled; no files were written.")
     if args.auto_apply:
-        results = auto_apply_jobs(jobs)
-        print("Auto-apply results:")
-        for entry in results:
-            status = entry.get("status")
-            print(f"- {entry.get('title')} @ {entry.get('company')} [{status}]")
+        _auto_apply(args, to_open)
+
+
+def cmd_packets(args: argparse.Namespace) -> None:
+    store = _open_store(args)
+    if args.export:
+        count = store.export(Path(args.export))
+        print(f"Exported {count} packets to {args.export}")
+    else:
+        for key in store.keys():
+            print(key)
+    store.close()
+
+
+def cmd_watch(args: argparse.Namespace) -> None:
+    from job_applier.search.cache import configure_cache
+
+    if args.output and not is_ndjson(Path(args.output)):
+        raise SystemExit("--output for watch must be a .ndjson or .jsonl file.")
+    config = update_from_env(load_config(Path(args.config_path)))
+    criteria = _criteria(config, args.query)
+    # Polls revalidate every response, so an unchanged feed costs a 304.
+    configure_cache(enabled=not args.no_cache, refresh=True)
+    store = _open_store(args) if args.prepare else None
+
+    def on_new(name: str, jobs: List[JobPosting]) -> None:
+        print(f"{name}: {len(jobs)} new posting(s)")
+        for job in jobs:
+            print(f"- {job.title} @ {job.company} ({job.url})")
+        if args.output:
+            with ShortlistWriter(Path(args.output), append=True) as writer:
+                writer.write_many(jobs)
+        if store is not None:
+            from job_applier.apply.dispatcher import iter_application_packets
+
+            for _, packet in iter_application_packets(
+                config, jobs, dry_run=args.dry_run, store=store
+            ):
+                print(f"  packet: {packet}")
+
+    def on_error(name: str, exc: Exception) -> None:
+        print(f"{name}: poll failed: {exc}")
+
+    watcher = Watcher(
+        WatchState(Path(args.state_path)),
+        criteria,
+        _live_providers(args) or PROVIDERS,
+        on_new,
+        interval=args.interval,
+        jitter=args.jitter,
+        limit=args.limit,
+        on_error=on_error,
+    )
+    try:
+        if args.once:
+            watcher.run_once()
+        else:
+            watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if store is not None:
+            store.close()
+
+
+def cmd_web(args: argparse.Namespace) -> None:
+    from job_applier.web import create_app
+
+    create_app().run(host=args.host, port=args.port, debug=False)
 
 
 def cmd_show_config(args: argparse.Namespace) -> None:
@@ -101,6 +437,20 @@ def cmd_show_config(args: argparse.Namespace) -> None:
     print(f"  Remote only: {config.preferences.remote_only}")
 
 
+def _add_store_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--store",
+        choices=STORE_KINDS,
+        help="Where packets live: one folder per job, or a single SQLite archive "
+        "(default: directory, or $JOB_APPLIER_PACKET_STORE).",
+    )
+    parser.add_argument(
+        "--store-path",
+        help="Packet folder root or archive file (default: applications/ or "
+        "applications/packets.sqlite3).",
+    )
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description=(
@@ -113,6 +463,16 @@ def build_parser() -> argparse.ArgumentParser:
         default=str(Path.home() / ".job_applier" / "config.json"),
         help="Path to the config JSON file.",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-stage timing breakdown when the command finishes.",
+    )
+    parser.add_argument(
+        "--profile-dump",
+        metavar="PATH",
+        help="Run the command under cProfile and write the stats to PATH.",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     init_parser = subparsers.add_parser("init", help="Create a config file.")
@@ -131,33 +491,205 @@ def build_parser() -> argparse.ArgumentParser:
     init_parser.set_defaults(func=cmd_init)
 
     search_parser = subparsers.add_parser("search", help="Search job boards.")
-    search_parser.add_argument("--query", default="")
+    search_parser.add_argument(
+        "--query",
+        default="",
+        help='Terms with AND, OR, NOT or -term, "exact phrases" and field:term '
+        "(title, company, location, tags, description, source). Defaults to "
+        "any of your roles.",
+    )
     search_parser.add_argument("--limit", type=int, default=20)
     search_parser.add_argument("--provider", default="")
-    search_parser.add_argument("--output", help="Save results to JSON file.")
+    search_parser.add_argument(
+        "--top-k",
+        type=int,
+        default=None,
+        help="Keep only the K results that best match your profile.",
+    )
+    search_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=SEARCH_TIMEOUT,
+        help="Overall deadline in seconds for querying all providers.",
+    )
+    search_parser.add_argument(
+        "--output",
+        help="Save results to a shortlist file. A .ndjson or .jsonl name writes "
+        "one job per line as results arrive.",
+    )
+    cache_group = search_parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the provider response cache entirely.",
+    )
+    cache_group.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Revalidate cached provider responses even if they are still fresh.",
+    )
+    index_group = search_parser.add_mutually_exclusive_group()
+    index_group.add_argument(
+        "--offline",
+        action="store_true",
+        help="Answer the query from the local job index instead of the providers.",
+    )
+    index_group.add_argument(
+        "--index",
+        action="store_true",
+        help="Upsert live results into the local job index.",
+    )
+    search_parser.add_argument("--index-path", default=str(DEFAULT_INDEX_PATH))
+    search_parser.add_argument(
+        "--offset", type=int, default=0, help="Skip this many offline results."
+    )
+    search_parser.add_argument(
+        "--location", default="", help="Only offline results matching this location."
+    )
     search_parser.set_defaults(func=cmd_search)
 
     apply_parser = subparsers.add_parser(
         "apply", help="Prepare application packets from a shortlist."
     )
-    apply_parser.add_argument("--input", required=True, help="Path to shortlist JSON.")
+    apply_parser.add_argument(
+        "--input",
+        help="Path to a shortlist: a .json array, or .ndjson/.jsonl read line "
+        "by line.",
+    )
+    apply_parser.add_argument(
+        "--only",
+        metavar="RANGE",
+        help="Only process jobs N-M of the shortlist, counting from 1 "
+        "(e.g. 500-600).",
+    )
     apply_parser.add_argument("--dry-run", action="store_true")
+    apply_parser.add_argument(
+        "--workers",
+        type=int,
+        help="Cover letters to generate concurrently (default: 4, or "
+        "$JOB_APPLIER_LLM_WORKERS).",
+    )
+    apply_parser.add_argument(
+        "--rpm", type=float, help="OpenAI requests-per-minute budget."
+    )
+    apply_parser.add_argument(
+        "--tpm", type=float, help="OpenAI tokens-per-minute budget."
+    )
+    apply_parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit all prompts as one OpenAI batch job and wait for it. "
+        "Safe to rerun after an interruption; it resumes the same batch.",
+    )
+    apply_parser.add_argument(
+        "--poll-interval",
+        type=float,
+        help="Seconds between batch status checks (default: 30).",
+    )
+    apply_parser.add_argument(
+        "--regenerate",
+        action="store_true",
+        help="Ignore cached cover letters and generate fresh ones.",
+    )
+    apply_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild packets and reopen jobs already in the application log.",
+    )
     apply_parser.add_argument(
         "--auto-apply",
         action="store_true",
-        help="Open apply URLs in your browser and write a log file.",
+        help="Open apply URLs in your browser and append them to the log.",
+    )
+    apply_parser.add_argument(
+        "--queue",
+        metavar="PATH",
+        help="Add the --input jobs to this durable work queue instead of "
+        "processing them here (default for --worker: applications/queue.sqlite3).",
     )
+    apply_parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Claim jobs from the queue and prepare their packets until it is "
+        "empty. Run several at once to share the work.",
+    )
+    apply_parser.add_argument(
+        "--lease",
+        type=float,
+        help="Seconds a claimed job stays reserved without a heartbeat before "
+        "another worker takes it back (default: 300).",
+    )
+    _add_store_arguments(apply_parser)
     apply_parser.set_defaults(func=cmd_apply)
 
+    packets_parser = subparsers.add_parser(
+        "packets", help="List or export prepared application packets."
+    )
+    packets_parser.add_argument(
+        "--export",
+        metavar="DIR",
+        help="Write every packet out as cover_letter.txt/summary.txt folders.",
+    )
+    _add_store_arguments(packets_parser)
+    packets_parser.set_defaults(func=cmd_packets)
+
+    watch_parser = subparsers.add_parser(
+        "watch", help="Poll job boards and report only postings not seen before."
+    )
+    watch_parser.add_argument("--query", default="")
+    watch_parser.add_argument("--provider", default="")
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help="Seconds between polls of each provider.",
+    )
+    watch_parser.add_argument(
+        "--jitter",
+        type=float,
+        default=DEFAULT_JITTER,
+        help="Randomize each interval by up to this fraction.",
+    )
+    watch_parser.add_argument(
+        "--limit",
+        type=int,
+        default=POLL_LIMIT,
+        help="Most new postings handed on at a time.",
+    )
+    watch_parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Poll every provider once and exit, e.g. from cron.",
+    )
+    watch_parser.add_argument(
+        "--state-path",
+        default=str(DEFAULT_STATE_PATH),
+        help="Where the postings already seen per provider are kept.",
+    )
+    watch_parser.add_argument(
+        "--output", help="Append new postings to this .ndjson/.jsonl shortlist."
+    )
+    watch_parser.add_argument(
+        "--prepare",
+        action="store_true",
+        help="Prepare application packets for new postings as they arrive.",
+    )
+    watch_parser.add_argument("--dry-run", action="store_true")
+    watch_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the provider response cache entirely.",
+    )
+    _add_store_arguments(watch_parser)
+    watch_parser.set_defaults(func=cmd_watch)
+
     show_parser = subparsers.add_parser("config", help="Show loaded config.")
     show_parser.set_defaults(func=cmd_show_config)
 
     web_parser = subparsers.add_parser("web", help="Run the web UI.")
     web_parser.add_argument("--host", default="127.0.0.1")
     web_parser.add_argument("--port", type=int, default=8000)
-    web_parser.set_defaults(
-        func=lambda args: create_app().run(host=args.host, port=args.port, debug=False)
-    )
+    web_parser.set_defaults(func=cmd_web)
 
     return parser
 
@@ -165,7 +697,20 @@ def build_parser() -> argparse.ArgumentParser:
 def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
-    args.func(args)
+    if args.profile_dump:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(args.func, args)
+        finally:
+            profiler.dump_stats(args.profile_dump)
+            print(f"Wrote cProfile stats to {args.profile_dump}")
+    else:
+        args.func(args)
+    if args.profile:
+        print()
+        print(metrics.stage_report())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+
+DEFAULT_CACHE_DIR = Path(
+    os.getenv("JOB_APPLIER_CACHE_DIR", str(Path.home() / ".job_applier" / "cache"))
+)
+
+
+def hash_key(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+# One file per entry. Reads bump the file's mtime, so evicting the oldest
+# mtimes first gives LRU order without an index that the CLI and the web app
+# would both have to keep in sync.
+class DiskCache:
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: Optional[float] = None,
+        suffix: str = ".bin",
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.suffix}"
+
+    def _entries(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        if not self.directory.exists():
+            return
+        for path in self.directory.glob(f"*/*{self.suffix}"):
+            try:
+                yield path, path.stat()
+            except FileNotFoundError:
+                continue
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            if self.max_age is not None and time.time() - stat.st_mtime > self.max_age:
+                self._remove(path, stat.st_size)
+                return None
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            previous = path.stat().st_size
+        except FileNotFoundError:
+            previous = 0
+        handle, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                temp_file.write(data)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            if self._size is not None:
+                self._size += len(data) - previous
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        try:
+            self._remove(path, path.stat().st_size)
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for path, stat in list(self._entries()):
+            self._remove(path, stat.st_size)
+
+    def size(self) -> int:
+        with self._lock:
+            if self._size is None:
+                self._size = sum(stat.st_size for _, stat in self._entries())
+            return self._size
+
+    def _remove(self, path: Path, size: int) -> None:
+        path.unlink(missing_ok=True)
+        with self._lock:
+            if self._size is not None:
+                self._size = max(0, self._size - size)
+
+    def _evict(self) -> None:
+        if self.size() <= self.max_bytes:
+            return
+        entries = sorted(self._entries(), key=lambda item: item[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        target = int(self.max_bytes * 0.9)
+        for path, stat in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+        with self._lock:
+            self._size = total
@@ -0,0 +1,159 @@
+import os
+import random
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+@dataclass
+class HttpSettings:
+    pool_connections: int = 10
+    pool_maxsize: int = 20
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    backoff_jitter: float = 0.5
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    llm_read_timeout: float = 45.0
+
+
+class _JitteredRetry(Retry):
+    # urllib3 only grew native jitter in 2.0; add it here so older installs
+    # don't retry in lock-step against a rate-limited host.
+    def __init__(self, *args: Any, jitter: float = 0.0, **kwargs: Any) -> None:
+        self.jitter = jitter
+        super().__init__(*args, **kwargs)
+
+    def new(self, **kwargs: Any) -> "_JitteredRetry":
+        kwargs.setdefault("jitter", self.jitter)
+        return super().new(**kwargs)
+
+    def is_retry(
+        self, method: str, status_code: int, has_retry_after: bool = False
+    ) -> bool:
+        # A 429 turns the request away before it runs, so even a POST is safe
+        # to send again. Read timeouts on a POST are not retried: the server
+        # may already have created the completion, file or batch.
+        if status_code == 429 and status_code in (self.status_forcelist or ()):
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0 or self.jitter <= 0:
+            return backoff
+        return backoff + random.uniform(0, self.jitter)
+
+
+def settings_from_env() -> HttpSettings:
+    defaults = HttpSettings()
+    return HttpSettings(
+        pool_connections=int(
+            os.getenv("JOB_APPLIER_HTTP_POOL_CONNECTIONS", defaults.pool_connections)
+        ),
+        pool_maxsize=int(
+            os.getenv("JOB_APPLIER_HTTP_POOL_MAXSIZE", defaults.pool_maxsize)
+        ),
+        max_retries=int(os.getenv("JOB_APPLIER_HTTP_RETRIES", defaults.max_retries)),
+        backoff_factor=float(
+            os.getenv("JOB_APPLIER_HTTP_BACKOFF", defaults.backoff_factor)
+        ),
+        backoff_jitter=float(
+            os.getenv("JOB_APPLIER_HTTP_JITTER", defaults.backoff_jitter)
+        ),
+        connect_timeout=float(
+            os.getenv("JOB_APPLIER_HTTP_CONNECT_TIMEOUT", defaults.connect_timeout)
+        ),
+        read_timeout=float(
+            os.getenv("JOB_APPLIER_HTTP_READ_TIMEOUT", defaults.read_timeout)
+        ),
+        llm_read_timeout=float(
+            os.getenv("JOB_APPLIER_LLM_READ_TIMEOUT", defaults.llm_read_timeout)
+        ),
+    )
+
+
+_lock = threading.Lock()
+_settings: Optional[HttpSettings] = None
+_session: Optional[requests.Session] = None
+
+
+def _build_session(settings: HttpSettings) -> requests.Session:
+    retry = _JitteredRetry(
+        total=settings.max_retries,
+        connect=settings.max_retries,
+        read=settings.max_retries,
+        status=settings.max_retries,
+        backoff_factor=settings.backoff_factor,
+        jitter=settings.backoff_jitter,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.pool_connections,
+        pool_maxsize=settings.pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def configure(settings: Optional[HttpSettings] = None) -> HttpSettings:
+    global _settings, _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _settings = settings or settings_from_env()
+        _session = None
+        return _settings
+
+
+def get_settings() -> HttpSettings:
+    global _settings
+    with _lock:
+        if _settings is None:
+            _settings = settings_from_env()
+        return _settings
+
+
+def get_session() -> requests.Session:
+    global _session
+    settings = get_settings()
+    with _lock:
+        if _session is None:
+            _session = _build_session(settings)
+        return _session
+
+
+def timeout_for(purpose: str = "default") -> Tuple[float, float]:
+    settings = get_settings()
+    if purpose == "llm":
+        return settings.connect_timeout, settings.llm_read_timeout
+    return settings.connect_timeout, settings.read_timeout
+
+
+def get(url: str, purpose: str = "default", **kwargs: Any) -> requests.Response:
+    kwargs.setdefault("timeout", timeout_for(purpose))
+    return get_session().get(url, **kwargs)
+
+
+def post(url: str, purpose: str = "default", **kwargs: Any) -> requests.Response:
+    kwargs.setdefault("timeout", timeout_for(purpose))
+    return get_session().post(url, **kwargs)
+
+
+def request(
+    method: str, url: str, purpose: str = "default", **kwargs: Any
+) -> requests.Response:
+    kwargs.setdefault("timeout", timeout_for(purpose))
+    return get_session().request(method, url, **kwargs)
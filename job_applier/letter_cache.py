@@ -0,0 +1,57 @@
+import json
+from typing import Optional
+
+from job_applier.config import AppConfig
+from job_applier.diskcache import DEFAULT_CACHE_DIR, DiskCache, hash_key
+from job_applier.search.models import JobPosting
+
+
+LETTER_CACHE_DIR = DEFAULT_CACHE_DIR / "letters"
+LETTER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+LETTER_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def letter_key(config: AppConfig, job: JobPosting, model: str, prompt: str) -> str:
+    # Only inputs that change the generated text belong in the key; contact
+    # details such as email or phone don't reach the prompt.
+    material = {
+        "profile": {
+            "full_name": config.profile.full_name,
+            "skills": list(config.profile.skills),
+            "resume_path": config.profile.resume_path,
+        },
+        "job": {
+            "title": job.title,
+            "company": job.company,
+            "location": job.location,
+            "description": job.description,
+        },
+        "model": model,
+        "template": config.cover_letter_template,
+        "prompt": prompt,
+    }
+    return hash_key(json.dumps(material, sort_keys=True))
+
+
+class LetterCache:
+    def __init__(
+        self,
+        store: Optional[DiskCache] = None,
+        regenerate: bool = False,
+    ) -> None:
+        self.store = store or DiskCache(
+            LETTER_CACHE_DIR,
+            max_bytes=LETTER_CACHE_MAX_BYTES,
+            max_age=LETTER_CACHE_MAX_AGE,
+            suffix=".txt",
+        )
+        self.regenerate = regenerate
+
+    def get(self, key: str) -> Optional[str]:
+        if self.regenerate:
+            return None
+        data = self.store.get(key)
+        return data.decode("utf-8") if data is not None else None
+
+    def set(self, key: str, letter: str) -> None:
+        self.store.set(key, letter.encode("utf-8"))
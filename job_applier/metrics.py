@@ -0,0 +1,186 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+TOKEN_BUCKETS = (64, 128, 256, 512, 768, 1024, 1536, 2048, 4096, 8192)
+
+HELP = {
+    "job_applier_provider_seconds": "Time spent in one job board provider call.",
+    "job_applier_provider_calls_total": "Provider calls by outcome.",
+    "job_applier_provider_jobs_total": "Postings returned by each provider.",
+    "job_applier_json_decode_seconds": "Time spent decoding provider JSON bodies.",
+    "job_applier_llm_seconds": "Latency of cover letter completion requests.",
+    "job_applier_llm_requests_total": "Cover letter generations by outcome.",
+    "job_applier_llm_tokens_total": "Tokens reported by the completion API.",
+    "job_applier_llm_prompt_tokens": "Prompt tokens per completion request.",
+    "job_applier_llm_completion_tokens": "Completion tokens per request.",
+    "job_applier_packet_write_seconds": "Time spent writing a batch of packets.",
+    "job_applier_packets_written_total": "Application packets written.",
+    "job_applier_coalesced_total": "Calls that joined an identical in-flight call.",
+    "job_applier_watch_poll_seconds": "Time spent in one watch poll of a provider.",
+    "job_applier_watch_new_total": "New postings found by watch polls.",
+    "job_applier_queue_enqueued_total": "Jobs added to the packet work queue.",
+    "job_applier_queue_done_total": "Queued jobs whose packet was stored.",
+    "job_applier_queue_failed_total": "Queued jobs whose batch raised an error.",
+    "job_applier_queue_reclaimed_total": "Expired leases taken back from workers.",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclass
+class Histogram:
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    counts: List[int] = field(default_factory=lambda: [0] * len(DEFAULT_BUCKETS))
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+
+    def inc(self, name: str, amount: float = 1.0, **labels: object) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+        **labels: object,
+    ) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets, [0] * len(buckets))
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: object) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def counters(self) -> Dict[str, Dict[Labels, float]]:
+        with self._lock:
+            return {name: dict(series) for name, series in self._counters.items()}
+
+    def timings(self) -> List[Tuple[str, Labels, int, float, float]]:
+        with self._lock:
+            return [
+                (name, labels, item.count, item.total, item.maximum)
+                for name, series in sorted(self._histograms.items())
+                for labels, item in sorted(series.items())
+            ]
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, item in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(item.buckets, item.counts):
+                        cumulative += count
+                        le = _format_labels(labels, (("le", f"{bound:g}"),))
+                        lines.append(f"{name}_bucket{le} {cumulative}")
+                    le = _format_labels(labels, (("le", "+Inf"),))
+                    lines.append(f"{name}_bucket{le} {item.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {item.total:.6f}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {item.count}")
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def inc(name: str, amount: float = 1.0, **labels: object) -> None:
+    REGISTRY.inc(name, amount, **labels)
+
+
+def observe(
+    name: str,
+    value: float,
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    **labels: object,
+) -> None:
+    REGISTRY.observe(name, value, buckets, **labels)
+
+
+def timer(name: str, **labels: object):
+    return REGISTRY.timer(name, **labels)
+
+
+def render_prometheus() -> str:
+    return REGISTRY.render_prometheus()
+
+
+def stage_report() -> str:
+    rows = [row for row in REGISTRY.timings() if row[0].endswith("_seconds")]
+    if not rows:
+        return "No timings recorded."
+    lines = [f"{'stage':58} {'calls':>6} {'total s':>9} {'mean ms':>9} {'max ms':>9}"]
+    for name, labels, count, total, maximum in rows:
+        stage = name.removeprefix("job_applier_").removesuffix("_seconds")
+        if labels:
+            stage += " " + ",".join(f"{key}={value}" for key, value in labels)
+        mean = total / count * 1000 if count else 0.0
+        lines.append(
+            f"{stage:58} {count:>6} {total:>9.3f} {mean:>9.1f} {maximum * 1000:>9.1f}"
+        )
+    for name, series in sorted(REGISTRY.counters().items()):
+        counter = name.removeprefix("job_applier_")
+        for labels, total in sorted(series.items()):
+            label_text = ",".join(f"{key}={value}" for key, value in labels)
+            lines.append(f"{counter} {label_text}".rstrip() + f": {total:g}")
+    return "\n".join(lines)
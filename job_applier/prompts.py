@@ -0,0 +1,205 @@
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Set, Tuple
+
+from job_applier.config import AppConfig
+from job_applier.search.models import JobPosting
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+
+PROMPT_TOKEN_BUDGET = int(os.getenv("JOB_APPLIER_PROMPT_TOKENS", "900"))
+DEFAULT_ENCODING = "o200k_base"
+
+SYSTEM_INSTRUCTIONS = (
+    "You are a helpful career assistant. Write a concise, tailored cover letter "
+    "for the role the user describes, using the candidate profile below. Keep it "
+    "under 200 words and mention only experience the profile supports."
+)
+
+# Section headings worth keeping when the description has to be cut, and the
+# ones to drop first.
+RELEVANT_HEADINGS = re.compile(
+    r"role|responsib|you(?:'ll| will) do|what you|requirement|qualification"
+    r"|you have|skills|experience|profil|aufgaben|about the (?:job|position)",
+    re.I,
+)
+LOW_VALUE_HEADINGS = re.compile(
+    r"benefit|perks|we offer|salary|compensation|equal opportunit|diversity"
+    r"|how to apply|application process|about us|who we are",
+    re.I,
+)
+_WORD = re.compile(r"[\w+#]+")
+_SENTENCE_END = (".", "!", "?", ";", ",")
+
+_counter_lock = threading.Lock()
+_counter: Optional[Callable[[str], int]] = None
+
+
+def _estimate(text: str) -> int:
+    # About four characters per token for English prose.
+    return len(text) // 4 + 1
+
+
+def _get_counter() -> Callable[[str], int]:
+    global _counter
+    with _counter_lock:
+        if _counter is None:
+            _counter = _estimate
+            if tiktoken is not None:
+                try:
+                    encoding = tiktoken.get_encoding(
+                        os.getenv("JOB_APPLIER_TOKEN_ENCODING", DEFAULT_ENCODING)
+                    )
+                except Exception:  # noqa: BLE001 - the BPE file may need a download
+                    pass
+                else:
+
+                    def _count(text: str) -> int:
+                        return len(encoding.encode_ordinary(text))
+
+                    _counter = _count
+        return _counter
+
+
+def count_tokens(text: str) -> int:
+    return _get_counter()(text)
+
+
+@dataclass
+class Section:
+    heading: str
+    lines: List[str]
+    position: int
+    score: float = 0.0
+
+    @property
+    def text(self) -> str:
+        return "\n".join(([self.heading] if self.heading else []) + self.lines)
+
+
+@dataclass
+class Prompt:
+    system: str
+    user: str
+    tokens: int
+    trimmed: bool = False
+
+    @property
+    def text(self) -> str:
+        return f"{self.system}\n\n{self.user}"
+
+
+def _is_heading(line: str) -> bool:
+    return (
+        len(line) <= 60
+        and not line.startswith("- ")
+        and not line.endswith(_SENTENCE_END)
+    )
+
+
+def split_sections(text: str) -> List[Section]:
+    sections = [Section("", [], 0)]
+    for line in text.splitlines():
+        if _is_heading(line):
+            sections.append(Section(line.rstrip(":"), [], len(sections)))
+        else:
+            sections[-1].lines.append(line)
+    return [section for section in sections if section.heading or section.lines]
+
+
+def _profile_terms(config: AppConfig) -> Set[str]:
+    phrases = list(config.profile.skills) + list(config.preferences.roles)
+    return {word for phrase in phrases for word in _WORD.findall(phrase.lower())}
+
+
+def _score(section: Section, terms: Set[str]) -> float:
+    words = _WORD.findall(section.text.lower())
+    score = sum(1.0 for word in words if word in terms) / (1 + len(words)) ** 0.5
+    if RELEVANT_HEADINGS.search(section.heading):
+        score += 1.0
+    elif LOW_VALUE_HEADINGS.search(section.heading):
+        score -= 1.0
+    if section.position == 0:
+        # The opening paragraph usually says what the company does.
+        score += 0.5
+    return score
+
+
+def _fit(section: Section, budget: int) -> Optional[Section]:
+    # Keeps whole lines from the top of a section until the budget runs out.
+    kept = Section(section.heading, [], section.position, section.score)
+    if count_tokens(kept.text) > budget:
+        return None
+    for line in section.lines:
+        kept.lines.append(line)
+        if count_tokens(kept.text) > budget:
+            kept.lines.pop()
+            break
+    return kept if kept.lines else None
+
+
+def trim_description(text: str, budget: int, terms: Set[str]) -> Tuple[str, bool]:
+    if count_tokens(text) <= budget:
+        return text, False
+    sections = split_sections(text)
+    for section in sections:
+        section.score = _score(section, terms)
+    chosen: List[Section] = []
+    remaining = budget
+    for section in sorted(sections, key=lambda item: (-item.score, item.position)):
+        if remaining <= 0:
+            break
+        cost = count_tokens(section.text) + 1
+        if cost <= remaining:
+            chosen.append(section)
+            remaining -= cost
+            continue
+        partial = _fit(section, remaining - 1)
+        if partial is not None:
+            chosen.append(partial)
+            remaining -= count_tokens(partial.text) + 1
+    chosen.sort(key=lambda item: item.position)
+    return "\n".join(section.text for section in chosen), True
+
+
+def profile_block(config: AppConfig) -> str:
+    profile = config.profile
+    return (
+        "Candidate profile:\n"
+        f"Name: {profile.full_name}\n"
+        f"Skills: {', '.join(profile.skills)}\n"
+        f"Target roles: {', '.join(config.preferences.roles)}\n"
+        f"Resume: {profile.resume_path}"
+    )
+
+
+def build_prompt(
+    config: AppConfig, job: JobPosting, budget: int = PROMPT_TOKEN_BUDGET
+) -> Prompt:
+    # Everything that is the same for every job goes in the system message,
+    # ahead of anything job-specific, so a batch of letters shares one cached
+    # prompt prefix with the provider.
+    system = f"{SYSTEM_INSTRUCTIONS}\n\n{profile_block(config)}"
+    header = (
+        f"Job Title: {job.title}\n"
+        f"Company: {job.company}\n"
+        f"Location: {job.location}\n"
+        "Description:\n"
+    )
+    fixed = count_tokens(system) + count_tokens(header)
+    description, trimmed = trim_description(
+        job.description_text, max(0, budget - fixed), _profile_terms(config)
+    )
+    user = header + description
+    return Prompt(
+        system=system,
+        user=user,
+        tokens=fixed + count_tokens(description),
+        trimmed=trimmed,
+    )
@@ -0,0 +1,73 @@
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        refilled = self._tokens + (now - self._updated) * self.rate
+        self._tokens = min(self.capacity, refilled)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        # Requests larger than the bucket would never fit; let them through
+        # once the bucket is full rather than blocking forever.
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ) -> None:
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def acquire(self, tokens: int = 0) -> float:
+        waited = 0.0
+        if self.requests is not None:
+            waited += self.requests.acquire(1)
+        if self.tokens is not None and tokens:
+            waited += self.tokens.acquire(tokens)
+        return waited
+
+
+def limiter_from_env() -> RateLimiter:
+    requests_per_minute = os.getenv("OPENAI_RPM")
+    tokens_per_minute = os.getenv("OPENAI_TPM")
+    return RateLimiter(
+        requests_per_minute=float(requests_per_minute) if requests_per_minute else None,
+        tokens_per_minute=float(tokens_per_minute) if tokens_per_minute else None,
+    )
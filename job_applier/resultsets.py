@@ -0,0 +1,63 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from job_applier.search.models import JobPosting
+
+
+class ResultSetStore:
+    def __init__(
+        self,
+        max_sets: int = 256,
+        ttl: float = 30 * 60,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_sets = max_sets
+        self.ttl = ttl
+        self._clock = clock
+        self._sets: "OrderedDict[str, Tuple[float, List[JobPosting]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._sets:
+            result_id, (touched, _) = next(iter(self._sets.items()))
+            if now - touched <= self.ttl and len(self._sets) <= self.max_sets:
+                break
+            del self._sets[result_id]
+
+    def put(self, jobs: List[JobPosting], result_id: Optional[str] = None) -> str:
+        # The list is stored by reference, so a background search can keep
+        # appending rows after its id has been handed out.
+        result_id = result_id or secrets.token_urlsafe(16)
+        now = self._clock()
+        with self._lock:
+            self._sets[result_id] = (now, jobs)
+            self._sets.move_to_end(result_id)
+            self._evict(now)
+        return result_id
+
+    def get(self, result_id: str) -> Optional[List[JobPosting]]:
+        now = self._clock()
+        with self._lock:
+            self._evict(now)
+            entry = self._sets.get(result_id)
+            if entry is None:
+                return None
+            self._sets[result_id] = (now, entry[1])
+            self._sets.move_to_end(result_id)
+            return entry[1]
+
+    def select(
+        self, result_id: str, indices: Iterable[str]
+    ) -> Optional[List[JobPosting]]:
+        jobs = self.get(result_id)
+        if jobs is None:
+            return None
+        wanted = sorted({int(index) for index in indices if str(index).isdigit()})
+        return [jobs[index] for index in wanted if index < len(jobs)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sets)
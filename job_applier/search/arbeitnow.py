@@ -1,35 +1,135 @@
-from typing import List
-
-import requests
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from job_applier.search import cache
 from job_applier.search.models import JobPosting
+from job_applier.search.providers import SingleFlight
+from job_applier.search.query import SearchCriteria
 
 
 API_URL = "https://www.arbeitnow.com/api/job-board-api"
+CACHE_TTL = 10 * 60
+MAX_PAGES = 25
+
+# The API has no search parameter: every query reads the same pages. Each
+# page is fetched and parsed once, shared by concurrent callers, and kept
+# for CACHE_TTL so later queries only filter it. Rows carry the board's own
+# remote flag, which the posting's location text often doesn't show.
+FeedRow = Tuple[JobPosting, bool]
+FeedPage = Tuple[List[FeedRow], bool]
+PageKey = Tuple[int, bool]
+_pages: Dict[PageKey, Tuple[float, FeedPage]] = {}
+_pages_lock = threading.Lock()
+_page_flight = SingleFlight("arbeitnow")
+
+
+def _fetch_page(page: int, remote_only: bool = False) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"page": page}
+    if remote_only:
+        params["remote"] = "true"
+    return cache.get_json(API_URL, params=params, ttl=CACHE_TTL)
+
+
+def _matches(job: JobPosting, query_lower: str) -> bool:
+    return query_lower in job.title.lower() or query_lower in job.company.lower()
+
+
+def _to_posting(job: Dict[str, Any]) -> JobPosting:
+    return JobPosting(
+        source="arbeitnow",
+        title=job.get("title", ""),
+        company=job.get("company_name", ""),
+        location=job.get("location", ""),
+        url=job.get("url", ""),
+        description=job.get("description", ""),
+        tags=", ".join(job.get("tags", []) or []),
+    )
+
+
+def _load_page(page: int, remote_only: bool) -> FeedPage:
+    payload = _fetch_page(page, remote_only)
+    rows = payload.get("data") or []
+    has_next = bool(rows) and bool((payload.get("links") or {}).get("next"))
+    return [(_to_posting(job), bool(job.get("remote"))) for job in rows], has_next
 
 
-def search_arbeitnow(query: str, limit: int) -> List[JobPosting]:
-    response = requests.get(API_URL, timeout=30)
-    response.raise_for_status()
-    payload = response.json()
-    jobs = []
-    query_lower = query.lower()
-    for job in payload.get("data", []):
-        title = job.get("title", "")
-        company = job.get("company_name", "")
-        if query_lower not in title.lower() and query_lower not in company.lower():
-            continue
-        jobs.append(
-            JobPosting(
-                source="arbeitnow",
-                title=title,
-                company=company,
-                location=job.get("location", ""),
-                url=job.get("url", ""),
-                description=job.get("description", ""),
-                tags=", ".join(job.get("tags", []) or []),
-            )
+def feed_page(page: int, remote_only: bool = False) -> FeedPage:
+    # --refresh and --no-cache mean the caller wants the upstream feed, so
+    # the parsed copy is only reused when the response cache would be.
+    key = (page, remote_only)
+    response_cache = cache.get_cache()
+    if response_cache.enabled and not response_cache.refresh:
+        with _pages_lock:
+            entry = _pages.get(key)
+        if entry is not None and time.monotonic() - entry[0] < CACHE_TTL:
+            return entry[1]
+    result = _page_flight.do(key, lambda: _load_page(page, remote_only))
+    with _pages_lock:
+        _pages[key] = (time.monotonic(), result)
+    return result
+
+
+def clear_feed() -> None:
+    with _pages_lock:
+        _pages.clear()
+
+
+def _iter_rows(
+    keep: Callable[[JobPosting, bool], bool],
+    limit: Optional[int],
+    max_pages: int,
+    remote_only: bool,
+) -> Iterator[FeedRow]:
+    found = 0
+    page = 1
+    prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="arbeitnow")
+    upcoming: Optional[Future] = prefetcher.submit(feed_page, page, remote_only)
+    try:
+        while upcoming is not None:
+            rows, has_next = upcoming.result()
+            matches = [(job, remote) for job, remote in rows if keep(job, remote)]
+            found += len(matches)
+            upcoming = None
+            # Only prefetch when this page can't satisfy the caller, so small
+            # limits still cost a single request.
+            if has_next and page < max_pages and (limit is None or found < limit):
+                page += 1
+                upcoming = prefetcher.submit(feed_page, page, remote_only)
+            yield from matches
+    finally:
+        prefetcher.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_feed(
+    remote_only: bool = False, max_pages: int = MAX_PAGES
+) -> Iterator[FeedRow]:
+    # Every row, newest first, for callers that track what they have seen.
+    return _iter_rows(lambda job, remote: True, None, max_pages, remote_only)
+
+
+def iter_arbeitnow(
+    query: str,
+    limit: Optional[int] = None,
+    max_pages: int = MAX_PAGES,
+    criteria: Optional[SearchCriteria] = None,
+) -> Iterator[JobPosting]:
+    if criteria is None:
+        query_lower = query.lower()
+        rows = _iter_rows(
+            lambda job, remote: _matches(job, query_lower), limit, max_pages, False
         )
-        if len(jobs) >= limit:
-            break
-    return jobs
+    else:
+        # Asking for remote rows only shrinks the download when the API
+        # honours it; each row's own flag is checked either way.
+        rows = _iter_rows(criteria.accepts, limit, max_pages, criteria.remote_only)
+    for job, _ in rows:
+        yield job
+
+
+def search_arbeitnow(
+    query: str, limit: int, criteria: Optional[SearchCriteria] = None
+) -> List[JobPosting]:
+    return list(islice(iter_arbeitnow(query, limit, criteria=criteria), limit))
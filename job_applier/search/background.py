@@ -0,0 +1,165 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Mapping, Optional
+
+from job_applier.config import AppConfig
+from job_applier.search.dedup import Deduplicator
+from job_applier.search.models import JobPosting
+from job_applier.search.providers import (
+    SEARCH_TIMEOUT,
+    SearchFn,
+    SearchReport,
+    stream_search,
+)
+from job_applier.search.query import SearchCriteria
+from job_applier.search.ranking import ProfileRanker
+
+
+class TooManySearches(RuntimeError):
+    pass
+
+
+@dataclass
+class SearchTask:
+    task_id: str
+    providers: Dict[str, str]
+    status: str = "running"
+    jobs: List[JobPosting] = field(default_factory=list)
+    scores: List[float] = field(default_factory=list)
+    error: Optional[str] = None
+    finished_at: Optional[float] = None
+    condition: threading.Condition = field(default_factory=threading.Condition)
+
+    def snapshot(self, since: int = 0) -> Dict[str, Any]:
+        with self.condition:
+            # The raw HTML stays server-side; the page shows the clean text.
+            rows = [
+                dict(asdict(job), index=index, score=self.scores[index])
+                for index, job in enumerate(self.jobs[since:], start=since)
+            ]
+            for row in rows:
+                del row["description"]
+            return {
+                "id": self.task_id,
+                "status": self.status,
+                "providers": dict(self.providers),
+                "rows": rows,
+                "next": len(self.jobs),
+                "error": self.error,
+            }
+
+    def wait(self, since: int, revision: Dict[str, str], timeout: float) -> bool:
+        # True once there is anything new for a client that has seen `since`
+        # rows and the given provider states.
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: len(self.jobs) > since
+                or self.providers != revision
+                or self.status != "running",
+                timeout=timeout,
+            )
+
+
+class SearchTaskManager:
+    def __init__(
+        self,
+        workers: int = 4,
+        max_tasks: int = 200,
+        ttl: float = 15 * 60,
+        timeout: float = SEARCH_TIMEOUT,
+    ) -> None:
+        self.max_tasks = max_tasks
+        self.ttl = ttl
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="search-task"
+        )
+        self._tasks: "OrderedDict[str, SearchTask]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, room: int = 0) -> None:
+        # Only finished tasks are dropped, oldest first: a running one still
+        # has a worker writing to it and, usually, a client streaming it.
+        now = time.time()
+        excess = len(self._tasks) + room - self.max_tasks
+        for task_id, task in list(self._tasks.items()):
+            finished = task.finished_at
+            if finished is None:
+                continue
+            if excess > 0 or now - finished > self.ttl:
+                del self._tasks[task_id]
+                excess -= 1
+
+    def get(self, task_id: str) -> Optional[SearchTask]:
+        with self._lock:
+            self._evict()
+            return self._tasks.get(task_id)
+
+    def start(
+        self,
+        config: AppConfig,
+        criteria: SearchCriteria,
+        limit: int,
+        providers: Mapping[str, SearchFn],
+    ) -> SearchTask:
+        task = SearchTask(
+            task_id=uuid.uuid4().hex,
+            providers={name: "pending" for name in providers},
+        )
+        with self._lock:
+            self._evict(room=1)
+            if len(self._tasks) >= self.max_tasks:
+                raise TooManySearches(
+                    f"{len(self._tasks)} searches are already running; "
+                    "try again shortly."
+                )
+            self._tasks[task.task_id] = task
+        self._executor.submit(self._run, task, config, criteria, limit, providers)
+        return task
+
+    def _run(
+        self,
+        task: SearchTask,
+        config: AppConfig,
+        criteria: SearchCriteria,
+        limit: int,
+        providers: Mapping[str, SearchFn],
+    ) -> None:
+        ranker = ProfileRanker(config)
+        deduplicator = Deduplicator()
+        report = SearchReport()
+        try:
+            for name, jobs in stream_search(
+                criteria.keywords,
+                limit,
+                timeout=self.timeout,
+                report=report,
+                providers=providers,
+                criteria=criteria,
+            ):
+                fresh = deduplicator.filter(jobs)
+                scores = list(ranker.score(fresh)) if fresh else []
+                if name in report.timed_out:
+                    state = "timed out"
+                elif name in report.failed:
+                    state = "failed"
+                else:
+                    state = "done"
+                with task.condition:
+                    room = max(0, limit - len(task.jobs))
+                    task.jobs.extend(fresh[:room])
+                    task.scores.extend(float(score) for score in scores[:room])
+                    task.providers[name] = state
+                    task.condition.notify_all()
+        except Exception as exc:  # noqa: BLE001 - surfaced to the client
+            with task.condition:
+                task.error = str(exc)
+        finally:
+            with task.condition:
+                task.status = "done"
+                task.finished_at = time.time()
+                task.condition.notify_all()
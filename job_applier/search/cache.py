@@ -0,0 +1,146 @@
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlencode
+
+from job_applier import http, metrics
+from job_applier.diskcache import DEFAULT_CACHE_DIR, DiskCache, hash_key
+
+
+HTTP_CACHE_DIR = DEFAULT_CACHE_DIR / "http"
+HTTP_CACHE_MAX_BYTES = 128 * 1024 * 1024
+DEFAULT_TTL = 10 * 60
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.hits} hit(s), {self.revalidated} revalidated, "
+            f"{self.misses} miss(es)"
+        )
+
+
+def _decode(body: bytes) -> Any:
+    with metrics.timer("job_applier_json_decode_seconds"):
+        return json.loads(body)
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        store: Optional[DiskCache] = None,
+        enabled: bool = True,
+        refresh: bool = False,
+    ) -> None:
+        self.store = store or DiskCache(
+            HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES, suffix=".http"
+        )
+        self.enabled = enabled
+        self.refresh = refresh
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self.stats, outcome, getattr(self.stats, outcome) + 1)
+
+    @staticmethod
+    def key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        return hash_key(url, query)
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self.store.get(key)
+        if raw is None:
+            return None
+        # Entries are a one-line metadata header followed by the raw body,
+        # so a hit parses the payload once instead of unwrapping it first.
+        header, _, body = raw.partition(b"\n")
+        try:
+            meta = json.loads(header)
+        except ValueError:
+            self.store.delete(key)
+            return None
+        meta["body"] = body
+        return meta
+
+    def _save(self, key: str, meta: Dict[str, Any], body: bytes) -> None:
+        header = json.dumps(meta).encode("utf-8")
+        self.store.set(key, header + b"\n" + body)
+
+    def get_json(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        ttl: float = DEFAULT_TTL,
+    ) -> Any:
+        if not self.enabled:
+            response = http.get(url, params=params)
+            response.raise_for_status()
+            self._count("misses")
+            return _decode(response.content)
+
+        key = self.key(url, params)
+        cached = self._load(key)
+        now = time.time()
+        if cached and not self.refresh and now - cached["stored_at"] < ttl:
+            self._count("hits")
+            return _decode(cached["body"])
+
+        headers: Dict[str, str] = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        response = http.get(url, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            body = cached.pop("body")
+            cached["stored_at"] = now
+            self._save(key, cached, body)
+            self._count("revalidated")
+            return _decode(body)
+
+        response.raise_for_status()
+        body = response.content
+        meta = {
+            "url": url,
+            "stored_at": now,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        self._save(key, meta, body)
+        self._count("misses")
+        return _decode(body)
+
+
+_cache_lock = threading.Lock()
+_cache: Optional[ResponseCache] = None
+
+
+def configure_cache(enabled: bool = True, refresh: bool = False) -> ResponseCache:
+    global _cache
+    with _cache_lock:
+        _cache = ResponseCache(enabled=enabled, refresh=refresh)
+        return _cache
+
+
+def get_cache() -> ResponseCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
+
+
+def get_json(
+    url: str, params: Optional[Mapping[str, Any]] = None, ttl: float = DEFAULT_TTL
+) -> Any:
+    return get_cache().get_json(url, params=params, ttl=ttl)
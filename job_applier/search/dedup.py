@@ -0,0 +1,175 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from job_applier.search.models import JobPosting
+
+
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "gh_src",
+    "igshid",
+    "lever-source",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "referer",
+    "referrer",
+    "source",
+    "src",
+    "trk",
+    "trackingid",
+    "utm",
+    "_hsenc",
+    "_hsmi",
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_EMPTY = _MASK64
+
+
+def canonicalize_url(url: str) -> str:
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    scheme = "https" if parts.scheme in ("http", "https", "") else parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall((text or "").lower())
+
+
+def _shingles(job: JobPosting, description_words: int) -> Set[int]:
+    # Only the head of the description is compared; cutting the text before
+    # tokenizing keeps long bodies from dominating the cost.
+    description = job.text_head(description_words * 16)
+    words = (
+        _words(job.title)
+        + _words(job.company)
+        + _words(description)[:description_words]
+    )
+    hashes = list(map(zlib.crc32, map(str.encode, words)))
+    if len(hashes) < 3:
+        return set(hashes)
+    return {
+        (first << 40) ^ (second << 20) ^ third
+        for first, second, third in zip(hashes, hashes[1:], hashes[2:])
+    }
+
+
+def _signature(shingles: Set[int], bins: int, bin_bits: int) -> List[int]:
+    # One-permutation MinHash: a single hash per shingle, split into bins by
+    # its top bits, keeps signing linear in the number of shingles.
+    signature = [_EMPTY] * bins
+    shift = 64 - bin_bits
+    low_mask = (1 << shift) - 1
+    for shingle in shingles:
+        mixed = (shingle * _GOLDEN) & _MASK64
+        slot = mixed >> shift
+        value = mixed & low_mask
+        if value < signature[slot]:
+            signature[slot] = value
+    return signature
+
+
+def _similarity(left: List[int], right: List[int]) -> float:
+    shared = 0
+    filled = 0
+    for a, b in zip(left, right):
+        if a == _EMPTY and b == _EMPTY:
+            continue
+        filled += 1
+        if a == b:
+            shared += 1
+    return shared / filled if filled else 0.0
+
+
+class Deduplicator:
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        bands: int = 16,
+        rows: int = 4,
+        description_words: int = 100,
+    ) -> None:
+        bins = bands * rows
+        if bins & (bins - 1):
+            raise ValueError("bands * rows must be a power of two")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.bins = bins
+        self.bin_bits = bins.bit_length() - 1
+        self.description_words = description_words
+        self.collapsed = 0
+        self._urls: Set[str] = set()
+        self._signatures: List[List[int]] = []
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+
+    def add(self, job: JobPosting) -> bool:
+        if not job.url and not job.title:
+            # Provider error/timeout placeholders are never duplicates.
+            return True
+        url = canonicalize_url(job.url)
+        if url and url in self._urls:
+            self.collapsed += 1
+            return False
+
+        shingles = _shingles(job, self.description_words)
+        signature: Optional[List[int]] = None
+        keys: List[Tuple[int, Tuple[int, ...]]] = []
+        if shingles:
+            signature = _signature(shingles, self.bins, self.bin_bits)
+            keys = [
+                (band, tuple(signature[band * self.rows : (band + 1) * self.rows]))
+                for band in range(self.bands)
+            ]
+            checked: Set[int] = set()
+            for key in keys:
+                for candidate in self._buckets.get(key, ()):
+                    if candidate in checked:
+                        continue
+                    checked.add(candidate)
+                    similarity = _similarity(signature, self._signatures[candidate])
+                    if similarity >= self.threshold:
+                        self.collapsed += 1
+                        if url:
+                            self._urls.add(url)
+                        return False
+
+        if url:
+            self._urls.add(url)
+        if signature is not None:
+            position = len(self._signatures)
+            self._signatures.append(signature)
+            for key in keys:
+                self._buckets[key].append(position)
+        return True
+
+    def filter(self, jobs: Iterable[JobPosting]) -> List[JobPosting]:
+        return [job for job in jobs if self.add(job)]
+
+
+def deduplicate(jobs: Iterable[JobPosting]) -> Tuple[List[JobPosting], int]:
+    deduplicator = Deduplicator()
+    unique = deduplicator.filter(jobs)
+    return unique, deduplicator.collapsed
@@ -0,0 +1,236 @@
+import re
+import sqlite3
+import threading
+import time
+from functools import partial
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from job_applier.search.models import JobPosting
+from job_applier.search.text import html_to_text
+
+
+DEFAULT_INDEX_PATH = Path.home() / ".job_applier" / "jobs.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    location TEXT NOT NULL,
+    description TEXT NOT NULL,
+    tags TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    description_text TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS jobs_source ON jobs(source);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, tags, description_text,
+    content='jobs', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, company, tags, description_text)
+    VALUES (new.id, new.title, new.company, coalesce(new.tags, ''),
+            new.description_text);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, tags, description_text)
+    VALUES ('delete', old.id, old.title, old.company, coalesce(old.tags, ''),
+            old.description_text);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au
+AFTER UPDATE OF title, company, tags, description_text ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, tags, description_text)
+    VALUES ('delete', old.id, old.title, old.company, coalesce(old.tags, ''),
+            old.description_text);
+    INSERT INTO jobs_fts(rowid, title, company, tags, description_text)
+    VALUES (new.id, new.title, new.company, coalesce(new.tags, ''),
+            new.description_text);
+END;
+"""
+
+# Indexes created before the clean text was stored matched the raw markup.
+# Their full-text table is rebuilt over the clean text once, on open.
+_DROP_MARKUP_FTS = """
+DROP TRIGGER IF EXISTS jobs_ai;
+DROP TRIGGER IF EXISTS jobs_ad;
+DROP TRIGGER IF EXISTS jobs_au;
+DROP TABLE IF EXISTS jobs_fts;
+"""
+
+# Column weights for bm25(): a hit in the title matters more than one buried
+# in the description.
+_RANK = "bm25(jobs_fts, 10.0, 4.0, 3.0, 1.0)"
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def to_match_expression(query: str) -> str:
+    # Quote every term so user input can't be parsed as FTS5 syntax.
+    terms = _TOKEN.findall(query)
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def _needs_clean_text(connection: sqlite3.Connection) -> bool:
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+    return bool(columns) and "description_text" not in columns
+
+
+def _add_clean_text(connection: sqlite3.Connection) -> None:
+    connection.executescript(_DROP_MARKUP_FTS)
+    connection.execute(
+        "ALTER TABLE jobs ADD COLUMN description_text TEXT NOT NULL DEFAULT ''"
+    )
+    rows = connection.execute("SELECT id, description FROM jobs").fetchall()
+    connection.executemany(
+        "UPDATE jobs SET description_text = ? WHERE id = ?",
+        [(html_to_text(description), row_id) for row_id, description in rows],
+    )
+
+
+class JobIndex:
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as connection:
+            migrate = _needs_clean_text(connection)
+            if migrate:
+                _add_clean_text(connection)
+            connection.executescript(_SCHEMA)
+            if migrate:
+                connection.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.path), timeout=30)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def upsert(self, jobs: Iterable[JobPosting]) -> int:
+        now = time.time()
+        rows = [
+            (
+                job.url,
+                job.source,
+                job.title or "",
+                job.company or "",
+                job.location or "",
+                job.description or "",
+                job.description_text,
+                job.tags,
+                now,
+                now,
+            )
+            for job in jobs
+            if job.url
+        ]
+        if not rows:
+            return 0
+        with self._connect() as connection:
+            # The WHERE clause keeps unchanged rows out of the FTS update
+            # trigger, so re-ingesting a feed only re-indexes what changed.
+            connection.executemany(
+                """
+                INSERT INTO jobs (url, source, title, company, location,
+                                  description, description_text, tags,
+                                  first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    source = excluded.source,
+                    title = excluded.title,
+                    company = excluded.company,
+                    location = excluded.location,
+                    description = excluded.description,
+                    description_text = excluded.description_text,
+                    tags = excluded.tags
+                WHERE jobs.title IS NOT excluded.title
+                   OR jobs.company IS NOT excluded.company
+                   OR jobs.location IS NOT excluded.location
+                   OR jobs.description IS NOT excluded.description
+                   OR jobs.tags IS NOT excluded.tags
+                   OR jobs.source IS NOT excluded.source
+                """,
+                rows,
+            )
+            connection.executemany(
+                "UPDATE jobs SET last_seen = ? WHERE url = ?",
+                [(now, row[0]) for row in rows],
+            )
+        return len(rows)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        source: Optional[str] = None,
+        location: Optional[str] = None,
+        max_age_days: Optional[float] = None,
+    ) -> List[JobPosting]:
+        clauses: List[str] = []
+        params: List[object] = []
+        match = to_match_expression(query)
+        if match:
+            clauses.append("jobs_fts MATCH ?")
+            params.append(match)
+        if source:
+            clauses.append("jobs.source = ?")
+            params.append(source)
+        if location:
+            clauses.append("jobs.location LIKE ?")
+            params.append(f"%{location}%")
+        if max_age_days is not None:
+            clauses.append("jobs.last_seen >= ?")
+            params.append(time.time() - max_age_days * 86400)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        if match:
+            tables = "jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid"
+            order = _RANK
+        else:
+            tables = "jobs"
+            order = "jobs.last_seen DESC"
+        sql = f"""
+            SELECT jobs.id, jobs.source, jobs.title, jobs.company,
+                   jobs.location, jobs.url, jobs.tags
+            FROM {tables}
+            {where}
+            ORDER BY {order}
+            LIMIT ? OFFSET ?
+        """
+        params.extend([limit, offset])
+        rows = self._connect().execute(sql, params).fetchall()
+        jobs: List[JobPosting] = []
+        for row in rows:
+            fields = dict(row)
+            row_id = fields.pop("id")
+            job = JobPosting(description="", **fields)
+            # Descriptions are the bulk of each row; leave them in the index
+            # until something reads them.
+            job.load_description_from(partial(self.description, row_id))
+            jobs.append(job)
+        return jobs
+
+    def description(self, row_id: int) -> str:
+        row = (
+            self._connect()
+            .execute("SELECT description FROM jobs WHERE id = ?", (row_id,))
+            .fetchone()
+        )
+        return row[0] if row else ""
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT count(*) FROM jobs").fetchone()[0]
@@ -0,0 +1,169 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Pattern, Tuple
+
+
+_SEPARATORS = re.compile(r"[,;/|()&+]|\s[-–—]+\s|\sor\s")
+_NOISE = re.compile(
+    r"\b(?:fully |100% )?remote\b|\banywhere\b|\bworldwide\b|\bglobal\b"
+    r"|\bhybrid\b|\bon-?site\b|\bhome.?office\b|\bwork from home\b"
+    r"|\bonly\b|\bbased\b|\bin\s+(?=\w)",
+    re.I,
+)
+
+_PROVINCES = {
+    "ab": "alberta",
+    "bc": "british columbia",
+    "mb": "manitoba",
+    "nb": "new brunswick",
+    "nl": "newfoundland and labrador",
+    "ns": "nova scotia",
+    "nt": "northwest territories",
+    "nu": "nunavut",
+    "on": "ontario",
+    "pe": "prince edward island",
+    "qc": "quebec",
+    "sk": "saskatchewan",
+    "yt": "yukon",
+}
+_STATES = {
+    "al": "alabama", "ak": "alaska", "az": "arizona", "ar": "arkansas",
+    "ca": "california", "co": "colorado", "ct": "connecticut", "de": "delaware",
+    "dc": "district of columbia", "fl": "florida", "ga": "georgia",
+    "hi": "hawaii", "id": "idaho", "il": "illinois", "in": "indiana",
+    "ia": "iowa", "ks": "kansas", "ky": "kentucky", "la": "louisiana",
+    "me": "maine", "md": "maryland", "ma": "massachusetts", "mi": "michigan",
+    "mn": "minnesota", "ms": "mississippi", "mo": "missouri", "mt": "montana",
+    "ne": "nebraska", "nv": "nevada", "nh": "new hampshire",
+    "nj": "new jersey", "nm": "new mexico", "ny": "new york",
+    "nc": "north carolina", "nd": "north dakota", "oh": "ohio",
+    "ok": "oklahoma", "or": "oregon", "pa": "pennsylvania",
+    "ri": "rhode island", "sc": "south carolina", "sd": "south dakota",
+    "tn": "tennessee", "tx": "texas", "ut": "utah", "vt": "vermont",
+    "va": "virginia", "wa": "washington", "wv": "west virginia",
+    "wi": "wisconsin", "wy": "wyoming",
+}
+_COUNTRY_ALIASES = {
+    "us": "united states",
+    "usa": "united states",
+    "u.s.": "united states",
+    "u.s.a.": "united states",
+    "united states of america": "united states",
+    "uk": "united kingdom",
+    "u.k.": "united kingdom",
+    "gb": "united kingdom",
+    "great britain": "united kingdom",
+    "england": "united kingdom",
+    "scotland": "united kingdom",
+    "wales": "united kingdom",
+    "deutschland": "germany",
+    "eu": "europe",
+    "latam": "latin america",
+}
+_EUROPE = (
+    "austria", "belgium", "czechia", "denmark", "estonia", "finland", "france",
+    "germany", "greece", "hungary", "ireland", "italy", "latvia", "lithuania",
+    "netherlands", "norway", "poland", "portugal", "romania", "spain",
+    "sweden", "switzerland", "ukraine", "united kingdom",
+)
+_LATIN_AMERICA = (
+    "argentina", "brazil", "chile", "colombia", "costa rica", "mexico",
+    "peru", "uruguay",
+)
+
+# Each known region's parent, so a posting in "Canada" or "North America"
+# covers a configured "Edmonton, AB".
+_PARENTS: Dict[str, str] = {
+    "canada": "north america",
+    "united states": "north america",
+    "north america": "americas",
+    "latin america": "americas",
+    "europe": "emea",
+    **{name: "canada" for name in _PROVINCES.values()},
+    **{name: "united states" for name in _STATES.values()},
+    **{name: "europe" for name in _EUROPE},
+    **{name: "latin america" for name in _LATIN_AMERICA},
+}
+_KNOWN = frozenset(_PARENTS) | frozenset(_PARENTS.values())
+_ALIASES = {**_PROVINCES, **_STATES, **_COUNTRY_ALIASES}
+_ALIASES["pei"] = "prince edward island"
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+@lru_cache(maxsize=4096)
+def place_names(text: str) -> Tuple[str, ...]:
+    # The places a location names, with remote and work-mode words dropped
+    # and abbreviations spelled out: "Remote - Edmonton, AB" gives
+    # ("edmonton", "alberta").
+    parts = _SEPARATORS.split(_NOISE.sub(" ", _normalize(text)))
+    names: List[str] = []
+    for part in parts:
+        part = " ".join(part.split()).strip(" -–—:")
+        if part:
+            names.append(_ALIASES.get(part, part))
+    return tuple(dict.fromkeys(names))
+
+
+def _ancestors(name: str) -> List[str]:
+    chain = [name]
+    while chain[-1] in _PARENTS:
+        chain.append(_PARENTS[chain[-1]])
+    return chain
+
+
+class WantedLocation:
+    # A configured location: the city it names, if any, the regions it
+    # names, and every region that contains it.
+
+    def __init__(self, text: str) -> None:
+        names = place_names(text)
+        self.city: Optional[str] = None
+        if names and names[0] not in _KNOWN:
+            self.city, names = names[0], names[1:]
+        self.places: FrozenSet[str] = frozenset(names)
+        self.regions: FrozenSet[str] = frozenset(
+            region for name in names for region in _ancestors(name)
+        )
+        self._city: Optional[Pattern] = None
+        if self.city:
+            words = map(re.escape, self.city.split())
+            self._city = re.compile(r"(?<!\w)" + r"\W+".join(words) + r"(?!\w)")
+
+    @property
+    def only_remote(self) -> bool:
+        # "Remote" names no place, so it only asks for remote jobs.
+        return self.city is None and not self.regions
+
+    def _is_region(self, name: str) -> bool:
+        return name in _KNOWN or name in self.regions
+
+    def _covers(self, region: str) -> bool:
+        # "Canada" covers a wanted "Edmonton, AB"; a wanted "Alberta" covers
+        # "Calgary, AB".
+        return region in self.regions or bool(self.places & set(_ancestors(region)))
+
+    def matches(self, names: Tuple[str, ...]) -> bool:
+        regions = [name for name in names if self._is_region(name)]
+        # "Ontario, Canada" is a place in Ontario, while "USA, Canada" is
+        # either country: only the most specific regions count.
+        broader = {parent for name in regions for parent in _ancestors(name)[1:]}
+        specific = [name for name in regions if name not in broader]
+        if len(regions) == len(names) or self._city is None:
+            return any(self._covers(name) for name in specific)
+        places = " ".join(name for name in names if not self._is_region(name))
+        if not self._city.search(places):
+            return False
+        # The same city name elsewhere: "London, ON" is not "London, UK".
+        return not (self.regions and specific) or any(
+            name in self.regions for name in specific
+        )
+
+
+@lru_cache(maxsize=256)
+def wanted_location(text: str) -> WantedLocation:
+    return WantedLocation(text)
@@ -1,9 +1,24 @@
-from dataclasses import dataclass
-from typing import Optional
+import sys
+import zlib
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Optional, Union
 
+from job_applier.search.text import html_to_text, token_ids
 
-@dataclass
-class JobPosting:
+
+# Descriptions shorter than this stay inline; compressing them saves little
+# and costs a decompress on every read.
+COMPRESS_MIN_CHARS = 512
+COMPRESS_LEVEL = 1
+
+StoredText = Union[str, bytes]
+
+# The fields JobPosting.tokens() covers, in order.
+TOKEN_FIELDS = ("title", "tags", "company", "description")
+
+
+@dataclass(slots=True)
+class _JobPostingFields:
     source: str
     title: str
     company: str
@@ -11,3 +26,116 @@ class JobPosting:
     url: str
     description: str
     tags: Optional[str] = None
+    description_text: Optional[str] = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        # A few providers and a few hundred locations repeat across every
+        # posting; interning stores each distinct string once.
+        if isinstance(self.source, str):
+            self.source = sys.intern(self.source)
+        if isinstance(self.location, str):
+            self.location = sys.intern(self.location)
+
+
+def _store(value: str) -> StoredText:
+    value = value or ""
+    if len(value) >= COMPRESS_MIN_CHARS:
+        return zlib.compress(value.encode("utf-8"), COMPRESS_LEVEL)
+    return value
+
+
+def _load(stored: StoredText) -> str:
+    if isinstance(stored, bytes):
+        return zlib.decompress(stored).decode("utf-8")
+    return stored
+
+
+def _head(stored: StoredText, chars: int) -> str:
+    if isinstance(stored, bytes):
+        # UTF-8 needs at most four bytes per character, so this never
+        # inflates more than the caller can use.
+        data = zlib.decompressobj().decompress(stored, chars * 4)
+        return data.decode("utf-8", errors="ignore")[:chars]
+    return stored[:chars]
+
+
+class JobPosting(_JobPostingFields):
+    # `description` and `description_text` stay dataclass fields, so asdict()
+    # sees plain text; the properties below keep them compressed, or
+    # unloaded until read, in the underscored slots. The clean text is not
+    # an init argument: it always follows the description, including
+    # through replace().
+    __slots__ = ("_description", "_description_text", "_tokens")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobPosting":
+        # Rebuilds asdict() output, reusing its clean text instead of
+        # converting the markup again.
+        values = dict(data)
+        text = values.pop("description_text", None)
+        job = cls(**values)
+        if text is not None:
+            job.description_text = text
+        return job
+
+    def __reduce__(self):
+        # Pickled as plain field values: that loads a store-backed
+        # description first, since its loader holds the store's connection.
+        values = {item.name: getattr(self, item.name) for item in fields(self)}
+        return (type(self).from_dict, (values,))
+
+    def _stored_description(self) -> StoredText:
+        if callable(self._description):
+            # Fetched once; later reads use the stored copy.
+            self._description = _store(self._description())
+        return self._description
+
+    def _stored_text(self) -> StoredText:
+        if self._description_text is None:
+            self._description_text = _store(html_to_text(self.description))
+        return self._description_text
+
+    @property
+    def description(self) -> str:
+        return _load(self._stored_description())
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self._description = _store(value)
+        # Derived again from the new markup on first read.
+        self._description_text = None
+        self._tokens = None
+
+    @property
+    def description_text(self) -> str:
+        return _load(self._stored_text())
+
+    @description_text.setter
+    def description_text(self, value: Optional[str]) -> None:
+        # None leaves the clean text to be derived, once, on first read.
+        self._description_text = None if value is None else _store(value)
+        self._tokens = None
+
+    def load_description_from(self, loader: Callable[[], str]) -> None:
+        # For records backed by a store that can fetch the text on demand.
+        # The clean text is left unset and derived on first read.
+        self._description = loader
+        self._description_text = None
+        self._tokens = None
+
+    def description_head(self, chars: int) -> str:
+        return _head(self._stored_description(), chars)
+
+    def text_head(self, chars: int) -> str:
+        return _head(self._stored_text(), chars)
+
+    def tokens(self, description_chars: int) -> bytes:
+        # Token ids of TOKEN_FIELDS, with the description cut to its first
+        # `description_chars` characters of clean text. Tokenized once, and
+        # again only if one of those fields changes.
+        key = (self.title, self.tags, self.company, description_chars)
+        if self._tokens is None or self._tokens[0] != key:
+            texts = (self.title, self.tags, self.company)
+            texts += (self.text_head(description_chars),)
+            self._tokens = (key, token_ids(text or "" for text in texts))
+        return self._tokens[1]
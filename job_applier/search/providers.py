@@ -1,34 +1,322 @@
-from typing import Callable, Dict, List
+import importlib
+import inspect
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
+from job_applier import metrics
+from job_applier.search.dedup import deduplicate
 from job_applier.search.models import JobPosting
-from job_applier.search.remotive import search_remotive
-from job_applier.search.arbeitnow import search_arbeitnow
+from job_applier.search.query import SearchCriteria
+
+if TYPE_CHECKING:
+    from importlib.metadata import EntryPoint
 
 
 SearchFn = Callable[[str, int], List[JobPosting]]
+T = TypeVar("T")
+
+SEARCH_TIMEOUT = 20.0
 
+ENTRY_POINT_GROUP = "job_applier.providers"
 
-PROVIDERS: Dict[str, SearchFn] = {
-    "remotive": search_remotive,
-    "arbeitnow": search_arbeitnow,
+BUILTIN_PROVIDERS = {
+    "remotive": "job_applier.search.remotive:search_remotive",
+    "arbeitnow": "job_applier.search.arbeitnow:search_arbeitnow",
 }
 
+# A provider is registered as a callable, a "module:attribute" path, or an
+# entry point; the last two are imported the first time they are looked up.
+ProviderSpec = Union[SearchFn, str, "EntryPoint"]
 
-def search_all(query: str, limit: int) -> List[JobPosting]:
-    results: List[JobPosting] = []
-    per_provider = max(1, limit // max(1, len(PROVIDERS)))
-    for name, provider in PROVIDERS.items():
+
+def load_provider(path: str) -> SearchFn:
+    module_name, sep, attribute = path.partition(":")
+    if not sep:
+        module_name, _, attribute = path.rpartition(".")
+    if not module_name or not attribute:
+        raise ValueError(f"Invalid provider path '{path}'; expected module:function.")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class ProviderRegistry(MutableMapping[str, SearchFn]):
+    def __init__(
+        self, providers: Mapping[str, ProviderSpec], group: Optional[str] = None
+    ) -> None:
+        self._specs: Dict[str, ProviderSpec] = dict(providers)
+        self._group = group
+        self._discovered = group is None
+        self._lock = threading.Lock()
+
+    def _discover(self) -> None:
+        # Installed plugins are only listed, never imported, until used.
+        if self._discovered:
+            return
+        from importlib.metadata import entry_points
+
+        with self._lock:
+            if self._discovered:
+                return
+            for entry_point in entry_points(group=self._group):
+                self._specs.setdefault(entry_point.name, entry_point)
+            self._discovered = True
+
+    def __getitem__(self, name: str) -> SearchFn:
+        spec = self._specs.get(name)
+        if spec is None:
+            self._discover()
+            spec = self._specs[name]
+        if callable(spec):
+            return spec
+        provider = load_provider(spec) if isinstance(spec, str) else spec.load()
+        with self._lock:
+            if self._specs.get(name) is spec:
+                self._specs[name] = provider
+        return provider
+
+    def __setitem__(self, name: str, provider: ProviderSpec) -> None:
+        self._specs[name] = provider
+
+    def __delitem__(self, name: str) -> None:
+        self._discover()
+        del self._specs[name]
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        return iter(list(self._specs))
+
+    def __len__(self) -> int:
+        self._discover()
+        return len(self._specs)
+
+    def __contains__(self, name: object) -> bool:
+        if name in self._specs:
+            return True
+        self._discover()
+        return name in self._specs
+
+    def clear(self) -> None:
+        self._discovered = True
+        self._specs.clear()
+
+    def copy(self) -> Dict[str, ProviderSpec]:
+        # Unresolved specs, so mock.patch.dict can snapshot and restore the
+        # registry without importing every provider.
+        self._discover()
+        return dict(self._specs)
+
+    def register(self, name: str, provider: ProviderSpec) -> None:
+        self[name] = provider
+
+
+PROVIDERS = ProviderRegistry(BUILTIN_PROVIDERS, group=ENTRY_POINT_GROUP)
+
+
+class SingleFlight:
+    # Concurrent calls with the same key share one execution: the first
+    # caller runs it, the rest wait and get the same result or exception.
+    # Results are shared, so callers must treat them as read-only.
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            metrics.inc("job_applier_coalesced_total", flight=self.name)
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+_searches = SingleFlight("search")
+_criteria_support: Dict[Callable, bool] = {}
+
+
+def accepts_criteria(provider: Callable) -> bool:
+    # Providers that take a `criteria` keyword push what their API supports
+    # upstream and filter rows themselves; others get free text and have
+    # their results filtered here.
+    supported = _criteria_support.get(provider)
+    if supported is None:
+        try:
+            parameters = inspect.signature(provider).parameters
+        except (TypeError, ValueError):
+            parameters = {}
+        supported = _criteria_support[provider] = "criteria" in parameters
+    return supported
+
+
+def run_provider(
+    provider: SearchFn,
+    query: str,
+    limit: int,
+    criteria: Optional[SearchCriteria] = None,
+) -> List[JobPosting]:
+    if criteria is None:
+        return list(provider(query, limit))
+    if accepts_criteria(provider):
+        return list(provider(query, limit, criteria=criteria))
+    jobs = provider(criteria.keywords, limit)
+    return [job for job in jobs if criteria.accepts(job)][:limit]
+
+
+@dataclass
+class SearchReport:
+    completed: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    timed_out: List[str] = field(default_factory=list)
+    duplicates: int = 0
+    elapsed: float = 0.0
+
+
+def _placeholder(name: str, message: str) -> JobPosting:
+    return JobPosting(
+        source=name,
+        title="",
+        company="",
+        location="",
+        url="",
+        description=message,
+    )
+
+
+def _count_call(name: str, outcome: str) -> None:
+    metrics.inc("job_applier_provider_calls_total", provider=name, outcome=outcome)
+
+
+def _call_provider(
+    name: str,
+    provider: SearchFn,
+    query: str,
+    limit: int,
+    criteria: Optional[SearchCriteria] = None,
+) -> List[JobPosting]:
+    # Identical searches already running, e.g. from several web users, are
+    # joined rather than repeated.
+    key = (name, provider, query, limit, criteria)
+    with metrics.timer("job_applier_provider_seconds", provider=name):
+        jobs = list(
+            _searches.do(key, lambda: run_provider(provider, query, limit, criteria))
+        )
+    metrics.inc("job_applier_provider_jobs_total", len(jobs), provider=name)
+    return jobs
+
+
+_Outcome = Tuple[str, Optional[List[JobPosting]], Optional[Exception]]
+
+
+def _start_call(
+    outcomes: "queue.Queue[_Outcome]", name: str, call: Callable[[], List[JobPosting]]
+) -> None:
+    # Daemon threads rather than an executor: concurrent.futures joins its
+    # workers at interpreter exit, so an abandoned provider would still hold
+    # the process open until it returned.
+    def run() -> None:
         try:
-            results.extend(provider(query, per_provider))
-        except Exception as exc:  # noqa: BLE001 - we want resilience
-            results.append(
-                JobPosting(
-                    source=name,
-                    title="",
-                    company="",
-                    location="",
-                    url="",
-                    description=f"Provider error: {exc}",
-                )
-            )
+            outcomes.put((name, call(), None))
+        except Exception as exc:  # noqa: BLE001 - reported by the caller
+            outcomes.put((name, None, exc))
+
+    threading.Thread(target=run, name=f"provider-{name}", daemon=True).start()
+
+
+def stream_search(
+    query: str,
+    limit: int,
+    timeout: float = SEARCH_TIMEOUT,
+    report: Optional[SearchReport] = None,
+    providers: Optional[Mapping[str, SearchFn]] = None,
+    criteria: Optional[SearchCriteria] = None,
+) -> Iterator[Tuple[str, List[JobPosting]]]:
+    # Providers share one deadline; stragglers are reported and abandoned
+    # rather than joined, so a slow board never blocks the caller.
+    report = report if report is not None else SearchReport()
+    providers = providers if providers is not None else PROVIDERS
+    started = time.monotonic()
+    deadline = started + timeout
+    per_provider = max(1, limit // max(1, len(providers)))
+    outcomes: "queue.Queue[_Outcome]" = queue.Queue()
+    pending = list(providers)
+    for name, provider in providers.items():
+        _start_call(
+            outcomes,
+            name,
+            lambda name=name, provider=provider: _call_provider(
+                name, provider, query, per_provider, criteria
+            ),
+        )
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                name, jobs, error = outcomes.get(timeout=remaining)
+            except queue.Empty:
+                break
+            pending.remove(name)
+            if error is not None or jobs is None:
+                report.failed.append(name)
+                _count_call(name, "error")
+                yield name, [_placeholder(name, f"Provider error: {error}")]
+            else:
+                report.completed.append(name)
+                _count_call(name, "ok")
+                yield name, jobs
+        for name in pending:
+            report.timed_out.append(name)
+            _count_call(name, "timeout")
+            yield name, [_placeholder(name, f"Provider timed out after {timeout:g}s")]
+    finally:
+        report.elapsed = time.monotonic() - started
+
+
+def search_all(
+    query: str,
+    limit: int,
+    timeout: float = SEARCH_TIMEOUT,
+    report: Optional[SearchReport] = None,
+    dedupe: bool = True,
+    criteria: Optional[SearchCriteria] = None,
+) -> List[JobPosting]:
+    report = report if report is not None else SearchReport()
+    by_provider = dict(
+        stream_search(query, limit, timeout=timeout, report=report, criteria=criteria)
+    )
+    results: List[JobPosting] = []
+    for name in PROVIDERS:
+        results.extend(by_provider.get(name, []))
+    if dedupe:
+        results, report.duplicates = deduplicate(results)
     return results[:limit]
@@ -0,0 +1,355 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Pattern, Sequence, Set, Tuple, Union
+
+from job_applier.config import AppConfig
+from job_applier.search.locations import place_names, wanted_location
+from job_applier.search.models import JobPosting
+
+
+FIELDS = ("title", "company", "location", "tags", "description", "source")
+DEFAULT_FIELDS = ("title", "company", "tags", "description")
+
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"?|(-)(?=[^\s-])|([^\s()"]+))')
+_REMOTE = re.compile(r"remote|anywhere|worldwide|home.?office|work from home", re.I)
+_ANYWHERE = re.compile(r"anywhere|worldwide|global", re.I)
+
+
+class QueryError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Term:
+    words: Tuple[str, ...]
+    field: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Not:
+    child: "Node"
+
+
+@dataclass(frozen=True)
+class And:
+    children: Tuple["Node", ...]
+
+
+@dataclass(frozen=True)
+class Or:
+    children: Tuple["Node", ...]
+
+
+Node = Union[Term, Not, And, Or]
+
+
+def _words(text: str) -> Tuple[str, ...]:
+    return tuple(text.lower().split())
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            break
+        position = match.end()
+        opening, closing, phrase, minus, word = match.groups()
+        if opening:
+            tokens.append(("(", opening))
+        elif closing:
+            tokens.append((")", closing))
+        elif phrase is not None:
+            tokens.append(("phrase", phrase))
+        elif minus:
+            tokens.append(("NOT", minus))
+        elif word in ("AND", "OR", "NOT"):
+            tokens.append((word, word))
+        else:
+            tokens.append(("word", word))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def _peek(self) -> Optional[str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][0]
+        return None
+
+    def _take(self) -> Tuple[str, str]:
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self) -> Optional[Node]:
+        if not self.tokens:
+            return None
+        node = self._or()
+        if self._peek() is not None:
+            raise QueryError(f"Unexpected '{self.tokens[self.position][1]}' in query.")
+        return node
+
+    def _or(self) -> Node:
+        children = [self._and()]
+        while self._peek() == "OR":
+            self._take()
+            children.append(self._and())
+        return children[0] if len(children) == 1 else Or(tuple(children))
+
+    def _and(self) -> Node:
+        children = [self._unary()]
+        while self._peek() not in (None, "OR", ")"):
+            if self._peek() == "AND":
+                self._take()
+            children.append(self._unary())
+        return children[0] if len(children) == 1 else And(tuple(children))
+
+    def _unary(self) -> Node:
+        if self._peek() == "NOT":
+            self._take()
+            return Not(self._unary())
+        return self._atom()
+
+    def _atom(self) -> Node:
+        if self._peek() is None:
+            raise QueryError("Query ends where a term was expected.")
+        kind, value = self._take()
+        if kind == "(":
+            node = self._or()
+            if self._peek() != ")":
+                raise QueryError("Missing ')' in query.")
+            self._take()
+            return node
+        if kind == "phrase":
+            return self._term(value, None)
+        if kind == "word":
+            name, sep, rest = value.partition(":")
+            if sep and name.lower() in FIELDS:
+                if not rest and self._peek() == "phrase":
+                    rest = self._take()[1]
+                return self._term(rest, name.lower())
+            return self._term(value, None)
+        raise QueryError(f"Unexpected '{value}' in query.")
+
+    def _term(self, text: str, field_name: Optional[str]) -> Term:
+        words = _words(text)
+        if not words:
+            raise QueryError(f"Empty term in query near '{text}'.")
+        return Term(words, field_name)
+
+
+def _terms(node: Optional[Node]) -> List[Term]:
+    if node is None:
+        return []
+    if isinstance(node, Term):
+        return [node]
+    if isinstance(node, Not):
+        return _terms(node.child)
+    return [term for child in node.children for term in _terms(child)]
+
+
+def _alternatives(node: Optional[Node]) -> Optional[List[str]]:
+    # Keywords at least one of which every match contains, or None when a
+    # match might contain none of them.
+    if isinstance(node, Term):
+        return [" ".join(node.words)] if node.field in (None, "title") else None
+    if isinstance(node, And):
+        options = [_alternatives(child) for child in node.children]
+        options = [option for option in options if option]
+        if not options:
+            return None
+        return min(options, key=lambda option: (len(option), -len(option[0])))
+    if isinstance(node, Or):
+        keywords: List[str] = []
+        for child in node.children:
+            option = _alternatives(child)
+            if option is None:
+                return None
+            keywords.extend(option)
+        return list(dict.fromkeys(keywords))
+    return None
+
+
+def _literal(words: Sequence[str]) -> str:
+    # Words may be separated by any run of punctuation or space, so
+    # "front end" also finds "front-end".
+    return r"\W+".join(map(re.escape, words))
+
+
+class Query:
+    # A parsed query, compiled once. Every distinct term becomes a branch of
+    # one regex per field, so a field is scanned once per posting however
+    # many roles, skills or keywords the query lists, and only the fields
+    # the evaluation actually reaches are read.
+
+    def __init__(self, text: str = "") -> None:
+        self.text = text.strip()
+        self.root = _Parser(self.text).parse()
+        literals = sorted({term.words for term in _terms(self.root)}, key=len)
+        self._ids = {words: index for index, words in enumerate(literals)}
+        by_field: Dict[str, Set[Tuple[str, ...]]] = {}
+        for term in _terms(self.root):
+            for field_name in (term.field,) if term.field else DEFAULT_FIELDS:
+                by_field.setdefault(field_name, set()).add(term.words)
+        self._patterns = {
+            field_name: re.compile(
+                r"(?<!\w)(?=(?:"
+                + "|".join(
+                    f"(?P<t{self._ids[words]}>{_literal(words)})(?!\\w)"
+                    for words in sorted(
+                        group, key=lambda words: (len(words), len("".join(words)))
+                    )[::-1]
+                )
+                + "))"
+            )
+            for field_name, group in by_field.items()
+        }
+        # The regex reports one branch per position, so the field's other
+        # literals that start with the same character are tried there too:
+        # "front end" and "front-end" both match "front-end engineer".
+        anchored = {
+            words: re.compile(f"{_literal(words)}(?!\\w)") for words in literals
+        }
+        self._rivals: Dict[str, Dict[int, List[Tuple[int, Pattern]]]] = {
+            field_name: {
+                self._ids[words]: [
+                    (self._ids[other], anchored[other])
+                    for other in group
+                    if other != words and other[0][0] == words[0][0]
+                ]
+                for words in group
+            }
+            for field_name, group in by_field.items()
+        }
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Query) and other.text == self.text
+
+    def __hash__(self) -> int:
+        return hash(self.text)
+
+    def __repr__(self) -> str:
+        return f"Query({self.text!r})"
+
+    @classmethod
+    def any_of(cls, phrases: Sequence[str]) -> "Query":
+        cleaned = [phrase.replace('"', " ").strip() for phrase in phrases]
+        return cls(" OR ".join(f'"{phrase}"' for phrase in cleaned if phrase))
+
+    def keywords(self) -> str:
+        # Plain-text form for providers that only take free text.
+        positive: List[str] = []
+
+        def collect(node: Optional[Node]) -> None:
+            if isinstance(node, Term):
+                positive.append(" ".join(node.words))
+            elif isinstance(node, (And, Or)):
+                for child in node.children:
+                    collect(child)
+
+        collect(self.root)
+        return " ".join(dict.fromkeys(positive))
+
+    def keyword_alternatives(self) -> List[str]:
+        # For providers whose keyword search takes a single term: one search
+        # per keyword covers every match. Empty when no such set exists.
+        return _alternatives(self.root) or []
+
+    def _scan(self, job: JobPosting, field_name: str) -> Set[int]:
+        if field_name == "description":
+            text = job.description_text
+        else:
+            text = getattr(job, field_name) or ""
+        text = text.lower()
+        rivals = self._rivals[field_name]
+        hits: Set[int] = set()
+        for match in self._patterns[field_name].finditer(text):
+            found = int(match.lastgroup[1:])
+            hits.add(found)
+            for other, pattern in rivals[found]:
+                if other not in hits and pattern.match(text, match.start()):
+                    hits.add(other)
+        return hits
+
+    def matches(self, job: JobPosting) -> bool:
+        if self.root is None:
+            return True
+        scanned: Dict[str, Set[int]] = {}
+
+        def hit(field_name: str, literal: int) -> bool:
+            if field_name not in scanned:
+                scanned[field_name] = self._scan(job, field_name)
+            return literal in scanned[field_name]
+
+        def evaluate(node: Node) -> bool:
+            if isinstance(node, Term):
+                literal = self._ids[node.words]
+                fields = (node.field,) if node.field else DEFAULT_FIELDS
+                return any(hit(field_name, literal) for field_name in fields)
+            if isinstance(node, Not):
+                return not evaluate(node.child)
+            if isinstance(node, And):
+                return all(evaluate(child) for child in node.children)
+            return any(evaluate(child) for child in node.children)
+
+        return evaluate(self.root)
+
+
+def looks_remote(job: JobPosting) -> bool:
+    return any(
+        _REMOTE.search(text or "") for text in (job.location, job.tags, job.title)
+    )
+
+
+@dataclass(frozen=True)
+class SearchCriteria:
+    query: Query = field(default_factory=Query)
+    locations: Tuple[str, ...] = ()
+    remote_only: bool = False
+
+    @classmethod
+    def from_config(cls, config: AppConfig, text: str = "") -> "SearchCriteria":
+        preferences = config.preferences
+        query = Query(text) if text.strip() else Query.any_of(preferences.roles)
+        return cls(
+            query=query,
+            locations=tuple(
+                location.lower() for location in preferences.locations if location
+            ),
+            remote_only=preferences.remote_only,
+        )
+
+    @property
+    def keywords(self) -> str:
+        return self.query.keywords()
+
+    def accepts_location(self, job: JobPosting, remote: Optional[bool] = None) -> bool:
+        # Cheap checks on one short field, so providers can run them on every
+        # row before looking at the text.
+        if remote is None:
+            remote = looks_remote(job)
+        if self.remote_only and not remote:
+            return False
+        if not self.locations:
+            return True
+        location = job.location or ""
+        if _ANYWHERE.search(location):
+            return True
+        names = place_names(location)
+        # "Remote", or no location at all, names no place to rule out.
+        if not names:
+            return True
+        for text in self.locations:
+            wanted = wanted_location(text)
+            if remote if wanted.only_remote else wanted.matches(names):
+                return True
+        return False
+
+    def accepts(self, job: JobPosting, remote: Optional[bool] = None) -> bool:
+        return self.accepts_location(job, remote) and self.query.matches(job)
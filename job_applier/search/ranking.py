@@ -0,0 +1,201 @@
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from job_applier.config import AppConfig
+from job_applier.search.models import TOKEN_FIELDS, JobPosting
+from job_applier.search.text import SPACED, VOCABULARY, WORD, term_tokens
+
+
+# Field weights applied to term frequencies before BM25 saturation.
+FIELD_WEIGHTS = (
+    ("title", 3.0),
+    ("tags", 2.0),
+    ("company", 1.0),
+    ("description", 1.0),
+)
+SKILL_WEIGHT = 1.0
+ROLE_WEIGHT = 1.5
+ROLE_WORD_WEIGHT = 0.5
+DESCRIPTION_SCAN_CHARS = 1500
+_ROLE_WORD = re.compile(r"[\w+#.]+")
+
+
+class _Term:
+    # A profile term as token ids. Its first token may follow a space or
+    # not; every later token must match exactly, spacing included.
+
+    def __init__(self, text: str, column: int) -> None:
+        self.tokens = term_tokens(text)
+        self.column = column
+        self.size = len(self.tokens)
+        first = self.tokens[0]
+        self.starts = [VOCABULARY[first], VOCABULARY[" " + first]]
+        self.rest = [VOCABULARY[token] for token in self.tokens[1:]]
+        self.word_start = bool(VOCABULARY.flags[self.starts[0]] & WORD)
+        self.word_end = bool(VOCABULARY.flags[VOCABULARY[self.tokens[-1]]] & WORD)
+
+    def within(self, other: "_Term") -> bool:
+        first = self.tokens[0]
+        return any(
+            other.tokens[index].lstrip(" ") == first
+            and other.tokens[index + 1 : index + self.size] == self.tokens[1:]
+            for index in range(other.size - self.size + 1)
+        )
+
+    def find(
+        self,
+        ids: np.ndarray,
+        candidates: np.ndarray,
+        candidate_ids: np.ndarray,
+        flags: np.ndarray,
+    ) -> np.ndarray:
+        joined, spaced = self.starts
+        positions = candidates[(candidate_ids == joined) | (candidate_ids == spaced)]
+        for offset, ident in enumerate(self.rest, 1):
+            positions = positions[ids[positions + offset] == ident]
+        # Punctuation at either end must not be glued to a word: ".net" is
+        # not in "vb.net", nor "c#" in "c#x".
+        if not self.word_start:
+            before = flags[ids[positions - 1]]
+            own = flags[ids[positions]]
+            positions = positions[~(((before & WORD) > 0) & ((own & SPACED) == 0))]
+        if not self.word_end:
+            after = flags[ids[positions + self.size]]
+            positions = positions[~(((after & WORD) > 0) & ((after & SPACED) == 0))]
+        return positions
+
+
+def _outside(positions: np.ndarray, spans: List[Tuple[np.ndarray, int]]) -> np.ndarray:
+    # Drops positions inside a match of a longer term that contains this
+    # one, so "asp.net core" isn't counted again as "asp.net".
+    spans = [(found, size) for found, size in spans if len(found)]
+    if not spans or not len(positions):
+        return positions
+    starts = np.concatenate([found for found, _ in spans])
+    ends = np.concatenate([found + size for found, size in spans])
+    order = np.argsort(starts, kind="stable")
+    starts = starts[order]
+    reach = np.maximum.accumulate(ends[order])
+    index = np.searchsorted(starts, positions, side="right") - 1
+    inside = (index >= 0) & (positions < reach[np.maximum(index, 0)])
+    return positions[~inside]
+
+
+def _profile_terms(config: AppConfig) -> Dict[str, float]:
+    terms: Dict[str, float] = {}
+
+    def add(term: str, weight: float) -> None:
+        term = term.strip().lower()
+        if term:
+            terms[term] = max(weight, terms.get(term, 0.0))
+
+    for skill in config.profile.skills:
+        add(skill, SKILL_WEIGHT)
+    for role in config.preferences.roles:
+        add(role, ROLE_WEIGHT)
+        for word in _ROLE_WORD.findall(role):
+            if len(word) > 2:
+                add(word, ROLE_WORD_WEIGHT)
+    return terms
+
+
+class ProfileRanker:
+    def __init__(self, config: AppConfig, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        terms = _profile_terms(config)
+        self.terms: List[str] = list(terms)
+        self._weights = np.array(
+            [terms[term] for term in self.terms], dtype=np.float64
+        )
+        weights = dict(FIELD_WEIGHTS)
+        self._field_weights = np.array([weights[name] for name in TOKEN_FIELDS])
+        # Longest first, so a term's matches are known before those of the
+        # shorter terms it contains.
+        self._terms = sorted(
+            (_Term(term, column) for column, term in enumerate(self.terms)),
+            key=lambda term: term.size,
+            reverse=True,
+        )
+        self._containers = [
+            [
+                index
+                for index, longer in enumerate(self._terms[:position])
+                if term.within(longer)
+            ]
+            for position, term in enumerate(self._terms)
+        ]
+
+    def _term_matrix(
+        self, jobs: Sequence[JobPosting]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        count = len(jobs)
+        width = len(self.terms)
+        # Every posting is tokenized once; after that a rank only joins the
+        # cached token ids and runs array operations over them.
+        data = b"".join(job.tokens(DESCRIPTION_SCAN_CHARS) for job in jobs)
+        size = len(data) // 4
+        longest = max((term.size for term in self._terms), default=0)
+        ids = np.frombuffer(data + bytes(4 * (longest + 1)), dtype=np.uint32)
+        flags = np.frombuffer(bytes(VOCABULARY.flags), dtype=np.uint8)
+        # Each field ends with id 0, so field k of row r is segment
+        # r * len(TOKEN_FIELDS) + k.
+        ends = np.flatnonzero(ids[:size] == 0)
+        lengths = np.diff(ends, prepend=-1) - 1
+        lengths = lengths.reshape(count, len(TOKEN_FIELDS)).sum(axis=1)
+        if not self.terms:
+            return np.zeros((count, width)), lengths.astype(np.float64)
+        first = np.zeros(len(flags), dtype=bool)
+        first[[ident for term in self._terms for ident in term.starts]] = True
+        candidates = np.flatnonzero(first[ids[:size]])
+        candidate_ids = ids[candidates]
+        found: List[np.ndarray] = []
+        cells: List[np.ndarray] = []
+        weights: List[np.ndarray] = []
+        for term, containers in zip(self._terms, self._containers):
+            spans = [(found[index], self._terms[index].size) for index in containers]
+            positions = term.find(ids, candidates, candidate_ids, flags)
+            positions = _outside(positions, spans)
+            found.append(positions)
+            rows, fields = np.divmod(
+                np.searchsorted(ends, positions), len(TOKEN_FIELDS)
+            )
+            cells.append(rows * width + term.column)
+            weights.append(self._field_weights[fields])
+        frequencies = np.bincount(
+            np.concatenate(cells),
+            weights=np.concatenate(weights),
+            minlength=count * width,
+        )
+        return frequencies.reshape(count, width), lengths.astype(np.float64)
+
+    def score(self, jobs: Sequence[JobPosting]) -> np.ndarray:
+        if not jobs or not self.terms:
+            return np.zeros(len(jobs), dtype=np.float64)
+        frequencies, lengths = self._term_matrix(jobs)
+        count = len(jobs)
+        document_frequency = np.count_nonzero(frequencies, axis=0)
+        idf = np.log1p((count - document_frequency + 0.5) / (document_frequency + 0.5))
+        average_length = lengths.mean() or 1.0
+        norm = self.k1 * (1 - self.b + self.b * lengths / average_length)
+        saturated = frequencies * (self.k1 + 1) / (frequencies + norm[:, None])
+        return saturated @ (idf * self._weights)
+
+    def rank(
+        self, jobs: Iterable[JobPosting], top_k: Optional[int] = None
+    ) -> List[Tuple[JobPosting, float]]:
+        jobs = list(jobs)
+        scores = self.score(jobs)
+        count = len(jobs)
+        if top_k is not None and 0 < top_k < count:
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            candidates = np.arange(count)
+        # Ties keep provider order, so an empty profile leaves results as-is.
+        order = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [
+            (jobs[index], score)
+            for index, score in zip(order.tolist(), scores[order].tolist())
+        ]
@@ -1,28 +1,62 @@
-from typing import List
-
-import requests
+from typing import Any, Dict, List, Optional, Set
 
+from job_applier.search import cache
 from job_applier.search.models import JobPosting
+from job_applier.search.query import SearchCriteria
 
 
 API_URL = "https://remotive.com/api/remote-jobs"
+CACHE_TTL = 15 * 60
+# Remotive searches one keyword per request. A query that needs more than
+# this many is answered from one download of the whole feed instead.
+MAX_KEYWORD_SEARCHES = 5
+
+
+def _to_posting(job: Dict[str, Any]) -> JobPosting:
+    return JobPosting(
+        source="remotive",
+        title=job.get("title", ""),
+        company=job.get("company_name", ""),
+        location=job.get("candidate_required_location", ""),
+        url=job.get("url", ""),
+        description=job.get("description", ""),
+        tags=", ".join(job.get("tags", []) or []),
+    )
+
+
+def _searches(
+    query: str, limit: int, criteria: Optional[SearchCriteria]
+) -> List[Dict[str, Any]]:
+    if criteria is None:
+        return [{"search": query}]
+    # The query is matched locally, whole words only, while Remotive matches
+    # keywords as substrings ("java" finds JavaScript jobs). Its `limit` is
+    # only safe to send when the local match can't drop rows.
+    params: Dict[str, Any] = {}
+    if criteria.query.root is None and not criteria.locations:
+        params["limit"] = limit
+    keywords = criteria.query.keyword_alternatives()
+    if not keywords or len(keywords) > MAX_KEYWORD_SEARCHES:
+        return [params]
+    return [dict(params, search=keyword) for keyword in keywords]
 
 
-def search_remotive(query: str, limit: int) -> List[JobPosting]:
-    response = requests.get(API_URL, params={"search": query}, timeout=30)
-    response.raise_for_status()
-    payload = response.json()
-    jobs = []
-    for job in payload.get("jobs", [])[:limit]:
-        jobs.append(
-            JobPosting(
-                source="remotive",
-                title=job.get("title", ""),
-                company=job.get("company_name", ""),
-                location=job.get("candidate_required_location", ""),
-                url=job.get("url", ""),
-                description=job.get("description", ""),
-                tags=", ".join(job.get("tags", []) or []),
-            )
-        )
+def search_remotive(
+    query: str, limit: int, criteria: Optional[SearchCriteria] = None
+) -> List[JobPosting]:
+    jobs: List[JobPosting] = []
+    seen: Set[str] = set()
+    for params in _searches(query, limit, criteria):
+        payload = cache.get_json(API_URL, params=params, ttl=CACHE_TTL)
+        for row in payload.get("jobs", []):
+            job = _to_posting(row)
+            # A job found by two keywords is only counted once.
+            if job.url in seen:
+                continue
+            seen.add(job.url)
+            # Every Remotive job is remote.
+            if criteria is None or criteria.accepts(job, remote=True):
+                jobs.append(job)
+                if len(jobs) >= limit:
+                    return jobs
     return jobs
@@ -0,0 +1,110 @@
+import html
+import re
+import threading
+from array import array
+from typing import Iterable, List
+
+
+_COMMENT = re.compile(r"<!--.*?-->", re.S)
+_HIDDEN = re.compile(r"<(script|style|head|noscript|svg)\b.*?</\1\s*>", re.I | re.S)
+_ITEM = re.compile(r"<li\b[^>]*>", re.I)
+_BLOCK = re.compile(
+    r"<(?:br|hr)\b[^>]*>|</?(?:p|div|h[1-6]|ul|ol|li|dl|dt|dd|tr|table|section"
+    r"|article|header|footer|blockquote|pre)\b[^>]*>",
+    re.I,
+)
+_TAG = re.compile(r"<[^>]*>")
+_SPACE = re.compile(r"[^\S\n]+")
+# Words and single punctuation marks, each keeping the space before it, so
+# "asp.net core" is "asp", ".", "net", " core".
+_TERM_TOKEN = re.compile(r" ?(?:\w+|[^\w\s])")
+_WORD_TOKEN = re.compile(r" ?\w")
+_SPACES = str.maketrans("\t\n\r\f\v", "     ")
+
+WORD = 1
+SPACED = 2
+
+# Lines the boards append to every posting; they cost prompt budget and say
+# nothing about the role.
+BOILERPLATE = tuple(
+    re.compile(pattern, re.I)
+    for pattern in (
+        r"^please mention the word\b.*\bwhen applying\b",
+        r"^this is a beta feature to avoid spam applicants\b",
+        r"^(?:apply (?:now|here|today|for this (?:job|position))|share this job)\W*$",
+        r"^(?:#li-\w+\s*)+$",
+    )
+)
+
+
+def _collapse(text: str) -> List[str]:
+    lines = []
+    bullet = False
+    for line in text.split("\n"):
+        line = _SPACE.sub(" ", line).strip()
+        if line == "-":
+            # A list item whose text sits in a nested block.
+            bullet = True
+            continue
+        if not line or any(pattern.search(line) for pattern in BOILERPLATE):
+            continue
+        lines.append(f"- {line}" if bullet else line)
+        bullet = False
+    return lines
+
+
+def html_to_text(markup: str) -> str:
+    if not markup:
+        return ""
+    if "<" not in markup and "&" not in markup:
+        return "\n".join(_collapse(markup))
+    text = _COMMENT.sub("", markup)
+    text = _HIDDEN.sub("", text)
+    text = _ITEM.sub("\n- ", text)
+    text = _BLOCK.sub("\n", text)
+    # Entities are decoded last so escaped markup such as "&lt;div&gt;"
+    # survives as text.
+    text = html.unescape(_TAG.sub("", text))
+    return "\n".join(_collapse(text))
+
+
+class Vocabulary(dict):
+    # Token to id, shared by every posting in the process; ids are never
+    # stored. `flags` records per id whether the token is a word and
+    # whether a space precedes it. Id 0 is the empty token that ends each
+    # field.
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.flags = bytearray()
+        self._lock = threading.Lock()
+        self[""]
+
+    def __missing__(self, token: str) -> int:
+        with self._lock:
+            ident = dict.get(self, token)
+            if ident is None:
+                ident = len(self.flags)
+                flags = 0
+                if token.startswith(" "):
+                    flags |= SPACED
+                if _WORD_TOKEN.match(token):
+                    flags |= WORD
+                self.flags.append(flags)
+                dict.__setitem__(self, token, ident)
+            return ident
+
+
+VOCABULARY = Vocabulary()
+
+
+def term_tokens(text: str) -> List[str]:
+    return _TERM_TOKEN.findall(text.lower().translate(_SPACES))
+
+
+def token_ids(texts: Iterable[str]) -> bytes:
+    ids = array("I")
+    for text in texts:
+        ids.extend(map(VOCABULARY.__getitem__, term_tokens(text)))
+        ids.append(0)
+    return ids.tobytes()
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from job_applier import metrics
+from job_applier.search.dedup import canonicalize_url
+from job_applier.search.models import JobPosting
+from job_applier.search.providers import SearchFn, load_provider, run_provider
+from job_applier.search.query import SearchCriteria
+
+
+DEFAULT_STATE_PATH = Path.home() / ".job_applier" / "watch_state.json"
+DEFAULT_INTERVAL = 300.0
+DEFAULT_JITTER = 0.2
+POLL_LIMIT = 100
+MAX_SEEN = 5000
+
+# Paged feeds served newest first, as (posting, remote flag) rows. Watch reads
+# every row, stopping at the high-water mark instead of asking for a fixed
+# number of jobs, and applies the criteria itself. New postings are handed
+# on `limit` at a time, however many there are.
+FEEDS = {"arbeitnow": "job_applier.search.arbeitnow:iter_feed"}
+# This many already-seen postings in a row means the rest of the feed is old.
+KNOWN_RUN = 20
+
+FeedFn = Callable[[bool], Iterable[Tuple[JobPosting, bool]]]
+NewJobsFn = Callable[[str, List[JobPosting]], None]
+ErrorFn = Callable[[str, Exception], None]
+
+
+def fingerprint(job: JobPosting) -> str:
+    return hashlib.sha1(canonicalize_url(job.url).encode("utf-8")).hexdigest()[:16]
+
+
+class WatchState:
+    def __init__(self, path: Path = DEFAULT_STATE_PATH) -> None:
+        self.path = Path(path)
+        # Per provider, fingerprints in the order they were last seen, so
+        # trimming drops the postings that left the feed longest ago.
+        self._seen: Dict[str, Dict[str, None]] = {}
+        self.last_poll: Dict[str, float] = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text())
+            for name, mark in data.get("providers", {}).items():
+                self._seen[name] = dict.fromkeys(mark.get("seen", []))
+                if mark.get("last_poll"):
+                    self.last_poll[name] = mark["last_poll"]
+
+    def seen(self, name: str, key: str) -> bool:
+        return key in self._seen.get(name, {})
+
+    def mark(self, name: str, keys: Iterable[str]) -> None:
+        seen = self._seen.setdefault(name, {})
+        for key in keys:
+            seen.pop(key, None)
+            seen[key] = None
+        for key in list(seen)[: max(0, len(seen) - MAX_SEEN)]:
+            del seen[key]
+        self.last_poll[name] = time.time()
+
+    def save(self) -> None:
+        data = {
+            "providers": {
+                name: {"seen": list(seen), "last_poll": self.last_poll.get(name)}
+                for name, seen in self._seen.items()
+            }
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so a crash mid-save never loses the marks.
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(data))
+        os.replace(temp_path, self.path)
+
+
+class Watcher:
+    def __init__(
+        self,
+        state: WatchState,
+        criteria: SearchCriteria,
+        providers: Mapping[str, SearchFn],
+        on_new: NewJobsFn,
+        interval: float = DEFAULT_INTERVAL,
+        jitter: float = DEFAULT_JITTER,
+        limit: int = POLL_LIMIT,
+        feeds: Optional[Mapping[str, Union[str, FeedFn]]] = None,
+        on_error: Optional[ErrorFn] = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.state = state
+        self.criteria = criteria
+        self.providers = providers
+        self.on_new = on_new
+        self.on_error = on_error
+        self.interval = interval
+        self.jitter = jitter
+        self.limit = limit
+        self.feeds = feeds if feeds is not None else FEEDS
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._stop = threading.Event()
+
+    def poll(self, name: str) -> List[JobPosting]:
+        criteria = self.criteria
+        feed = self.feeds.get(name)
+        if feed is None:
+            # Provider results already satisfy the criteria.
+            found = run_provider(
+                self.providers[name], criteria.keywords, self.limit, criteria
+            )
+            rows: Iterable[Tuple[JobPosting, Optional[bool]]] = (
+                (job, None) for job in found
+            )
+        else:
+            if isinstance(feed, str):
+                feed = load_provider(feed)
+            rows = feed(criteria.remote_only)
+        fresh: List[JobPosting] = []
+        batch: List[JobPosting] = []
+        keys: List[str] = []
+        known = 0
+        try:
+            for job, remote in rows:
+                if not job.url:
+                    continue
+                key = fingerprint(job)
+                keys.append(key)
+                if self.state.seen(name, key):
+                    known += 1
+                    if known >= KNOWN_RUN:
+                        break
+                    continue
+                known = 0
+                if feed is not None and not criteria.accepts(job, remote):
+                    continue
+                batch.append(job)
+                # Stopping here instead would leave the older unseen postings
+                # unmarked behind this poll's, where the next poll's
+                # high-water stop never reaches them.
+                if len(batch) >= self.limit:
+                    self.on_new(name, batch)
+                    fresh.extend(batch)
+                    batch = []
+        finally:
+            close = getattr(rows, "close", None)
+            if close is not None:
+                close()
+        if batch:
+            self.on_new(name, batch)
+            fresh.extend(batch)
+        # Marks are recorded only once the caller has taken every batch, so
+        # a crash downstream means postings are emitted again, never lost.
+        metrics.inc("job_applier_watch_new_total", len(fresh), provider=name)
+        self.state.mark(name, reversed(keys))
+        self.state.save()
+        return fresh
+
+    def _poll_safely(self, name: str) -> int:
+        try:
+            with metrics.timer("job_applier_watch_poll_seconds", provider=name):
+                return len(self.poll(name))
+        except Exception as exc:  # noqa: BLE001 - one board must not stop the rest
+            if self.on_error is not None:
+                self.on_error(name, exc)
+            return 0
+
+    def run_once(self) -> int:
+        return sum(self._poll_safely(name) for name in list(self.providers))
+
+    def next_delay(self) -> float:
+        spread = self.interval * self.jitter
+        return max(0.0, self.interval + self._rng.uniform(-spread, spread))
+
+    def run(self) -> None:
+        # Each provider keeps its own jittered schedule, so polls drift apart
+        # instead of hitting every board in the same second.
+        now = self._clock()
+        spread = self.interval * self.jitter
+        due = {name: now + self._rng.uniform(0, spread) for name in self.providers}
+        while due and not self._stop.is_set():
+            name = min(due, key=due.__getitem__)
+            wait = due[name] - self._clock()
+            if wait > 0 and self._stop.wait(wait):
+                break
+            self._poll_safely(name)
+            due[name] = self._clock() + self.next_delay()
+
+    def stop(self) -> None:
+        self._stop.set()
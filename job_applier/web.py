@@ -1,20 +1,34 @@
 import json
 import uuid
-from dataclasses import asdict
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional
 
-from flask import Flask, render_template, request
+from flask import Flask, Response, jsonify, render_template, request, url_for
 
+from job_applier import metrics
 from job_applier.apply.dispatcher import auto_apply_jobs, build_application_packets
 from job_applier.config import AppConfig, load_config, save_config, update_from_env
+from job_applier.resultsets import ResultSetStore
+from job_applier.search.background import (
+    SearchTask,
+    SearchTaskManager,
+    TooManySearches,
+)
 from job_applier.search.models import JobPosting
-from job_applier.search.providers import PROVIDERS, search_all
+from job_applier.search.providers import (
+    PROVIDERS,
+    SearchFn,
+    run_provider,
+    search_all,
+)
+from job_applier.search.query import SearchCriteria
+from job_applier.search.ranking import ProfileRanker
 
 
 DATA_DIR = Path(".job_applier_web")
 CONFIG_DIR = DATA_DIR / "configs"
 RESUME_DIR = DATA_DIR / "resumes"
+SSE_HEARTBEAT = 15.0
 
 
 def _ensure_dirs() -> None:
@@ -64,23 +78,60 @@ def _save_resume(file_storage) -> str:
     return str(destination)
 
 
-def _search_jobs(provider_key: str, query: str, limit: int) -> List[JobPosting]:
+def _search_jobs(
+    provider_key: str, criteria: SearchCriteria, limit: int
+) -> List[JobPosting]:
     if provider_key:
         provider = PROVIDERS.get(provider_key)
         if not provider:
             raise ValueError(f"Unknown provider: {provider_key}")
-        return provider(query, limit)
-    return search_all(query, limit)
+        return run_provider(provider, criteria.keywords, limit, criteria)
+    return search_all(criteria.keywords, limit, criteria=criteria)
 
 
-def _deserialize_jobs(payload: str) -> List[JobPosting]:
-    data = json.loads(payload)
-    return [JobPosting(**item) for item in data]
+def _selected_providers(provider_key: str) -> Dict[str, SearchFn]:
+    if not provider_key:
+        return dict(PROVIDERS)
+    provider = PROVIDERS.get(provider_key)
+    if not provider:
+        raise ValueError(f"Unknown provider: {provider_key}")
+    return {provider_key: provider}
+
+
+def _wants_json() -> bool:
+    best = request.accept_mimetypes.best_match(["application/json", "text/html"])
+    return best == "application/json"
+
+
+def _event_stream(task: SearchTask) -> Iterator[str]:
+    since = 0
+    providers: Dict[str, str] = {}
+    while True:
+        if not task.wait(since, providers, timeout=SSE_HEARTBEAT):
+            yield ": keepalive\n\n"
+            continue
+        snapshot = task.snapshot(since)
+        since = snapshot["next"]
+        providers = snapshot["providers"]
+        yield f"event: update\ndata: {json.dumps(snapshot)}\n\n"
+        if snapshot["status"] != "running":
+            yield "event: done\ndata: {}\n\n"
+            return
+
+
+def _parse_top_k(raw_value: str) -> Optional[int]:
+    try:
+        value = int(raw_value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
 
 
 def create_app() -> Flask:
     _ensure_dirs()
     app = Flask(__name__)
+    search_tasks = SearchTaskManager()
+    result_sets = ResultSetStore()
 
     @app.route("/", methods=["GET"])
     def index():
@@ -100,33 +151,93 @@ def create_app() -> Flask:
         query = request.form.get("query", "")
         limit = int(request.form.get("limit", "20"))
         provider_key = request.form.get("provider", "")
+        top_k = _parse_top_k(request.form.get("top_k", ""))
+        if _wants_json():
+            try:
+                providers = _selected_providers(provider_key)
+                criteria = SearchCriteria.from_config(config, query)
+            except ValueError as exc:
+                return jsonify({"error": str(exc)}), 400
+            try:
+                task = search_tasks.start(config, criteria, limit, providers)
+            except TooManySearches as exc:
+                return jsonify({"error": str(exc)}), 503
+            result_id = result_sets.put(task.jobs, result_id=task.task_id)
+            return (
+                jsonify(
+                    {
+                        "id": task.task_id,
+                        "config_id": config_id,
+                        "result_id": result_id,
+                        "top_k": top_k,
+                        "events": url_for("search_events", task_id=task.task_id),
+                        "poll": url_for("search_status", task_id=task.task_id),
+                    }
+                ),
+                202,
+            )
         error = None
         jobs: List[JobPosting] = []
+        scores: List[float] = []
         try:
-            jobs = _search_jobs(provider_key, query, limit)
+            criteria = SearchCriteria.from_config(config, query)
+            jobs = _search_jobs(provider_key, criteria, limit)
         except ValueError as exc:
             error = str(exc)
+        if jobs:
+            ranked = ProfileRanker(config).rank(jobs, top_k=top_k)
+            jobs = [job for job, _ in ranked]
+            scores = [score for _, score in ranked]
         return render_template(
             "index.html",
             providers=PROVIDERS,
             jobs=jobs,
-            jobs_payload=[asdict(job) for job in jobs] if jobs else [],
+            scores=scores,
+            result_id=result_sets.put(jobs) if jobs else "",
             config_id=config_id,
             packets=None,
             error=error,
         )
 
+    @app.route("/search/<task_id>", methods=["GET"])
+    def search_status(task_id: str):
+        task = search_tasks.get(task_id)
+        if task is None:
+            return jsonify({"error": "Unknown or expired search."}), 404
+        since = request.args.get("since", default=0, type=int)
+        return jsonify(task.snapshot(max(0, since)))
+
+    @app.route("/search/<task_id>/events", methods=["GET"])
+    def search_events(task_id: str):
+        task = search_tasks.get(task_id)
+        if task is None:
+            return jsonify({"error": "Unknown or expired search."}), 404
+        return Response(
+            _event_stream(task),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.route("/metrics", methods=["GET"])
+    def prometheus_metrics():
+        return Response(
+            metrics.render_prometheus(),
+            mimetype="text/plain; version=0.0.4; charset=utf-8",
+        )
+
     @app.route("/apply", methods=["POST"])
     def apply():
         config_id = request.form.get("config_id", "")
-        jobs_payload = request.form.get("jobs_payload", "")
-        selected_indices = request.form.getlist("selected")
-        jobs = _deserialize_jobs(jobs_payload) if jobs_payload else []
-        selected = [
-            job
-            for index, job in enumerate(jobs)
-            if str(index) in selected_indices
-        ]
+        result_id = request.form.get("result_id", "")
+        selected = result_sets.select(result_id, request.form.getlist("selected"))
+        if selected is None:
+            return render_template(
+                "index.html",
+                providers=PROVIDERS,
+                jobs=None,
+                packets=None,
+                error="These search results have expired. Please search again.",
+            )
         config = _load_config(config_id) if config_id else AppConfig()
         packets = build_application_packets(config, selected, dry_run=False)
         apply_results = None
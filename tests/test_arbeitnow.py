@@ -0,0 +1,115 @@
+import threading
+import unittest
+from concurrent.futures import Future
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from job_applier.diskcache import DiskCache
+from job_applier.search import arbeitnow, cache
+
+
+class FakeBoard:
+    def __init__(self, pages: int, per_page: int = 10) -> None:
+        self.pages = pages
+        self.per_page = per_page
+        self.fetched = []
+        self._lock = threading.Lock()
+
+    def __call__(self, page, remote_only=False):
+        with self._lock:
+            self.fetched.append(page)
+        rows = [
+            {
+                "title": f"Developer {page}-{number}",
+                "company_name": "Acme",
+                "url": f"https://example.com/{page}/{number}",
+            }
+            for number in range(self.per_page)
+        ]
+        links = {"next": f"?page={page + 1}" if page < self.pages else None}
+        return {"data": rows, "links": links}
+
+
+class ArbeitnowPagingTests(unittest.TestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        # A disabled response cache also keeps parsed pages from being reused.
+        disabled = cache.ResponseCache(store=DiskCache(Path(tmp.name)), enabled=False)
+        patch = mock.patch.object(cache, "_cache", disabled)
+        patch.start()
+        self.addCleanup(patch.stop)
+        arbeitnow.clear_feed()
+        self.addCleanup(arbeitnow.clear_feed)
+
+    def _board(self, pages: int) -> FakeBoard:
+        board = FakeBoard(pages)
+        patch = mock.patch.object(arbeitnow, "_fetch_page", board)
+        patch.start()
+        self.addCleanup(patch.stop)
+        return board
+
+    def test_stops_fetching_once_the_limit_is_met(self):
+        board = self._board(pages=5)
+
+        self.assertEqual(len(arbeitnow.search_arbeitnow("developer", 10)), 10)
+        self.assertEqual(board.fetched, [1])
+
+        board.fetched.clear()
+        jobs = arbeitnow.search_arbeitnow("developer", 15)
+        self.assertEqual(len(jobs), 15)
+        self.assertEqual(board.fetched, [1, 2])
+
+    def test_stops_when_there_is_no_next_page(self):
+        board = self._board(pages=2)
+
+        rows = list(arbeitnow.iter_feed())
+
+        self.assertEqual(len(rows), 20)
+        self.assertEqual(board.fetched, [1, 2])
+
+    def test_respects_max_pages(self):
+        board = self._board(pages=5)
+
+        jobs = list(arbeitnow.iter_arbeitnow("developer", max_pages=3))
+
+        self.assertEqual(len(jobs), 30)
+        self.assertEqual(board.fetched, [1, 2, 3])
+
+    def test_closing_early_cancels_the_prefetch(self):
+        board = self._board(pages=5)
+        pools = []
+
+        class HeldPool:
+            # Runs the first page and holds back the prefetch, so it is still
+            # pending when the caller stops reading.
+            def __init__(self, *args, **kwargs):
+                self.futures = []
+                pools.append(self)
+
+            def submit(self, fn, *args):
+                future = Future()
+                if not self.futures:
+                    future.set_result(fn(*args))
+                self.futures.append(future)
+                return future
+
+            def shutdown(self, wait=True, cancel_futures=False):
+                if cancel_futures:
+                    for future in self.futures:
+                        future.cancel()
+
+        with mock.patch.object(arbeitnow, "ThreadPoolExecutor", HeldPool):
+            jobs = arbeitnow.iter_arbeitnow("developer")
+            self.assertEqual(next(jobs).title, "Developer 1-0")
+            jobs.close()
+
+        [pool] = pools
+        self.assertEqual(len(pool.futures), 2)
+        self.assertTrue(pool.futures[1].cancelled())
+        self.assertEqual(board.fetched, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,33 +3,75 @@ import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
+from job_applier.apply.application_log import ApplicationLog
 from job_applier.apply.dispatcher import auto_apply_jobs
 from job_applier.search.models import JobPosting
 
 
+def _job(url="https://example.com/apply"):
+    return JobPosting(
+        title="Software Engineer",
+        company="Acme",
+        location="Remote",
+        url=url,
+        source="test",
+        description="",
+        tags=[],
+    )
+
+
 class AutoApplyJobsTests(unittest.TestCase):
     def test_auto_apply_writes_log_entries(self):
-        jobs = [
-            JobPosting(
-                title="Software Engineer",
-                company="Acme",
-                location="Remote",
-                url="https://example.com/apply",
-                source="test",
-                description="",
-                tags=[],
-            )
-        ]
+        jobs = [_job()]
 
         with TemporaryDirectory() as tmp_dir:
-            log_path = Path(tmp_dir) / "application_log.json"
+            log_path = Path(tmp_dir) / "application_log.jsonl"
             results = auto_apply_jobs(jobs, log_path=log_path, open_url=lambda _: True)
 
             self.assertTrue(log_path.exists())
-            payload = json.loads(log_path.read_text())
+            payload = [json.loads(line) for line in log_path.read_text().splitlines()]
             self.assertEqual(payload, results)
             self.assertEqual(results[0]["status"], "opened")
 
+    def test_already_applied_jobs_are_not_reopened(self):
+        opened = []
+
+        with TemporaryDirectory() as tmp_dir:
+            log_path = Path(tmp_dir) / "application_log.jsonl"
+            auto_apply_jobs([_job()], log_path=log_path, open_url=opened.append)
+            auto_apply_jobs([_job()], log_path=log_path, open_url=lambda _: True)
+            results = auto_apply_jobs(
+                [_job("http://www.example.com/apply?utm_source=x")],
+                log_path=log_path,
+                open_url=opened.append,
+            )
+
+            self.assertEqual(opened, ["https://example.com/apply"])
+            self.assertEqual(results[0]["status"], "already applied")
+            self.assertEqual(len(log_path.read_text().splitlines()), 2)
+
+
+class ApplicationLogTests(unittest.TestCase):
+    def test_index_reads_only_complete_appended_lines(self):
+        with TemporaryDirectory() as tmp_dir:
+            log_path = Path(tmp_dir) / "application_log.jsonl"
+            reader = ApplicationLog(log_path)
+            self.assertFalse(reader.applied("https://example.com/a"))
+
+            ApplicationLog(log_path).append(
+                [{"event": "apply", "url": "https://example.com/a", "status": "opened"}]
+            )
+            line = json.dumps(
+                {"event": "apply", "url": "https://example.com/b", "status": "opened"}
+            )
+            with open(log_path, "a") as handle:
+                handle.write(line[:20])
+            self.assertTrue(reader.applied("https://example.com/a"))
+
+            with open(log_path, "a") as handle:
+                handle.write(line[20:] + "\n")
+            self.assertTrue(reader.applied("https://example.com/b"))
+
 
 if __name__ == "__main__":
     unittest.main()
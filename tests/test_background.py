@@ -0,0 +1,114 @@
+import threading
+import unittest
+from unittest import mock
+
+from job_applier.config import AppConfig
+from job_applier.search.background import (
+    SearchTask,
+    SearchTaskManager,
+    TooManySearches,
+)
+from job_applier.search.models import JobPosting
+from job_applier.search.query import SearchCriteria
+
+
+def _job(number: int) -> JobPosting:
+    return JobPosting(
+        source="board",
+        title=f"Python Engineer {number}",
+        company="Acme",
+        location="Remote",
+        url=f"https://example.com/{number}",
+        description="<p>Build <b>things</b>.</p>",
+    )
+
+
+def _blocking(release: threading.Event):
+    def search(query, limit):
+        release.wait(5)
+        return [_job(number) for number in range(limit)]
+
+    return search
+
+
+class SearchTaskManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.config = AppConfig()
+        self.config.profile.skills = ["python"]
+        self.release = threading.Event()
+        self.manager = SearchTaskManager(workers=4, max_tasks=2, timeout=5)
+
+    def tearDown(self):
+        self.release.set()
+
+    def _start(self, providers=None, limit=3) -> SearchTask:
+        providers = providers or {"board": _blocking(self.release)}
+        return self.manager.start(self.config, SearchCriteria(), limit, providers)
+
+    def _finish(self, task: SearchTask) -> None:
+        with task.condition:
+            self.assertTrue(
+                task.condition.wait_for(lambda: task.status == "done", timeout=5)
+            )
+
+    def test_results_and_provider_states_reach_the_task(self):
+        def failing(query, limit):
+            raise RuntimeError("board is down")
+
+        self.release.set()
+        task = self._start({"board": _blocking(self.release), "broken": failing}, 4)
+        self._finish(task)
+
+        snapshot = task.snapshot()
+        self.assertEqual(snapshot["status"], "done")
+        self.assertEqual(snapshot["providers"], {"board": "done", "broken": "failed"})
+        # The limit is shared, and a failed provider leaves a placeholder row.
+        self.assertEqual([row["index"] for row in snapshot["rows"]], [0, 1, 2])
+        self.assertEqual(snapshot["next"], 3)
+        rows = [row for row in snapshot["rows"] if row["source"] == "board"]
+        self.assertEqual(len(rows), 2)
+        self.assertNotIn("description", rows[0])
+        self.assertEqual(rows[0]["description_text"], "Build things.")
+        self.assertGreater(rows[0]["score"], 0)
+
+    def test_snapshot_returns_only_rows_after_since(self):
+        self.release.set()
+        task = self._start(limit=5)
+        self._finish(task)
+
+        rows = task.snapshot(since=3)["rows"]
+        self.assertEqual([row["index"] for row in rows], [3, 4])
+        self.assertEqual(rows[0]["title"], "Python Engineer 3")
+        self.assertEqual(task.snapshot(since=5)["rows"], [])
+
+    def test_running_tasks_are_never_evicted(self):
+        first = self._start()
+        second = self._start()
+
+        with self.assertRaises(TooManySearches):
+            self._start()
+        self.assertIs(self.manager.get(first.task_id), first)
+        self.assertIs(self.manager.get(second.task_id), second)
+
+        self.release.set()
+        self._finish(first)
+        self._finish(second)
+        third = self._start()
+        self.assertIsNone(self.manager.get(first.task_id))
+        self.assertIs(self.manager.get(second.task_id), second)
+        self.assertIs(self.manager.get(third.task_id), third)
+
+    def test_finished_tasks_expire_after_the_ttl(self):
+        self.release.set()
+        task = self._start()
+        self._finish(task)
+        self.assertIs(self.manager.get(task.task_id), task)
+
+        expired = task.finished_at + self.manager.ttl + 1
+        clock = "job_applier.search.background.time.time"
+        with mock.patch(clock, return_value=expired):
+            self.assertIsNone(self.manager.get(task.task_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
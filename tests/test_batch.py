@@ -0,0 +1,196 @@
+import json
+import os
+import re
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from job_applier import http
+from job_applier.apply import dispatcher
+from job_applier.apply.batch import BatchError, run_batch
+from job_applier.config import AppConfig
+from job_applier.diskcache import DiskCache
+from job_applier.letter_cache import LetterCache
+from job_applier.search.models import JobPosting
+
+
+class _StubOpenAI:
+    def __init__(self):
+        self.uploads = []
+        self.created = 0
+        self.polls_until_done = 1
+        self.polls = 0
+        self.fail = False
+
+    def output(self):
+        lines = []
+        for line in self.uploads[-1].splitlines():
+            request = json.loads(line)
+            prompt = request["body"]["messages"][1]["content"]
+            title = prompt.split("Job Title: ")[1].splitlines()[0]
+            message = {"message": {"content": f"Letter for {title}"}}
+            response = {"status_code": 200, "body": {"choices": [message]}}
+            lines.append(
+                json.dumps({"custom_id": request["custom_id"], "response": response})
+            )
+        return "\n".join(lines).encode("utf-8")
+
+
+def _handler(stub: _StubOpenAI):
+    class Handler(BaseHTTPRequestHandler):
+        def _json(self, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            if self.path == "/v1/files":
+                parts = re.findall(rb"\r\n\r\n(.*?)\r\n--", body, re.S)
+                stub.uploads.append(parts[-1].decode("utf-8"))
+                self._json({"id": "file-in"})
+            elif self.path == "/v1/batches":
+                stub.created += 1
+                self._json({"id": "batch-1", "status": "validating"})
+
+        def do_GET(self):
+            if self.path == "/v1/batches/batch-1":
+                stub.polls += 1
+                done = stub.polls >= stub.polls_until_done
+                status = "completed" if done else "in_progress"
+                self._json(
+                    {
+                        "id": "batch-1",
+                        "status": "failed" if stub.fail else status,
+                        "output_file_id": "file-out" if done else None,
+                    }
+                )
+            elif self.path == "/v1/files/file-out/content":
+                body = stub.output()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def _jobs():
+    return [
+        JobPosting(
+            source="test",
+            title=title,
+            company="Acme",
+            location="Remote",
+            url=f"https://example.com/{title}",
+            description="",
+        )
+        for title in ("Engineer", "Designer")
+    ]
+
+
+class RunBatchTests(unittest.TestCase):
+    def setUp(self):
+        self.stub = _StubOpenAI()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self.stub))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.tmp_dir = TemporaryDirectory()
+        root = Path(self.tmp_dir.name)
+        self.batch_dir = root / "batches"
+        self.cache = LetterCache(store=DiskCache(root / "letters"))
+        self.env = mock.patch.dict(
+            os.environ,
+            {
+                "OPENAI_API_KEY": "test",
+                "OPENAI_BASE_URL": f"http://127.0.0.1:{self.server.server_port}/v1",
+            },
+        )
+        self.env.start()
+        self.applications = mock.patch.object(
+            dispatcher, "APPLICATIONS_DIR", root / "applications"
+        )
+        self.applications.start()
+        self.log = mock.patch.object(
+            dispatcher, "APPLICATION_LOG", root / "application_log.jsonl"
+        )
+        self.log.start()
+        http.configure()
+
+    def tearDown(self):
+        self.log.stop()
+        self.applications.stop()
+        self.env.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp_dir.cleanup()
+
+    def _run(self, **kwargs):
+        return run_batch(
+            AppConfig(),
+            _jobs(),
+            letter_cache=self.cache,
+            batch_dir=self.batch_dir,
+            sleep=lambda _: None,
+            **kwargs,
+        )
+
+    def test_batch_results_fan_out_to_packets(self):
+        packets = self._run()
+
+        self.assertEqual(len(self.stub.uploads), 1)
+        self.assertEqual(len(self.stub.uploads[0].splitlines()), 2)
+        letters = [(packet / "cover_letter.txt").read_text() for packet in packets]
+        self.assertEqual(letters, ["Letter for Engineer", "Letter for Designer"])
+
+    def test_interrupted_batch_resumes_without_resubmitting(self):
+        self.stub.polls_until_done = 3
+        with self.assertRaises(BatchError):
+            self._run(max_polls=1)
+
+        packets = self._run()
+
+        self.assertEqual(len(self.stub.uploads), 1)
+        self.assertEqual(self.stub.created, 1)
+        self.assertEqual(
+            (packets[0] / "cover_letter.txt").read_text(), "Letter for Engineer"
+        )
+
+    def test_failed_batch_is_resubmitted_on_rerun(self):
+        self.stub.fail = True
+        with self.assertRaises(BatchError):
+            self._run()
+
+        self.stub.fail = False
+        packets = self._run()
+
+        self.assertEqual(self.stub.created, 2)
+        self.assertEqual(len(self.stub.uploads), 2)
+        self.assertEqual(
+            (packets[1] / "cover_letter.txt").read_text(), "Letter for Designer"
+        )
+
+    def test_cached_letters_skip_the_batch(self):
+        self._run()
+        self._run(force=True)
+
+        self.assertEqual(len(self.stub.uploads), 1)
+
+    def test_packeted_jobs_are_not_resubmitted(self):
+        first = self._run()
+        second = self._run()
+
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.stub.uploads), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+from job_applier.search.dedup import canonicalize_url, deduplicate
+from job_applier.search.models import JobPosting
+
+
+DESCRIPTION = (
+    "We are hiring a backend engineer to build payment APIs in Python and "
+    "Postgres, own services end to end, mentor teammates and work closely "
+    "with product on a small remote team across Europe and North America."
+)
+
+
+def _job(source: str, url: str, title: str, description: str) -> JobPosting:
+    return JobPosting(
+        source=source,
+        title=title,
+        company="Acme",
+        location="Remote",
+        url=url,
+        description=description,
+    )
+
+
+class CanonicalizeUrlTests(unittest.TestCase):
+    def test_strips_tracking_noise(self):
+        self.assertEqual(
+            canonicalize_url(
+                "HTTP://www.Example.com//jobs/42/?utm_source=x&b=2&a=1&ref=feed#apply"
+            ),
+            "https://example.com/jobs/42?a=1&b=2",
+        )
+
+
+class DeduplicateTests(unittest.TestCase):
+    def test_collapses_tracking_urls_and_near_duplicates(self):
+        jobs = [
+            _job("remotive", "https://example.com/1", "Backend Engineer", DESCRIPTION),
+            _job(
+                "remotive",
+                "https://example.com/1?utm_campaign=rss",
+                "Backend Engineer",
+                DESCRIPTION,
+            ),
+            _job(
+                "arbeitnow",
+                "https://arbeitnow.com/view/acme-backend",
+                "Backend Engineer",
+                f"<p>{DESCRIPTION}</p><p>Apply today.</p>",
+            ),
+            _job(
+                "arbeitnow",
+                "https://arbeitnow.com/view/acme-designer",
+                "Product Designer",
+                "Design onboarding flows in Figma and run weekly user interviews.",
+            ),
+        ]
+
+        unique, collapsed = deduplicate(jobs)
+
+        self.assertEqual(collapsed, 2)
+        self.assertEqual(
+            [job.url for job in unique],
+            ["https://example.com/1", "https://arbeitnow.com/view/acme-designer"],
+        )
+
+    def test_placeholders_are_kept(self):
+        placeholder = _job("remotive", "", "", "Provider error: boom")
+
+        unique, collapsed = deduplicate([placeholder, placeholder])
+
+        self.assertEqual((len(unique), collapsed), (2, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
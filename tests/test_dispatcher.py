@@ -0,0 +1,126 @@
+import random
+import threading
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from job_applier.ai import _fallback_cover_letter
+from job_applier.apply import dispatcher
+from job_applier.apply.application_log import ApplicationLog
+from job_applier.apply.storage import COVER_LETTER_FILE, DirectoryStore, packet_key
+from job_applier.config import AppConfig
+from job_applier.diskcache import DiskCache
+from job_applier.letter_cache import LetterCache
+from job_applier.ratelimit import RateLimiter
+from job_applier.search.models import JobPosting
+
+
+def _job(number: int) -> JobPosting:
+    return JobPosting(
+        source="test",
+        title=f"Engineer {number}",
+        company="Acme",
+        location="Remote",
+        url=f"https://example.com/jobs/{number}",
+        description="",
+    )
+
+
+class PacketPipelineTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        self.config = AppConfig()
+        self.config.profile.full_name = "Ada Lovelace"
+        self.log_path = self.root / "application_log.jsonl"
+        self.store = DirectoryStore(self.root / "packets")
+
+    def _packets(self, jobs, letter, **kwargs):
+        with mock.patch.object(dispatcher, "generate_cover_letter", letter):
+            return list(
+                dispatcher.iter_application_packets(
+                    self.config,
+                    jobs,
+                    dry_run=False,
+                    limiter=RateLimiter(),
+                    letter_cache=LetterCache(store=DiskCache(self.root / "letters")),
+                    log_path=self.log_path,
+                    store=self.store,
+                    **kwargs,
+                )
+            )
+
+    def _letter(self, job):
+        return self.store.read(packet_key(job))[COVER_LETTER_FILE]
+
+    def _written(self, jobs):
+        log = ApplicationLog(self.log_path)
+        return [job.url for job in jobs if log.packet(job.url) is not None]
+
+    def test_finished_letters_are_written_while_a_slow_one_runs(self):
+        jobs = [_job(number) for number in range(20)]
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def letter(config, job, limiter=None, cache=None):
+            if job is jobs[0]:
+                release.wait(5)
+            return f"Dear {job.company}"
+
+        results = []
+        worker = threading.Thread(
+            target=lambda: results.extend(self._packets(jobs, letter, workers=4))
+        )
+        worker.start()
+        deadline = time.monotonic() + 5
+        while len(self._written(jobs)) < 19 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self._written(jobs), [job.url for job in jobs[1:]])
+        # Nothing is handed on before the first job, so callers that
+        # checkpoint in order never skip it.
+        self.assertEqual(results, [])
+        release.set()
+        worker.join(5)
+        self.assertEqual([job for job, _ in results], jobs)
+
+    def test_output_follows_input_order_under_concurrency(self):
+        jobs = [_job(number) for number in range(120)]
+        delays = random.Random(7)
+        pauses = {job.url: delays.uniform(0, 0.01) for job in jobs}
+
+        def letter(config, job, limiter=None, cache=None):
+            time.sleep(pauses[job.url])
+            return f"Letter for {job.title}"
+
+        results = self._packets(jobs, letter, workers=8)
+
+        self.assertEqual([job for job, _ in results], jobs)
+        for job, folder in results:
+            self.assertEqual(folder, self.store.location(packet_key(job)))
+            self.assertEqual(self._letter(job), f"Letter for {job.title}")
+
+    def test_a_failed_letter_falls_back_without_failing_the_rest(self):
+        jobs = [_job(number) for number in range(5)]
+
+        def letter(config, job, limiter=None, cache=None):
+            if job is jobs[2]:
+                raise RuntimeError("completion failed")
+            return f"Letter for {job.title}"
+
+        results = self._packets(jobs, letter, workers=3)
+
+        self.assertEqual([job for job, _ in results], jobs)
+        self.assertEqual(
+            self._letter(jobs[2]), _fallback_cover_letter(self.config, jobs[2])
+        )
+        for job in jobs[:2] + jobs[3:]:
+            self.assertEqual(self._letter(job), f"Letter for {job.title}")
+        self.assertEqual(self._written(jobs), [job.url for job in jobs])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+from urllib3.util.retry import RequestHistory
+
+from job_applier import http
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = []
+    # How many of the first requests are answered slowly, or with a 429.
+    slow = 0
+    throttled = 0
+
+    def _answer(self):
+        self.hits.append(self.command)
+        if len(self.hits) <= _Handler.slow:
+            time.sleep(0.5)
+        status = 429 if len(self.hits) <= _Handler.throttled else 200
+        try:
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            self.wfile.write(b"ok")
+        except OSError:
+            pass
+
+    do_GET = _answer
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._answer()
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpTests(unittest.TestCase):
+    def setUp(self):
+        _Handler.hits = []
+        _Handler.slow = 0
+        _Handler.throttled = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        http.configure(
+            http.HttpSettings(
+                max_retries=2,
+                backoff_factor=0,
+                backoff_jitter=0,
+                read_timeout=0.2,
+                llm_read_timeout=0.2,
+            )
+        )
+
+    def tearDown(self):
+        http.configure()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_settings_come_from_the_environment(self):
+        env = {
+            "JOB_APPLIER_HTTP_RETRIES": "5",
+            "JOB_APPLIER_HTTP_BACKOFF": "1.5",
+            "JOB_APPLIER_HTTP_READ_TIMEOUT": "12",
+            "JOB_APPLIER_LLM_READ_TIMEOUT": "90",
+        }
+        with mock.patch.dict(os.environ, env):
+            settings = http.configure()
+            self.assertEqual(settings.max_retries, 5)
+            self.assertEqual(settings.backoff_factor, 1.5)
+            self.assertEqual(http.timeout_for(), (settings.connect_timeout, 12.0))
+            self.assertEqual(http.timeout_for("llm")[1], 90.0)
+
+    def test_timed_out_gets_are_retried(self):
+        _Handler.slow = 1
+        response = http.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(_Handler.hits, ["GET", "GET"])
+
+    def test_timed_out_posts_are_not_repeated(self):
+        _Handler.slow = 1
+        with self.assertRaises(requests.ReadTimeout):
+            http.post(self.url, purpose="llm", json={"prompt": "hi"})
+        self.assertEqual(_Handler.hits, ["POST"])
+
+    def test_throttled_posts_are_retried(self):
+        _Handler.throttled = 1
+        response = http.post(self.url, purpose="llm", json={"prompt": "hi"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(_Handler.hits, ["POST", "POST"])
+
+    def test_backoff_is_jittered(self):
+        history = (RequestHistory("GET", "/", None, 503, None),) * 3
+        retry = http._JitteredRetry(total=5, backoff_factor=1, jitter=0.5)
+        retry = retry.new(history=history)
+        delays = {retry.get_backoff_time() for _ in range(20)}
+        self.assertTrue(all(4 <= delay <= 4.5 for delay in delays))
+        self.assertGreater(len(delays), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import contextlib
+import io
+import json
+import sqlite3
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from job_applier import cli
+from job_applier.config import AppConfig, save_config
+from job_applier.search.index import JobIndex
+from job_applier.search.models import JobPosting
+
+
+def _job(
+    url: str, title: str, location: str = "Remote", description: str = ""
+) -> JobPosting:
+    return JobPosting(
+        source="remotive",
+        title=title,
+        company="Acme",
+        location=location,
+        url=url,
+        description=description,
+        tags="python, django",
+    )
+
+
+class JobIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.index = JobIndex(Path(self.tmp_dir.name) / "jobs.sqlite3")
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp_dir.cleanup()
+
+    def test_upsert_is_keyed_by_url(self):
+        self.index.upsert([_job("https://example.com/1", "Python Developer")])
+        self.index.upsert([_job("https://example.com/1", "Senior Python Developer")])
+
+        self.assertEqual(self.index.count(), 1)
+        results = self.index.search("senior")
+        self.assertEqual([job.title for job in results], ["Senior Python Developer"])
+
+    def test_search_ranks_title_matches_first_and_paginates(self):
+        self.index.upsert(
+            [
+                _job("https://example.com/1", "Office Manager", description="rust"),
+                _job("https://example.com/2", "Rust Engineer"),
+                _job("https://example.com/3", "Rust Developer", location="Berlin"),
+            ]
+        )
+
+        ranked = self.index.search("rust", limit=3)
+        self.assertEqual(ranked[-1].title, "Office Manager")
+        self.assertEqual(len(self.index.search("rust", limit=1, offset=2)), 1)
+        berlin = self.index.search("rust", location="berlin")
+        self.assertEqual([job.title for job in berlin], ["Rust Developer"])
+
+    def test_query_syntax_is_treated_as_plain_terms(self):
+        self.index.upsert([_job("https://example.com/1", "C++ Engineer")])
+
+        self.assertEqual(len(self.index.search('c++ "engineer')), 1)
+
+    def test_markup_is_not_indexed(self):
+        self.index.upsert(
+            [
+                _job(
+                    "https://example.com/1",
+                    "Engineer",
+                    description='<div class="span"><p>Ship <b>Rust</b></p></div>',
+                )
+            ]
+        )
+
+        self.assertEqual(len(self.index.search("rust")), 1)
+        self.assertEqual(self.index.search("span div"), [])
+        [job] = self.index.search("ship")
+        self.assertEqual(job.description_text, "Ship Rust")
+
+    def test_indexes_of_raw_markup_are_rebuilt_on_open(self):
+        path = Path(self.tmp_dir.name) / "old.sqlite3"
+        # An index from before the clean text was stored.
+        connection = sqlite3.connect(str(path))
+        connection.executescript(
+            """
+            CREATE TABLE jobs (
+                id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE,
+                source TEXT NOT NULL, title TEXT NOT NULL,
+                company TEXT NOT NULL, location TEXT NOT NULL,
+                description TEXT NOT NULL, tags TEXT,
+                first_seen REAL NOT NULL, last_seen REAL NOT NULL
+            );
+            CREATE VIRTUAL TABLE jobs_fts USING fts5(
+                title, company, tags, description,
+                content='jobs', content_rowid='id'
+            );
+            INSERT INTO jobs VALUES (1, 'https://example.com/1', 'remotive',
+                'Engineer', 'Acme', 'Remote', '<p class="span">Rust</p>', '', 0, 0);
+            INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild');
+            """
+        )
+        connection.close()
+
+        index = JobIndex(path)
+        self.addCleanup(index.close)
+        self.assertEqual(len(index.search("rust")), 1)
+        self.assertEqual(index.search("span"), [])
+        index.upsert([_job("https://example.com/2", "Rust Developer")])
+        self.assertEqual(len(index.search("rust")), 2)
+
+    def test_offline_search_pages_in_index_order(self):
+        self.index.upsert(
+            [
+                _job(f"https://example.com/{n}", f"Engineer {n}", description="rust")
+                for n in range(7)
+            ]
+        )
+        expected = [job.url for job in self.index.search("rust", limit=10)]
+        root = Path(self.tmp_dir.name)
+        # A profile that would pull the last job of the first page to its front.
+        config = AppConfig()
+        config.profile.skills = [expected[2].rsplit("/", 1)[1]]
+        save_config(config, root / "config.json")
+
+        def page(offset):
+            output = root / f"page{offset}.json"
+            args = cli.build_parser().parse_args(
+                [
+                    "--config-path",
+                    str(root / "config.json"),
+                    "search",
+                    "--offline",
+                    "--query",
+                    "rust",
+                    "--index-path",
+                    str(self.index.path),
+                    "--limit",
+                    "3",
+                    "--offset",
+                    str(offset),
+                    "--output",
+                    str(output),
+                ]
+            )
+            with contextlib.redirect_stdout(io.StringIO()):
+                args.func(args)
+            return [job["url"] for job in json.loads(output.read_text())]
+
+        self.assertEqual(page(0) + page(3) + page(6), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
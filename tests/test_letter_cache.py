@@ -0,0 +1,151 @@
+import os
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from job_applier import ai
+from job_applier.config import AppConfig
+from job_applier.diskcache import DiskCache
+from job_applier.letter_cache import LetterCache, letter_key
+from job_applier.search.models import JobPosting
+
+
+def _job(**fields) -> JobPosting:
+    values = dict(
+        source="remotive",
+        title="Backend Engineer",
+        company="Acme",
+        location="Remote",
+        url="https://example.com/1",
+        description="<p>Python services.</p>",
+    )
+    values.update(fields)
+    return JobPosting(**values)
+
+
+class FakeResponse:
+    def __init__(self, letter: str) -> None:
+        self.letter = letter
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self):
+        return {"choices": [{"message": {"content": self.letter}}]}
+
+
+class LetterCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        self.config = AppConfig()
+        self.config.profile.full_name = "Ada Lovelace"
+        self.config.profile.skills = ["python"]
+        environment = mock.patch.dict(os.environ, {"OPENAI_API_KEY": "test"})
+        environment.start()
+        self.addCleanup(environment.stop)
+        self.letters = iter(f"Letter {number}" for number in range(1, 100))
+        post = mock.patch.object(
+            ai.http,
+            "post",
+            side_effect=lambda *args, **kwargs: FakeResponse(next(self.letters)),
+        )
+        self.post = post.start()
+        self.addCleanup(post.stop)
+
+    def _cache(self, **kwargs) -> LetterCache:
+        return LetterCache(store=DiskCache(self.root / "letters"), **kwargs)
+
+    def _generate(self, cache: LetterCache, job=None) -> str:
+        return ai.generate_cover_letter(self.config, job or _job(), cache=cache)
+
+    def test_a_hit_skips_the_request(self):
+        cache = self._cache()
+
+        self.assertEqual(self._generate(cache), "Letter 1")
+        self.assertEqual(self._generate(self._cache()), "Letter 1")
+        self.assertEqual(self.post.call_count, 1)
+
+    def test_key_follows_every_input_of_the_letter(self):
+        job = _job()
+        base = letter_key(self.config, job, "model-a", "prompt")
+
+        other_profile = AppConfig()
+        other_profile.profile.full_name = "Ada Lovelace"
+        other_profile.profile.skills = ["rust"]
+        other_template = AppConfig()
+        other_template.profile = self.config.profile
+        other_template.cover_letter_template = "Hi {company}"
+        keys = [
+            letter_key(self.config, job, "model-b", "prompt"),
+            letter_key(other_template, job, "model-a", "prompt"),
+            letter_key(other_profile, job, "model-a", "prompt"),
+            letter_key(self.config, _job(description="<p>Go</p>"), "model-a", "prompt"),
+            letter_key(self.config, _job(title="Data Engineer"), "model-a", "prompt"),
+        ]
+        self.assertEqual(letter_key(self.config, _job(), "model-a", "prompt"), base)
+        self.assertEqual(len({base, *keys}), len(keys) + 1)
+
+        # Contact details never reach the prompt, so they share the letter.
+        self.config.profile.email = "ada@example.com"
+        self.assertEqual(letter_key(self.config, job, "model-a", "prompt"), base)
+
+    def test_a_new_model_or_posting_asks_again(self):
+        cache = self._cache()
+        self._generate(cache)
+        with mock.patch.dict(os.environ, {"OPENAI_MODEL": "other-model"}):
+            self.assertEqual(self._generate(cache), "Letter 2")
+        self.assertEqual(self._generate(cache, _job(company="Initech")), "Letter 3")
+        self.assertEqual(self.post.call_count, 3)
+
+    def test_regenerate_bypasses_then_overwrites_the_entry(self):
+        self._generate(self._cache())
+
+        self.assertEqual(self._generate(self._cache(regenerate=True)), "Letter 2")
+        self.assertEqual(self._generate(self._cache()), "Letter 2")
+        self.assertEqual(self.post.call_count, 2)
+
+
+class LetterEvictionTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.directory = Path(self._tmp.name)
+
+    def _age(self, store: DiskCache, key: str, seconds: float) -> None:
+        then = time.time() - seconds
+        os.utime(store._path(key), (then, then))
+
+    def test_entries_older_than_the_max_age_expire(self):
+        store = DiskCache(self.directory, max_age=60, suffix=".txt")
+        cache = LetterCache(store=store)
+        cache.set("old", "Old letter")
+        cache.set("new", "New letter")
+        self._age(store, "old", 120)
+
+        self.assertIsNone(cache.get("old"))
+        self.assertFalse(store._path("old").exists())
+        self.assertEqual(cache.get("new"), "New letter")
+
+    def test_least_recently_used_entries_go_first_over_the_size_limit(self):
+        store = DiskCache(self.directory, max_bytes=250, suffix=".txt")
+        cache = LetterCache(store=store)
+        for number, key in enumerate(("a", "b", "c")):
+            cache.set(key, key * 80)
+            self._age(store, key, 300 - number * 100)
+        # Reading "a" makes it the most recently used.
+        self.assertEqual(cache.get("a"), "a" * 80)
+
+        cache.set("d", "d" * 80)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual(cache.get("a"), "a" * 80)
+        self.assertEqual(cache.get("d"), "d" * 80)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from job_applier.metrics import Registry
+
+
+class RegistryTests(unittest.TestCase):
+    def test_prometheus_output_has_cumulative_buckets(self):
+        registry = Registry()
+        registry.observe("job_applier_llm_seconds", 0.02, model="m")
+        registry.observe("job_applier_llm_seconds", 3.0, model="m")
+        registry.inc("job_applier_llm_tokens_total", 120, kind="prompt")
+
+        text = registry.render_prometheus()
+
+        self.assertIn("# TYPE job_applier_llm_seconds histogram", text)
+        self.assertIn('job_applier_llm_seconds_bucket{model="m",le="0.025"} 1', text)
+        self.assertIn('job_applier_llm_seconds_bucket{model="m",le="5"} 2', text)
+        self.assertIn('job_applier_llm_seconds_bucket{model="m",le="+Inf"} 2', text)
+        self.assertIn('job_applier_llm_seconds_count{model="m"} 2', text)
+        self.assertIn('job_applier_llm_tokens_total{kind="prompt"} 120', text)
+
+    def test_timer_records_even_when_the_block_raises(self):
+        registry = Registry()
+        with self.assertRaises(ValueError):
+            with registry.timer("job_applier_provider_seconds", provider="x"):
+                raise ValueError("boom")
+
+        ((name, labels, count, _, _),) = registry.timings()
+        self.assertEqual((name, labels, count), (
+            "job_applier_provider_seconds", (("provider", "x"),), 1
+        ))
+
+
+if __name__ == "__main__":
+    unittest.main()
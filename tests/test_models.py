@@ -0,0 +1,103 @@
+import copy
+import pickle
+import unittest
+from dataclasses import asdict, replace
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from job_applier.search.index import JobIndex
+from job_applier.search.models import JobPosting
+from job_applier.search.text import html_to_text
+
+
+def _job(description):
+    return JobPosting(
+        source="remotive",
+        title="Engineer",
+        company="Acme",
+        location="Remote",
+        url="https://example.com/1",
+        description=description,
+    )
+
+
+class JobPostingTests(unittest.TestCase):
+    def test_long_descriptions_round_trip_through_asdict(self):
+        description = "<p>Build things.</p> " * 200 + "Zürich"
+        job = _job(description)
+
+        self.assertIsInstance(job._description, bytes)
+        self.assertEqual(job.description, description)
+        self.assertEqual(JobPosting.from_dict(asdict(job)), job)
+        self.assertEqual(job.description_head(10), description[:10])
+
+    def test_description_can_load_lazily(self):
+        calls = []
+        job = _job("")
+        job.load_description_from(lambda: calls.append(1) or "loaded")
+
+        self.assertEqual(calls, [])
+        self.assertEqual(asdict(job)["description"], "loaded")
+        self.assertFalse(hasattr(job, "__dict__"))
+
+    def test_lazy_description_is_loaded_and_converted_once(self):
+        calls = []
+        job = _job("")
+        job.load_description_from(lambda: calls.append(1) or "<p>loaded</p>")
+
+        with mock.patch(
+            "job_applier.search.models.html_to_text", wraps=html_to_text
+        ) as convert:
+            for _ in range(3):
+                self.assertEqual(job.description, "<p>loaded</p>")
+                self.assertEqual(job.description_text, "loaded")
+                self.assertEqual(job.text_head(4), "load")
+                self.assertEqual(job.description_head(3), "<p>")
+        self.assertEqual(calls, [1])
+        self.assertEqual(convert.call_count, 1)
+
+    def test_index_backed_postings_pickle_with_their_text(self):
+        with TemporaryDirectory() as tmp_dir:
+            index = JobIndex(Path(tmp_dir) / "jobs.sqlite3")
+            index.upsert([_job("<p>Build <b>things</b>.</p> " * 40)])
+            [job] = index.search("engineer")
+            copied = pickle.loads(pickle.dumps(job))
+            index.close()
+
+        self.assertEqual(copied.description_text, job.description_text)
+        self.assertEqual(copied, job)
+        self.assertEqual(copy.deepcopy(copied), job)
+
+    def test_clean_text_is_derived_once(self):
+        job = _job(
+            "<div><h3>The role</h3><ul><li>Ship&nbsp;<b>Python</b></li>"
+            "<li><p>Mentor</p></li></ul><script>track()</script>"
+            "<p>Please mention the word TRUSTY when applying.</p></div>"
+        )
+
+        self.assertEqual(job.description_text, "The role\n- Ship Python\n- Mentor")
+        self.assertEqual(job.text_head(8), "The role")
+        with mock.patch("job_applier.search.models.html_to_text") as convert:
+            copy = JobPosting.from_dict(asdict(job))
+        convert.assert_not_called()
+        self.assertEqual(copy.description_text, job.description_text)
+
+    def test_clean_text_follows_the_description(self):
+        job = _job("<p>Old role</p>")
+        self.assertEqual(job.description_text, "Old role")
+
+        replaced = replace(job, description="<p>New role</p>")
+        self.assertEqual(replaced.description_text, "New role")
+        job.description = "<p>Changed role</p>"
+        self.assertEqual(job.description_text, "Changed role")
+        copied = pickle.loads(pickle.dumps(job))
+        self.assertEqual(copied.description_text, "Changed role")
+
+    def test_escaped_markup_stays_text(self):
+        self.assertEqual(html_to_text("Use &lt;div&gt; &amp; CSS"), "Use <div> & CSS")
+        self.assertEqual(html_to_text("plain   text\n\n\nhere"), "plain text\nhere")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from job_applier.config import AppConfig
+from job_applier.prompts import build_prompt, count_tokens, split_sections
+from job_applier.search.models import JobPosting
+
+
+def _config():
+    config = AppConfig()
+    config.profile.full_name = "Ada Lovelace"
+    config.profile.skills = ["python", "postgresql"]
+    config.preferences.roles = ["backend engineer"]
+    return config
+
+
+def _job(company, description):
+    return JobPosting(
+        source="remotive",
+        title="Backend Engineer",
+        company=company,
+        location="Remote",
+        url=f"https://example.com/{company}",
+        description=description,
+    )
+
+
+DESCRIPTION = (
+    "<p>Acme builds forecasting tools for retailers.</p>"
+    "<h3>Benefits</h3><ul>"
+    + "".join(f"<li>Perk number {index} for the team.</li>" for index in range(40))
+    + "</ul><h3>What you'll do</h3><ul>"
+    "<li>Build Python services backed by PostgreSQL.</li>"
+    "<li>Own the data pipelines end to end.</li></ul>"
+)
+
+
+class PromptTests(unittest.TestCase):
+    def test_description_is_trimmed_to_budget_by_relevance(self):
+        prompt = build_prompt(_config(), _job("acme", DESCRIPTION), budget=200)
+
+        self.assertTrue(prompt.trimmed)
+        self.assertLessEqual(prompt.tokens, 200)
+        self.assertLessEqual(count_tokens(prompt.text), 200)
+        self.assertIn("Build Python services backed by PostgreSQL.", prompt.user)
+        self.assertIn("Acme builds forecasting tools", prompt.user)
+        self.assertNotIn("Perk number 39", prompt.user)
+        # Sections keep their original order.
+        self.assertLess(
+            prompt.user.index("Acme builds"), prompt.user.index("What you'll do")
+        )
+
+    def test_static_block_is_shared_across_jobs(self):
+        first = build_prompt(_config(), _job("acme", "<p>One.</p>"))
+        second = build_prompt(_config(), _job("globex", "<p>Two.</p>"))
+
+        self.assertEqual(first.system, second.system)
+        self.assertIn("Ada Lovelace", first.system)
+        self.assertNotIn("acme", first.system)
+        self.assertFalse(first.trimmed)
+
+    def test_sections_split_on_headings(self):
+        sections = split_sections("Intro line.\nThe role\n- Build\n- Ship")
+        self.assertEqual([section.heading for section in sections], ["", "The role"])
+        self.assertEqual(sections[1].lines, ["- Build", "- Ship"])
+
+
+if __name__ == "__main__":
+    unittest.main()
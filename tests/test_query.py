@@ -0,0 +1,207 @@
+import unittest
+from unittest import mock
+
+from job_applier.config import AppConfig
+from job_applier.search import remotive
+from job_applier.search.models import JobPosting
+from job_applier.search.providers import run_provider
+from job_applier.search.query import Query, QueryError, SearchCriteria
+
+
+def _job(title: str, **fields) -> JobPosting:
+    values = dict(
+        source="board",
+        title=title,
+        company="Acme",
+        location="Berlin, Germany",
+        url=f"https://example.com/{title.replace(' ', '-')}",
+        description="<p>We use <b>Python</b> and Postgres.</p>",
+        tags="backend, django",
+    )
+    values.update(fields)
+    return JobPosting(**values)
+
+
+class QueryTests(unittest.TestCase):
+    def test_boolean_operators_and_phrases(self):
+        job = _job("Senior Backend Engineer")
+        self.assertTrue(Query("python AND postgres").matches(job))
+        self.assertTrue(Query("rust OR python").matches(job))
+        self.assertFalse(Query("python -senior").matches(job))
+        self.assertFalse(Query("python NOT (senior OR lead)").matches(job))
+        self.assertTrue(Query('"backend engineer"').matches(job))
+        self.assertFalse(Query('"engineer backend"').matches(job))
+
+    def test_terms_match_whole_words_only(self):
+        self.assertFalse(Query("java").matches(_job("JavaScript Developer")))
+        self.assertTrue(Query("front end").matches(_job("Front-End Developer")))
+
+    def test_field_scoping(self):
+        job = _job("Data Engineer")
+        self.assertTrue(Query("company:acme").matches(job))
+        self.assertFalse(Query("title:python").matches(job))
+        self.assertTrue(Query('location:"berlin"').matches(job))
+        self.assertTrue(Query("tags:django").matches(job))
+
+    def test_overlapping_terms_are_all_found(self):
+        job = _job("Machine Learning Engineer")
+        self.assertTrue(Query('"machine learning" AND machine').matches(job))
+        self.assertTrue(Query.any_of(["ml ops", "machine"]).matches(job))
+        front_end = _job("Front-End Engineer")
+        self.assertTrue(Query('"front end" AND "front-end"').matches(front_end))
+        self.assertTrue(Query('"front-end" AND front').matches(front_end))
+
+    def test_malformed_queries_are_rejected(self):
+        for text in ("(python", "python AND", "python )"):
+            with self.assertRaises(QueryError):
+                Query(text)
+
+    def test_keyword_forms(self):
+        query = Query('"data engineer" python -php')
+        self.assertEqual(query.keywords(), "data engineer python")
+        self.assertEqual(
+            Query('(python OR rust) "data engineer"').keyword_alternatives(),
+            ["data engineer"],
+        )
+        self.assertEqual(
+            Query("python OR (title:rust -php)").keyword_alternatives(),
+            ["python", "rust"],
+        )
+        self.assertEqual(Query("python OR company:acme").keyword_alternatives(), [])
+
+
+class CriteriaTests(unittest.TestCase):
+    def _config(self, **preferences) -> AppConfig:
+        config = AppConfig()
+        config.preferences.roles = preferences.get("roles", [])
+        config.preferences.locations = preferences.get("locations", [])
+        config.preferences.remote_only = preferences.get("remote_only", False)
+        return config
+
+    def test_roles_become_an_any_of_query(self):
+        criteria = SearchCriteria.from_config(
+            self._config(roles=["data engineer", "python developer"])
+        )
+        self.assertTrue(criteria.accepts(_job("Data Engineer")))
+        self.assertTrue(criteria.accepts(_job("Python Developer")))
+        self.assertFalse(criteria.accepts(_job("Sales Manager")))
+
+    def test_location_and_remote_preferences(self):
+        criteria = SearchCriteria.from_config(
+            self._config(locations=["Berlin"], remote_only=True), "engineer"
+        )
+        self.assertFalse(criteria.accepts(_job("Engineer")))
+        self.assertTrue(criteria.accepts(_job("Engineer"), remote=True))
+        self.assertTrue(
+            criteria.accepts(_job("Engineer", location="Remote - Berlin"))
+        )
+        self.assertFalse(
+            criteria.accepts(_job("Engineer", location="Munich"), remote=True)
+        )
+        self.assertTrue(
+            criteria.accepts(_job("Engineer", location="Worldwide"), remote=True)
+        )
+
+    def test_locations_match_places_not_substrings(self):
+        criteria = SearchCriteria.from_config(
+            self._config(locations=["Edmonton, AB"], remote_only=True)
+        )
+        accepted = [
+            "Edmonton",
+            "Edmonton, Alberta",
+            "Greater Edmonton Area",
+            "Remote - Edmonton, AB",
+            "Alberta",
+            "Canada",
+            "USA, Canada",
+            "North America",
+            "Remote",
+            "Remote (Anywhere)",
+            "",
+        ]
+        for location in accepted:
+            job = _job("Engineer", location=location)
+            self.assertTrue(criteria.accepts(job, remote=True), location)
+        rejected = [
+            "Calgary, AB",
+            "Ontario, Canada",
+            "Toronto",
+            "USA",
+            "Remote - US",
+            "Europe",
+            "Edmonton, London, UK",
+        ]
+        for location in rejected:
+            job = _job("Engineer", location=location)
+            self.assertFalse(criteria.accepts(job, remote=True), location)
+
+    def test_region_and_remote_locations(self):
+        alberta = SearchCriteria.from_config(self._config(locations=["Alberta"]))
+        self.assertTrue(alberta.accepts(_job("Engineer", location="Calgary, AB")))
+        self.assertTrue(alberta.accepts(_job("Engineer", location="Canada")))
+        self.assertFalse(alberta.accepts(_job("Engineer", location="Portland, OR")))
+
+        either = SearchCriteria.from_config(
+            self._config(locations=["Remote", "London, UK"])
+        )
+        self.assertTrue(either.accepts(_job("Engineer", location="London, England")))
+        self.assertFalse(either.accepts(_job("Engineer", location="London, ON")))
+        self.assertTrue(
+            either.accepts(_job("Engineer", location="USA Only"), remote=True)
+        )
+        self.assertFalse(either.accepts(_job("Engineer", location="USA Only")))
+
+    def test_plain_providers_are_filtered_after_the_call(self):
+        calls = []
+
+        def provider(query, limit):
+            calls.append(query)
+            return [_job("Python Developer"), _job("PHP Developer")]
+
+        criteria = SearchCriteria(Query("developer -php"))
+        jobs = run_provider(provider, "ignored", 10, criteria)
+        self.assertEqual(calls, ["developer"])
+        self.assertEqual([job.title for job in jobs], ["Python Developer"])
+
+    def test_remotive_pushes_what_its_api_supports(self):
+        self.assertEqual(
+            remotive._searches("", 20, SearchCriteria(Query("python"))),
+            [{"search": "python"}],
+        )
+        self.assertEqual(remotive._searches("", 20, SearchCriteria()), [{"limit": 20}])
+        self.assertEqual(
+            remotive._searches("python", 20, None), [{"search": "python"}]
+        )
+        many = SearchCriteria(Query.any_of(["a", "b", "c", "d", "e", "f"]))
+        self.assertEqual(remotive._searches("", 20, many), [{}])
+
+    def test_remotive_searches_each_role_and_fills_the_limit(self):
+        feeds = {
+            "java developer": [
+                {"url": "1", "title": "JavaScript Developer"},
+                {"url": "2", "title": "Java Developer"},
+            ],
+            "data engineer": [
+                {"url": "2", "title": "Java Developer, Data Engineer"},
+                {"url": "3", "title": "Data Engineer"},
+                {"url": "4", "title": "Senior Data Engineer"},
+            ],
+        }
+        calls = []
+
+        def get_json(url, params, ttl):
+            calls.append(params)
+            return {"jobs": feeds[params["search"]]}
+
+        criteria = SearchCriteria.from_config(
+            self._config(roles=["java developer", "data engineer"])
+        )
+        with mock.patch.object(remotive.cache, "get_json", get_json):
+            jobs = remotive.search_remotive("", 3, criteria)
+
+        self.assertEqual(calls, [{"search": role} for role in feeds])
+        self.assertEqual([job.url for job in jobs], ["2", "3", "4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from job_applier.apply.queue import WorkQueue, run_worker
+from job_applier.search.models import JobPosting
+
+
+def _job(number: int) -> JobPosting:
+    return JobPosting(
+        source="test",
+        title=f"Engineer {number}",
+        company="Acme",
+        location="Remote",
+        url=f"https://example.com/jobs/{number}",
+        description="",
+    )
+
+
+def _process(done):
+    def process(jobs):
+        for job in jobs:
+            done.append(job.title)
+            yield job, Path("packets") / job.title
+
+    return process
+
+
+class WorkQueueTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "queue.sqlite3"
+        self.queue = WorkQueue(self.path)
+
+    def tearDown(self):
+        self.queue.close()
+        self._tmp.cleanup()
+
+    def test_enqueue_skips_jobs_already_queued(self):
+        self.assertEqual(self.queue.enqueue(_job(n) for n in range(3)), 3)
+        self.assertEqual(self.queue.enqueue(_job(n) for n in range(5)), 2)
+        self.assertEqual(self.queue.counts()["pending"], 5)
+
+    def test_claims_are_exclusive_until_the_lease_expires(self):
+        self.queue.enqueue(_job(n) for n in range(3))
+        first = self.queue.claim("a", count=2, lease=60)
+        second = self.queue.claim("b", count=5, lease=60)
+        self.assertEqual([task.job.url[-1] for task in first], ["0", "1"])
+        self.assertEqual([task.job.url[-1] for task in second], ["2"])
+
+        with mock.patch("job_applier.apply.queue.time.time", return_value=1e12):
+            reclaimed = self.queue.claim("c", count=5, lease=60)
+        self.assertEqual(len(reclaimed), 3)
+        self.assertEqual({task.attempts for task in reclaimed}, {2})
+
+    def test_jobs_fail_after_their_last_attempt_expires(self):
+        self.queue.enqueue([_job(1)])
+        self.queue.claim("a", lease=60, max_attempts=1)
+        with mock.patch("job_applier.apply.queue.time.time", return_value=1e12):
+            self.assertEqual(self.queue.claim("b", max_attempts=1), [])
+        self.assertEqual(self.queue.counts()["failed"], 1)
+
+    def test_worker_resumes_where_a_crashed_run_stopped(self):
+        self.queue.enqueue(_job(n) for n in range(5))
+        done = []
+
+        def crashing(jobs):
+            for job, packet in _process(done)(jobs[:2]):
+                yield job, packet
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            run_worker(self.queue, crashing, worker="a", batch_size=5)
+        self.assertEqual(self.queue.counts()["done"], 2)
+
+        done.clear()
+        processed = run_worker(self.queue, _process(done), worker="b")
+        self.assertEqual(processed, 3)
+        self.assertEqual(done, ["Engineer 2", "Engineer 3", "Engineer 4"])
+
+    def test_failed_batches_return_to_the_queue(self):
+        self.queue.enqueue(_job(n) for n in range(2))
+        errors = []
+        calls = []
+
+        def flaky(jobs):
+            calls.append(len(jobs))
+            if len(calls) == 1:
+                raise RuntimeError("store unavailable")
+            return _process([])(jobs)
+
+        processed = run_worker(self.queue, flaky, worker="a", on_error=errors.append)
+        self.assertEqual(processed, 2)
+        self.assertEqual(calls, [2, 2])
+        self.assertEqual([str(error) for error in errors], ["store unavailable"])
+
+    def test_concurrent_workers_process_each_job_once(self):
+        self.queue.enqueue(_job(n) for n in range(40))
+        done = []
+
+        def drain(name):
+            queue = WorkQueue(self.path)
+            run_worker(
+                queue, _process(done), worker=name, batch_size=3, idle_poll=0.01
+            )
+            queue.close()
+
+        threads = [threading.Thread(target=drain, args=(f"w{n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(done), sorted(f"Engineer {n}" for n in range(40)))
+        self.assertEqual(self.queue.counts()["done"], 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from unittest import mock
+
+from job_applier.config import AppConfig
+from job_applier.search.models import JobPosting
+from job_applier.search.ranking import ProfileRanker
+from job_applier.search.text import token_ids
+
+
+def _job(url: str, title: str, description: str = "", tags: str = "") -> JobPosting:
+    return JobPosting(
+        source="test",
+        title=title,
+        company="Acme",
+        location="Remote",
+        url=url,
+        description=description,
+        tags=tags,
+    )
+
+
+class ProfileRankerTests(unittest.TestCase):
+    def setUp(self):
+        self.config = AppConfig()
+        self.config.profile.skills = ["Python", "ASP.NET Core", "C#"]
+        self.config.preferences.roles = ["Backend Engineer"]
+
+    def test_ranks_profile_matches_first(self):
+        jobs = [
+            _job("1", "Office Manager", "Run the office."),
+            _job("2", "Backend Engineer", "Python services.", tags="python"),
+            _job("3", "Designer", "We use c# and asp.net core internally."),
+        ]
+
+        ranked = ProfileRanker(self.config).rank(jobs)
+
+        self.assertEqual([job.url for job, _ in ranked], ["2", "3", "1"])
+        self.assertEqual(ranked[-1][1], 0.0)
+
+    def test_top_k_keeps_best_matches_in_order(self):
+        jobs = [_job(str(index), "Designer") for index in range(10)]
+        jobs[7] = _job("7", "Backend Engineer", "python")
+        jobs[3] = _job("3", "Engineer")
+
+        ranked = ProfileRanker(self.config).rank(jobs, top_k=2)
+
+        self.assertEqual([job.url for job, _ in ranked], ["7", "3"])
+
+    def test_terms_must_stand_alone(self):
+        ranker = ProfileRanker(self.config)
+
+        scores = ranker.score([_job("1", "Dev", "cpython internals"), _job("2", "Dev")])
+
+        self.assertEqual(list(scores), [0.0, 0.0])
+
+    def test_longest_term_wins_and_punctuation_is_kept(self):
+        self.config.profile.skills = ["ASP.NET Core", "ASP.NET", ".NET", "C#"]
+        self.config.profile.skills.append("Zürich")
+        ranker = ProfileRanker(self.config)
+        jobs = [
+            _job("1", "Dev", "ASP.NET Core, asp.net and .NET; c#. Zürich office"),
+            _job("2", "C# Dev", "vb.net in zürichsee, c#x and x-c#"),
+        ]
+
+        frequencies, _ = ranker._term_matrix(jobs)
+        counts = [
+            {term: frequencies[row, column] for column, term in enumerate(ranker.terms)}
+            for row in range(len(jobs))
+        ]
+
+        self.assertEqual(counts[0]["asp.net core"], 1.0)
+        self.assertEqual(counts[0]["asp.net"], 1.0)
+        self.assertEqual(counts[0][".net"], 1.0)
+        self.assertEqual(counts[0]["c#"], 1.0)
+        self.assertEqual(counts[0]["zürich"], 1.0)
+        # Title matches carry the title weight; "vb.net", "zürichsee" and
+        # "c#x" don't count, the "c#" after "x-" does.
+        self.assertEqual(counts[1]["c#"], 4.0)
+        self.assertEqual(counts[1][".net"], 0.0)
+        self.assertEqual(counts[1]["zürich"], 0.0)
+
+    def test_postings_are_tokenized_once_per_change(self):
+        ranker = ProfileRanker(self.config)
+        job = _job("1", "Designer", "We use python.")
+
+        with mock.patch(
+            "job_applier.search.models.token_ids", wraps=token_ids
+        ) as tokenize:
+            first = ranker.score([job])
+            self.assertEqual(list(ranker.score([job])), list(first))
+            self.assertEqual(tokenize.call_count, 1)
+            job.title = "Backend Engineer"
+            self.assertGreater(ranker.score([job])[0], first[0])
+            job.description = "No match here."
+            ranker.score([job])
+        self.assertEqual(tokenize.call_count, 3)
+
+    def test_empty_profile_keeps_provider_order(self):
+        jobs = [_job(str(index), "Engineer") for index in range(5)]
+
+        ranked = ProfileRanker(AppConfig()).rank(jobs)
+
+        self.assertEqual([job.url for job, _ in ranked], ["0", "1", "2", "3", "4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
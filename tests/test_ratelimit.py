@@ -0,0 +1,84 @@
+import unittest
+
+from job_applier.ratelimit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _bucket(clock: FakeClock, per_minute: float, **kwargs) -> TokenBucket:
+    return TokenBucket(per_minute, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_full_bucket_admits_a_burst_then_waits_for_refill(self):
+        clock = FakeClock()
+        bucket = _bucket(clock, 60)
+
+        waits = [bucket.acquire() for _ in range(60)]
+        self.assertEqual(waits, [0.0] * 60)
+        self.assertAlmostEqual(bucket.acquire(), 1.0)
+        self.assertAlmostEqual(bucket.acquire(2), 2.0)
+        self.assertAlmostEqual(clock.now, 1003.0)
+
+    def test_refill_follows_the_clock_up_to_capacity(self):
+        clock = FakeClock()
+        bucket = _bucket(clock, 120, capacity=10)
+        bucket.acquire(10)
+
+        clock.now += 2.5
+        self.assertEqual(bucket.acquire(5), 0.0)
+        self.assertAlmostEqual(bucket.acquire(1), 0.5)
+
+        clock.now += 3600
+        self.assertEqual(bucket.acquire(10), 0.0)
+        self.assertGreater(bucket.acquire(1), 0.0)
+
+    def test_requests_larger_than_the_bucket_pass_once_it_is_full(self):
+        clock = FakeClock()
+        bucket = _bucket(clock, 600)
+        bucket.acquire(600)
+
+        self.assertAlmostEqual(bucket.acquire(5000), 60.0)
+        self.assertEqual(clock.sleeps, [60.0])
+
+    def test_rate_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_requests_and_tokens_are_limited_separately(self):
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=1200)
+        limiter.requests = _bucket(clock, 2)
+        limiter.tokens = _bucket(clock, 1200)
+
+        self.assertEqual(limiter.acquire(1000), 0.0)
+        # Only 200 tokens are left: the next 600-token call waits 20s for
+        # them, while its request slot is still free.
+        self.assertAlmostEqual(limiter.acquire(600), 20.0)
+        # Both request slots are used. One refills every 30s, and 20s of
+        # that have already passed.
+        self.assertAlmostEqual(limiter.acquire(0), 10.0)
+
+    def test_unset_limits_never_wait(self):
+        limiter = RateLimiter()
+
+        self.assertIsNone(limiter.requests)
+        self.assertIsNone(limiter.tokens)
+        self.assertEqual(limiter.acquire(10**6), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
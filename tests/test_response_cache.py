@@ -0,0 +1,85 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from job_applier.diskcache import DiskCache
+from job_applier.search.cache import ResponseCache
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"jobs": [{"title": "Engineer"}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        _FeedHandler.requests_seen = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/feed"
+        self.tmp_dir = TemporaryDirectory()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp_dir.cleanup()
+
+    def _cache(self, **kwargs):
+        return ResponseCache(store=DiskCache(Path(self.tmp_dir.name)), **kwargs)
+
+    def test_fresh_entry_is_served_from_disk(self):
+        cache = self._cache()
+        first = cache.get_json(self.url, params={"search": "dev"})
+        second = cache.get_json(self.url, params={"search": "dev"})
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(_FeedHandler.requests_seen), 1)
+        self.assertEqual((cache.stats.misses, cache.stats.hits), (1, 1))
+
+    def test_stale_entry_revalidates_with_etag(self):
+        self._cache().get_json(self.url, ttl=0)
+        cache = self._cache()
+        payload = cache.get_json(self.url, ttl=0)
+
+        self.assertEqual(payload["jobs"][0]["title"], "Engineer")
+        self.assertEqual(_FeedHandler.requests_seen, [None, '"v1"'])
+        self.assertEqual(cache.stats.revalidated, 1)
+
+    def test_disabled_cache_always_fetches(self):
+        cache = self._cache(enabled=False)
+        cache.get_json(self.url)
+        cache.get_json(self.url)
+
+        self.assertEqual(_FeedHandler.requests_seen, [None, None])
+
+    def test_store_evicts_least_recently_used(self):
+        store = DiskCache(Path(self.tmp_dir.name), max_bytes=250)
+        for key in ("aa1", "bb2", "cc3"):
+            store.set(key, b"x" * 100)
+
+        self.assertIsNone(store.get("aa1"))
+        self.assertIsNotNone(store.get("cc3"))
+        self.assertLessEqual(store.size(), 250)
+
+
+if __name__ == "__main__":
+    unittest.main()
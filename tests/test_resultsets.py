@@ -0,0 +1,51 @@
+import unittest
+
+from job_applier.resultsets import ResultSetStore
+from job_applier.search.models import JobPosting
+
+
+def _job(title):
+    return JobPosting(
+        source="test",
+        title=title,
+        company="Acme",
+        location="Remote",
+        url=f"https://example.com/{title}",
+        description="",
+    )
+
+
+class ResultSetStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.store = ResultSetStore(max_sets=2, ttl=60, clock=lambda: self.now)
+
+    def test_select_returns_chosen_jobs_in_order(self):
+        jobs = [_job("a"), _job("b"), _job("c")]
+        result_id = self.store.put(jobs)
+
+        selected = self.store.select(result_id, ["2", "0", "oops", "9"])
+
+        self.assertEqual([job.title for job in selected], ["a", "c"])
+
+    def test_rows_appended_after_put_are_visible(self):
+        jobs = []
+        result_id = self.store.put(jobs, result_id="task")
+        jobs.append(_job("late"))
+
+        self.assertEqual(self.store.select(result_id, ["0"])[0].title, "late")
+
+    def test_expired_and_evicted_sets_are_gone(self):
+        first = self.store.put([_job("a")])
+        self.now = 30
+        second = self.store.put([_job("b")])
+        self.store.put([_job("c")])
+
+        self.assertIsNone(self.store.select(first, ["0"]))
+        self.now = 100
+        self.assertIsNone(self.store.get(second))
+        self.assertEqual(len(self.store), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from job_applier.diskcache import DiskCache
+from job_applier.search import arbeitnow, cache, providers
+from job_applier.search.models import JobPosting
+from job_applier.search.providers import SearchReport, search_all
+
+
+def _job(source: str, title: str) -> JobPosting:
+    return JobPosting(
+        source=source,
+        title=title,
+        company=f"{source} Inc",
+        location="Remote",
+        url=f"https://example.com/{source}/{title}",
+        description="",
+    )
+
+
+def _provider(source: str, delay: float):
+    def search(query, limit):
+        time.sleep(delay)
+        return [_job(source, f"{query}-{index}") for index in range(limit)]
+
+    return search
+
+
+class SearchAllTests(unittest.TestCase):
+    def test_providers_run_concurrently(self):
+        fake = {
+            "slow": _provider("slow", 0.3),
+            "slower": _provider("slower", 0.3),
+            "slowest": _provider("slowest", 0.3),
+        }
+        with mock.patch.dict(providers.PROVIDERS, fake, clear=True):
+            started = time.monotonic()
+            jobs = search_all("dev", 3, timeout=5)
+            elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual([job.source for job in jobs], ["slow", "slower", "slowest"])
+
+    def test_late_provider_is_reported_as_timed_out(self):
+        release = threading.Event()
+
+        def hung(query, limit):
+            release.wait(5)
+            return []
+
+        fake = {"fast": _provider("fast", 0), "hung": hung}
+        report = SearchReport()
+        try:
+            with mock.patch.dict(providers.PROVIDERS, fake, clear=True):
+                started = time.monotonic()
+                jobs = search_all("dev", 4, timeout=0.2, report=report)
+                elapsed = time.monotonic() - started
+        finally:
+            release.set()
+
+        self.assertLess(elapsed, 1)
+        self.assertEqual(report.completed, ["fast"])
+        self.assertEqual(report.timed_out, ["hung"])
+        self.assertEqual([job.source for job in jobs], ["fast", "fast", "hung"])
+        self.assertIn("timed out", jobs[-1].description)
+
+    def test_late_provider_does_not_hold_up_process_exit(self):
+        script = (
+            "import time\n"
+            "from job_applier.search import providers\n"
+            "providers.PROVIDERS.clear()\n"
+            "providers.PROVIDERS.register('hung', lambda q, n: time.sleep(10) or [])\n"
+            "providers.search_all('dev', 1, timeout=0.2)\n"
+        )
+        root = Path(__file__).resolve().parent.parent
+        started = time.monotonic()
+        subprocess.run([sys.executable, "-c", script], cwd=root, check=True, timeout=30)
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_provider_errors_become_placeholders(self):
+        def broken(query, limit):
+            raise RuntimeError("boom")
+
+        fake = {"broken": broken}
+        report = SearchReport()
+        with mock.patch.dict(providers.PROVIDERS, fake, clear=True):
+            jobs = search_all("dev", 2, report=report)
+
+        self.assertEqual(report.failed, ["broken"])
+        self.assertEqual(jobs[0].description, "Provider error: boom")
+
+
+class ProviderRegistryTests(unittest.TestCase):
+    def test_dotted_paths_resolve_on_first_lookup(self):
+        registry = providers.ProviderRegistry(
+            {"join": "os.path:join", "split": "os.path.split"}
+        )
+        self.assertEqual(list(registry), ["join", "split"])
+        self.assertEqual(registry["join"]("a", "b"), os.path.join("a", "b"))
+        self.assertIs(registry["split"], os.path.split)
+        self.assertIsNone(registry.get("missing"))
+
+    def test_patching_does_not_import_providers(self):
+        registry = providers.ProviderRegistry({"lazy": "no_such_module:search"})
+        with mock.patch.dict(registry, {"fake": _provider("fake", 0)}, clear=True):
+            self.assertEqual(list(registry), ["fake"])
+        self.assertEqual(list(registry), ["lazy"])
+        with self.assertRaises(ModuleNotFoundError):
+            registry["lazy"]
+
+
+class SingleFlightTests(unittest.TestCase):
+    def _run_concurrently(self, fn, count=5):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(fn())) for _ in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = providers.SingleFlight("test")
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return ["shared"]
+
+        results = self._run_concurrently(lambda: flight.do("key", fetch))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [["shared"]] * 5)
+        self.assertEqual(flight.do("key", lambda: ["again"]), ["again"])
+
+    def test_arbeitnow_feed_is_fetched_once_for_all_queries(self):
+        fetched = []
+
+        def fetch_page(page, remote_only=False):
+            fetched.append(page)
+            time.sleep(0.1)
+            rows = [
+                {"title": title, "company_name": "Acme", "url": f"https://x/{title}"}
+                for title in ("Python Developer", "Data Engineer")
+            ]
+            return {"data": rows, "links": {"next": "?page=2" if page == 1 else None}}
+
+        queries = iter(["python", "data", "python", "engineer"])
+        lock = threading.Lock()
+
+        def search():
+            with lock:
+                query = next(queries)
+            return arbeitnow.search_arbeitnow(query, 10)
+
+        with TemporaryDirectory() as tmp_dir, mock.patch.object(
+            arbeitnow, "_fetch_page", fetch_page
+        ), mock.patch.object(
+            cache, "_cache", cache.ResponseCache(store=DiskCache(Path(tmp_dir)))
+        ):
+            arbeitnow.clear_feed()
+            results = self._run_concurrently(search, count=4)
+            later = arbeitnow.search_arbeitnow("developer", 10)
+            arbeitnow.clear_feed()
+
+        self.assertEqual(sorted(fetched), [1, 2])
+        self.assertEqual(sorted(len(jobs) for jobs in results), [2, 2, 2, 2])
+        self.assertEqual([job.title for job in later], ["Python Developer"] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import json
+import unittest
+from dataclasses import asdict, replace
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from job_applier.apply.dispatcher import load_shortlist, save_shortlist
+from job_applier.apply.shortlist import (
+    ShortlistWriter,
+    count_shortlist,
+    index_path,
+    iter_shortlist,
+    parse_range,
+)
+from job_applier.search.models import JobPosting
+
+
+def _jobs(count):
+    return (
+        JobPosting(
+            source="test",
+            title=f"Job {index}",
+            company="Acme",
+            location="Remote",
+            url=f"https://example.com/{index}",
+            description="",
+        )
+        for index in range(count)
+    )
+
+
+class ShortlistTests(unittest.TestCase):
+    def test_ndjson_round_trip_and_random_access(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "shortlist.ndjson"
+            save_shortlist(_jobs(50), path)
+
+            self.assertEqual(len(path.read_text().splitlines()), 50)
+            self.assertEqual(count_shortlist(path), 50)
+            titles = [job.title for job in iter_shortlist(path, 20, 23)]
+            self.assertEqual(titles, ["Job 20", "Job 21", "Job 22"])
+            self.assertEqual(load_shortlist(path), list(_jobs(50)))
+
+    def test_stale_index_is_rebuilt(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "shortlist.jsonl"
+            save_shortlist(_jobs(3), path)
+            extra = replace(next(_jobs(1)), title="Appended")
+            with open(path, "a") as handle:
+                handle.write("\n" + json.dumps(asdict(extra)) + "\n")
+
+            self.assertEqual(count_shortlist(path), 4)
+            self.assertEqual(next(iter_shortlist(path, 3)).title, "Appended")
+            self.assertTrue(index_path(path).exists())
+
+    def test_append_extends_data_and_index(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "shortlist.ndjson"
+            save_shortlist(_jobs(3), path)
+            with ShortlistWriter(path, append=True) as writer:
+                writer.write(replace(next(_jobs(1)), title="Appended"))
+
+            self.assertEqual(writer.count, 4)
+            self.assertEqual(count_shortlist(path), 4)
+            self.assertEqual(next(iter_shortlist(path, 3)).title, "Appended")
+
+    def test_json_array_shortlists_still_load(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "shortlist.json"
+            save_shortlist(_jobs(5), path)
+
+            self.assertIsInstance(json.loads(path.read_text()), list)
+            self.assertEqual(
+                [job.title for job in iter_shortlist(path, 3)], ["Job 3", "Job 4"]
+            )
+
+    def test_parse_range_counts_from_one(self):
+        self.assertEqual(parse_range("500-600"), (499, 600))
+        self.assertEqual(parse_range("7"), (6, 7))
+        self.assertEqual(parse_range("10-"), (9, None))
+        with self.assertRaises(ValueError):
+            parse_range("9-3")
+
+
+if __name__ == "__main__":
+    unittest.main()
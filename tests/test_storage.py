@@ -0,0 +1,62 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from job_applier.apply.storage import DirectoryStore, SQLiteStore, packet_key
+from job_applier.search.models import JobPosting
+
+
+def _job(url):
+    return JobPosting(
+        source="test",
+        title="Engineer",
+        company="Acme",
+        location="Remote",
+        url=url,
+        description="",
+    )
+
+
+class PacketStoreTests(unittest.TestCase):
+    def test_same_company_and_title_get_distinct_keys(self):
+        first = packet_key(_job("https://example.com/1"))
+        second = packet_key(_job("https://example.com/2"))
+
+        self.assertNotEqual(first, second)
+        self.assertTrue(first.startswith("acme/engineer-"))
+        self.assertEqual(first, packet_key(_job("https://www.example.com/1?utm_id=x")))
+
+    def test_sqlite_store_skips_unchanged_packets(self):
+        with TemporaryDirectory() as tmp_dir:
+            store = SQLiteStore(Path(tmp_dir) / "packets.sqlite3")
+            items = [(_job("https://example.com/1"), "Hello")]
+            store.write_many(items, dry_run=False)
+            query = "SELECT updated_at FROM packets"
+            before = store._connect().execute(query).fetchone()[0]
+
+            store.write_many(items, dry_run=False)
+            unchanged = store._connect().execute(query).fetchone()[0]
+            store.write_many([(items[0][0], "Updated")], dry_run=False)
+
+            self.assertEqual(before, unchanged)
+            key = packet_key(items[0][0])
+            self.assertEqual(store.read(key)["cover_letter.txt"], "Updated")
+            store.close()
+
+    def test_sqlite_export_matches_directory_layout(self):
+        with TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            store = SQLiteStore(root / "packets.sqlite3")
+            jobs = [_job("https://example.com/1"), _job("https://example.com/2")]
+            store.write_many([(job, "Hello") for job in jobs], dry_run=False)
+
+            self.assertEqual(store.export(root / "out"), 2)
+            exported = DirectoryStore(root / "out")
+            self.assertEqual(exported.keys(), store.keys())
+            key = store.keys()[0]
+            self.assertEqual(exported.read(key), store.read(key))
+            store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
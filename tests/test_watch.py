@@ -0,0 +1,137 @@
+import random
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from job_applier.search.models import JobPosting
+from job_applier.search.query import Query, SearchCriteria
+from job_applier.search.watch import KNOWN_RUN, Watcher, WatchState
+
+
+def _job(number: int) -> JobPosting:
+    return JobPosting(
+        source="feed",
+        title=f"Job {number}",
+        company="Acme",
+        location="Remote",
+        url=f"https://example.com/jobs/{number}?utm_source=feed",
+        description="",
+    )
+
+
+class FakeFeed:
+    def __init__(self, newest: int) -> None:
+        self.newest = newest
+        self.read = 0
+
+    def __call__(self, remote_only):
+        # Newest first, like the paged boards.
+        for number in range(self.newest, 0, -1):
+            self.read += 1
+            yield _job(number), number % 2 == 0
+
+
+class WatchTests(unittest.TestCase):
+    def _watcher(self, state, feed, emitted):
+        return Watcher(
+            state,
+            SearchCriteria(Query("job")),
+            {"feed": None},
+            lambda name, jobs: emitted.extend(job.title for job in jobs),
+            feeds={"feed": feed},
+            rng=random.Random(0),
+        )
+
+    def test_only_new_postings_are_emitted_and_marks_persist(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "watch_state.json"
+            emitted = []
+            feed = FakeFeed(50)
+            self._watcher(WatchState(path), feed, emitted).run_once()
+            self.assertEqual(len(emitted), 50)
+
+            emitted.clear()
+            feed.newest = 53
+            feed.read = 0
+            self._watcher(WatchState(path), feed, emitted).run_once()
+
+            self.assertEqual(emitted, ["Job 53", "Job 52", "Job 51"])
+            # The feed is abandoned once it reaches postings already seen.
+            self.assertEqual(feed.read, 3 + KNOWN_RUN)
+
+    def test_postings_beyond_the_limit_are_paged_not_skipped(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "watch_state.json"
+            batches = []
+            feed = FakeFeed(30)
+
+            def watcher():
+                return Watcher(
+                    WatchState(path),
+                    SearchCriteria(Query("job")),
+                    {"feed": None},
+                    lambda name, jobs: batches.append([job.title for job in jobs]),
+                    limit=12,
+                    feeds={"feed": feed},
+                )
+
+            self.assertEqual(watcher().run_once(), 30)
+            self.assertEqual([len(batch) for batch in batches], [12, 12, 6])
+            self.assertEqual(batches[-1][-1], "Job 1")
+
+            batches.clear()
+            feed.newest = 32
+            watcher().run_once()
+            self.assertEqual(batches, [["Job 32", "Job 31"]])
+
+    def test_feed_rows_are_filtered_by_their_remote_flag(self):
+        with TemporaryDirectory() as tmp_dir:
+            emitted = []
+            watcher = Watcher(
+                WatchState(Path(tmp_dir) / "watch_state.json"),
+                SearchCriteria(Query("job"), remote_only=True),
+                {"feed": None},
+                lambda name, jobs: emitted.extend(job.title for job in jobs),
+                feeds={"feed": FakeFeed(4)},
+            )
+            watcher.run_once()
+            self.assertEqual(emitted, ["Job 4", "Job 2"])
+
+    def test_failed_poll_does_not_advance_the_marks(self):
+        with TemporaryDirectory() as tmp_dir:
+            state = WatchState(Path(tmp_dir) / "watch_state.json")
+            errors = []
+
+            def broken(name, jobs):
+                raise RuntimeError("downstream")
+
+            watcher = Watcher(
+                state,
+                SearchCriteria(Query("job")),
+                {"feed": None},
+                broken,
+                feeds={"feed": FakeFeed(5)},
+                on_error=lambda name, exc: errors.append(str(exc)),
+            )
+            self.assertEqual(watcher.run_once(), 0)
+            self.assertEqual(errors, ["downstream"])
+            self.assertFalse(state.path.exists())
+
+    def test_intervals_are_jittered_within_bounds(self):
+        state = WatchState(Path("unused.json"))
+        watcher = Watcher(
+            state,
+            SearchCriteria(),
+            {},
+            print,
+            interval=100,
+            jitter=0.2,
+            rng=random.Random(1),
+        )
+        delays = [watcher.next_delay() for _ in range(50)]
+        self.assertTrue(all(80 <= delay <= 120 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
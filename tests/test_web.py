@@ -0,0 +1,100 @@
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from job_applier import web
+from job_applier.search.models import JobPosting
+
+
+def _provider(query, limit):
+    return [
+        JobPosting(
+            source="board",
+            title=f"Engineer {number}",
+            company="Acme",
+            location="Remote",
+            url=f"https://example.com/{number}",
+            description="<p>Python services.</p>",
+        )
+        for number in range(limit)
+    ]
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class SearchRouteTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        root = Path(self._tmp.name)
+        patches = [
+            mock.patch.object(web, "CONFIG_DIR", root / "configs"),
+            mock.patch.object(web, "RESUME_DIR", root / "resumes"),
+            mock.patch.object(web, "PROVIDERS", {"board": _provider}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.client = web.create_app().test_client()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _start(self):
+        response = self.client.post(
+            "/search",
+            data={"query": "engineer", "limit": "3", "skills": "python"},
+            headers={"Accept": "application/json"},
+        )
+        self.assertEqual(response.status_code, 202)
+        return response.get_json()
+
+    def test_events_stream_rows_until_done(self):
+        started = self._start()
+
+        response = self.client.get(started["events"])
+        self.assertEqual(response.mimetype, "text/event-stream")
+        events = _events(response.get_data(as_text=True))
+
+        self.assertEqual(events[-1], ("done", {}))
+        updates = [data for name, data in events if name == "update"]
+        rows = [row for update in updates for row in update["rows"]]
+        self.assertEqual([row["index"] for row in rows], [0, 1, 2])
+        self.assertEqual(updates[-1]["providers"], {"board": "done"})
+        self.assertEqual(updates[-1]["status"], "done")
+
+    def test_poll_returns_rows_after_since(self):
+        started = self._start()
+        self.client.get(started["events"]).get_data()
+
+        response = self.client.get(started["poll"], query_string={"since": 2})
+        snapshot = response.get_json()
+        self.assertEqual(snapshot["status"], "done")
+        self.assertEqual([row["index"] for row in snapshot["rows"]], [2])
+
+    def test_unknown_tasks_are_not_found(self):
+        self.assertEqual(self.client.get("/search/missing").status_code, 404)
+        self.assertEqual(self.client.get("/search/missing/events").status_code, 404)
+
+    def test_new_searches_are_refused_while_every_slot_is_running(self):
+        with mock.patch.object(
+            web.SearchTaskManager,
+            "start",
+            side_effect=web.TooManySearches("busy"),
+        ):
+            response = self.client.post(
+                "/search", data={"limit": "3"}, headers={"Accept": "application/json"}
+            )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.get_json(), {"error": "busy"})
+
+
+if __name__ == "__main__":
+    unittest.main()